@@ -0,0 +1,181 @@
+"""
+Batch Person Import for PeopleRate
+Reads JSONL or CSV descriptions from a request stream and extracts person fields in a process pool
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+
+from nlp_processor import nlp_processor
+
+logger = logging.getLogger(__name__)
+
+# 0 extracts in the server process (no pool)
+NLP_BATCH_WORKERS = int(os.getenv("NLP_BATCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+NLP_BATCH_CHUNK = int(os.getenv("NLP_BATCH_CHUNK", "100"))
+NLP_BATCH_MAX_LINES = int(os.getenv("NLP_BATCH_MAX_LINES", "10000"))
+
+DESCRIPTION_FIELDS = ("description", "text")
+
+
+def extract_many(descriptions: List[str]) -> List[dict]:
+    """Runs in a pool worker: extract_person_fields for each description, errors as {"error": ...}"""
+    results = []
+    for description in descriptions:
+        try:
+            results.append(nlp_processor.extract_person_fields(description))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+async def _lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decoded lines of a byte stream, newline kept, without reading the whole body"""
+    pending = b""
+    async for chunk in stream:
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        for line in complete:
+            yield line.decode("utf-8", errors="replace") + "\n"
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+def _from_json(text: str) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        value = json.loads(text)
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+    if isinstance(value, dict):
+        value = next((value[field] for field in DESCRIPTION_FIELDS if isinstance(value.get(field), str)), None)
+    if not isinstance(value, str) or not value.strip():
+        return None, 'Expected a JSON string or an object with a "description"'
+    return value.strip(), None
+
+
+async def read_descriptions(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    (line number, description, error) for each record of a JSONL or CSV body. CSV needs a header
+    row; the "description" (or "text") column is used, else the first one. Quoted CSV fields
+    may span lines; the line number is where the record starts.
+    """
+    number = 0
+    if fmt == "jsonl":
+        async for line in _lines(stream):
+            number += 1
+            if line.strip():
+                yield (number, *_from_json(line))
+        return
+
+    column = None
+    record, start = "", 0
+    async for line in _lines(stream):
+        number += 1
+        if not record:
+            start = number
+        record += line
+        if record.count('"') % 2:  # inside a quoted field that continues on the next line
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        row = next(csv.reader([text]), [])
+        if column is None:
+            headers = [header.strip().lower() for header in row]
+            column = next((headers.index(field) for field in DESCRIPTION_FIELDS if field in headers), 0)
+            continue
+        value = row[column].strip() if column < len(row) else ""
+        yield (start, value, None) if value else (start, None, "Empty description")
+    if record.strip():
+        yield start, None, "Unterminated quoted field"
+
+
+class BatchExtractor:
+    """
+    Process pool for extract_person_fields, created on first use. Chunks are submitted as the
+    body is read, with at most two per worker in flight, and results come back in input order;
+    memory stays bounded however long the upload is.
+    """
+
+    def __init__(self, workers: int = NLP_BATCH_WORKERS, chunk_size: int = NLP_BATCH_CHUNK):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers > 0 and self._pool is None:
+            # spawn, not fork: the server already runs threads (WAL flusher, threadpool) by now, and a
+            # forked child inherits any lock one of them held at that moment, never to be released
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"🧵 NLP batch pool started with {self.workers} workers")
+        return self._pool
+
+    async def extract(self, records: AsyncIterator[Tuple[int, Optional[str], Optional[str]]]) -> AsyncIterator[Tuple[int, Optional[str], Dict]]:
+        """(line number, description, extracted fields or {"error": ...}) for each record, in order"""
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        in_flight = deque()
+        chunk: List[Tuple[int, Optional[str], Optional[str]]] = []
+
+        def submit(batch):
+            descriptions = [description for _, description, error in batch if error is None]
+            if executor is None:
+                future = loop.create_future()
+                future.set_result(extract_many(descriptions))
+            else:
+                future = loop.run_in_executor(executor, extract_many, descriptions)
+            in_flight.append((batch, future))
+
+        async def drain_one():
+            batch, future = in_flight.popleft()
+            extracted = iter(await future)
+            return [
+                (number, description, {"error": error} if error is not None else next(extracted))
+                for number, description, error in batch
+            ]
+
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                submit(chunk)
+                chunk = []
+                # Hand back finished chunks right away; wait only when the pipeline is full
+                while in_flight and (in_flight[0][1].done() or len(in_flight) >= max(2 * self.workers, 1)):
+                    for result in await drain_one():
+                        yield result
+        if chunk:
+            submit(chunk)
+        while in_flight:
+            for result in await drain_one():
+                yield result
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    A StreamingResponse whose body generator is still reading the request body. The stock one
+    listens for http.disconnect alongside the stream (ASGI spec < 2.4, as uvicorn reports),
+    and that listener would take the body messages the generator waits for. A disconnect
+    surfaces in the generator instead, as ClientDisconnect from request.stream().
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+batch_extractor = BatchExtractor()
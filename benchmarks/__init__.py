@@ -0,0 +1,5 @@
+"""
+Benchmarks for PeopleRate
+Standalone bench_*.py scripts for individual components, plus a seeded data generator
+(benchmarks.datagen) and a regression suite over the hot paths (benchmarks.suite)
+"""
@@ -0,0 +1,145 @@
+"""
+Benchmark: DATABASE snapshot write/restore time and file size
+Builds a synthetic in-memory DATABASE (1M reviews by default) shaped like the real records
+
+Usage:
+    python benchmarks/bench_db_snapshot.py [review_count]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gc
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from db_snapshot import load_snapshot, save_snapshot
+
+REVIEW_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+PERSON_COUNT = max(REVIEW_COUNT // 100, 10)
+USER_COUNT = max(REVIEW_COUNT // 50, 10)
+
+COMMENTS = [
+    "Came within the hour, fixed the leak and cleaned up after. Fair pricing.",
+    "Good work overall but arrived late twice. Communication could be better.",
+    "Excellent tutor, my son's maths scores improved a lot in three months.",
+    "Did not finish the job and stopped answering calls. Avoid.",
+]
+
+
+def build_database():
+    now = datetime.utcnow()
+    users = {
+        f"user{i}": {
+            "id": f"user{i}",
+            "email": f"user{i}@example.com",
+            "full_name": f"User {i}",
+            "username": f"user_{i}",
+            "password": "$2b$12$" + "x" * 53,
+            "is_active": True,
+            "created_at": now - timedelta(days=i % 365),
+            "review_count": REVIEW_COUNT // USER_COUNT,
+            "reputation_score": i % 100,
+            "email_verified": i % 2 == 0,
+        }
+        for i in range(USER_COUNT)
+    }
+    persons = {
+        f"person{i}": {
+            "id": f"person{i}",
+            "name": f"Vendor {i}",
+            "category": "Plumber",
+            "area": "HSR Layout",
+            "skills": ["Leak fixing", "Bathroom remodel"],
+            "created_at": now - timedelta(days=i % 400),
+            "updated_at": now,
+            "review_count": REVIEW_COUNT // PERSON_COUNT,
+            "average_rating": 4.2,
+            "total_rating": 4 * (REVIEW_COUNT // PERSON_COUNT),
+        }
+        for i in range(PERSON_COUNT)
+    }
+    reviews = {}
+    for i in range(REVIEW_COUNT):
+        review_id = f"review{i}"
+        reviews[review_id] = {
+            "id": review_id,
+            "person_id": f"person{i % PERSON_COUNT}",
+            "reviewer_id": f"user{i % USER_COUNT}",
+            "rating": 1 + i % 5,
+            "title": "Quick response and neat work",
+            "comment": COMMENTS[i % len(COMMENTS)],
+            "relationship": "customer",
+            "work_quality": 4,
+            "communication": 5,
+            "reliability": 4,
+            "professionalism": 5,
+            "would_recommend": i % 4 != 0,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+            "is_verified": i % 3 == 0,
+            "verification_status": "verified" if i % 3 == 0 else "no_proof",
+            "helpful_count": i % 7,
+            "reported_count": 0,
+        }
+    return {
+        "users": users, "persons": persons, "reviews": reviews, "scams": {},
+        "scam_votes": {}, "profile_claims": {}, "oauth_accounts": {}, "flagged_reviews": {}
+    }
+
+
+def bench_write(database, path, compress):
+    start = time.perf_counter()
+    size = save_snapshot(database, path, compress=compress)
+    return time.perf_counter() - start, size
+
+
+def bench_restore(path, use_mmap):
+    gc.collect()
+    start = time.perf_counter()
+    _, collections = load_snapshot(path, use_mmap=use_mmap)
+    elapsed = time.perf_counter() - start
+    assert len(collections["reviews"]) == REVIEW_COUNT
+    del collections
+    return elapsed
+
+
+def bench_json_baseline(database, path):
+    start = time.perf_counter()
+    with open(path, "w") as f:
+        json.dump(database, f, default=str)
+    write = time.perf_counter() - start
+    size = os.path.getsize(path)
+    start = time.perf_counter()
+    with open(path) as f:
+        json.load(f)
+    return write, time.perf_counter() - start, size
+
+
+if __name__ == "__main__":
+    print(f"🏗️  Building DATABASE: {USER_COUNT:,} users, {PERSON_COUNT:,} persons, {REVIEW_COUNT:,} reviews")
+    database = build_database()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.snapshot"
+        zlib_path = Path(tmp) / "zlib.snapshot"
+        json_path = Path(tmp) / "baseline.json"
+
+        raw_write, raw_size = bench_write(database, raw_path, compress=False)
+        zlib_write, zlib_size = bench_write(database, zlib_path, compress=True)
+        json_write, json_read, json_size = bench_json_baseline(database, json_path)
+        json_path.unlink()
+
+        # Free the source data so restores do not compete for memory
+        del database
+        gc.collect()
+
+        print(f"📦 {'format':<22}{'write':>10}{'restore':>10}{'size':>12}")
+        print(f"   {'json (baseline)':<22}{json_write:>9.2f}s{json_read:>9.2f}s{json_size / 2**20:>10.1f}MB")
+        print(f"   {'pickle':<22}{raw_write:>9.2f}s{bench_restore(raw_path, use_mmap=False):>9.2f}s{raw_size / 2**20:>10.1f}MB")
+        print(f"   {'pickle + mmap':<22}{'':>10}{bench_restore(raw_path, use_mmap=True):>9.2f}s")
+        print(f"   {'pickle + zlib':<22}{zlib_write:>9.2f}s{bench_restore(zlib_path, use_mmap=True):>9.2f}s{zlib_size / 2**20:>10.1f}MB")
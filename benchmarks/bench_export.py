@@ -0,0 +1,61 @@
+"""
+Benchmark: bulk export - streamed chunks vs serializing the whole collection at once
+Reports throughput and peak memory (tracemalloc) for NDJSON, CSV and gzipped NDJSON
+
+Usage:
+    python benchmarks/bench_export.py [--reviews 200000]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.datagen import generate_records
+from bulk_export import export_stream
+from json_response import dumps
+
+
+def measure(func):
+    """(seconds, bytes produced, peak MB allocated); timed in a separate run, tracemalloc slows allocation"""
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, peak / 1024 / 1024
+
+
+def streamed(reviews, fmt, gzip=False):
+    return lambda: sum(len(chunk) for chunk in export_stream("reviews", reviews, fmt, gzip))
+
+
+def all_at_once(reviews):
+    return lambda: len(b"\n".join([dumps(review) for review in reviews.values()]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=200_000)
+    args = parser.parse_args()
+    reviews = {
+        record["id"]: record
+        for collection, record in generate_records(args.reviews // 5, args.reviews, seed=args.reviews)
+        if collection == "reviews"
+    }
+
+    print(f"📤 Exporting {len(reviews):,} reviews")
+    print(f"   {'':>16} {'records/s':>10} {'output':>10} {'peak memory':>12}")
+    for label, func in [
+        ("ndjson stream", streamed(reviews, "ndjson")),
+        ("csv stream", streamed(reviews, "csv")),
+        ("ndjson.gz stream", streamed(reviews, "ndjson", gzip=True)),
+        ("ndjson at once", all_at_once(reviews)),
+    ]:
+        elapsed, size, peak_mb = measure(func)
+        print(f"   {label:>16} {len(reviews) / elapsed:>10,.0f} {size / 1024 / 1024:>7.1f} MB {peak_mb:>9.1f} MB")
@@ -0,0 +1,98 @@
+"""
+Benchmark: facet filters and counts - FacetIndex bitmaps vs filtering and counting every person
+Second table: high-cardinality services_offered (every value sparse), counted for search-sized results
+
+Usage:
+    python benchmarks/bench_facets.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+from collections import Counter
+
+from benchmarks.datagen import generate_records
+from facet_index import FACETS, FacetIndex, facet_values
+
+SIZES = [10_000, 100_000, 1_000_000]
+REPEAT = 20
+FILTERS = {"languages": ["Tamil", "Malayalam"], "payment_modes": ["Cards"]}
+SPARSE_SIZES = [10_000, 200_000]
+SPARSE_SERVICES = 50_000  # distinct services_offered values
+SERVICES_PER_PERSON = 5
+RESULT_SIZES = [0, 50, 1_000, 20_000]
+
+
+def scan(persons):
+    """Without the index: test every person against the filters, then count their values"""
+    wanted = {facet: {value.lower() for value in values} for facet, values in FILTERS.items()}
+    matched, counts = [], {facet: Counter() for facet in FACETS}
+    for person in persons:
+        values = facet_values(person)
+        if all(wanted[facet] & set(values.get(facet, ())) for facet in wanted):
+            matched.append(person["id"])
+            for facet, labels in values.items():
+                counts[facet].update(labels.values())
+    return matched, counts
+
+
+def timed(func):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def with_many_services(persons, rng):
+    """Give every person SERVICES_PER_PERSON services out of SPARSE_SERVICES distinct ones"""
+    for person in persons:
+        person["services_offered"] = [f"Service {rng.randrange(SPARSE_SERVICES)}" for _ in range(SERVICES_PER_PERSON)]
+    return persons
+
+
+def sparse_counts():
+    print(f"\n🧮 Counts with {SPARSE_SERVICES:,} distinct services_offered, {SERVICES_PER_PERSON} per person")
+    print(f"   {'persons':>9} " + " ".join(f"{f'{size:,} matched':>15}" for size in RESULT_SIZES))
+    for count in SPARSE_SIZES:
+        rng = random.Random(count)
+        persons = with_many_services(
+            [record for collection, record in generate_records(count, count, seed=count) if collection == "persons"], rng
+        )
+        index = FacetIndex()
+        index.rebuild(persons)
+        timings = []
+        for size in RESULT_SIZES:
+            result = rng.sample(persons, min(size, count))
+            within = index.bitmap_of(person["id"] for person in result)
+            expected = Counter(service.lower() for person in result for service in set(person["services_offered"]))
+            top = index.counts(within, top=1)["services_offered"]
+            assert [entry["count"] for entry in top] == [max(expected.values())] if expected else not top
+            timings.append(timed(lambda: index.counts(within)))
+        print(f"   {count:>9,} " + " ".join(f"{ms:>12.2f} ms" for ms in timings))
+
+
+if __name__ == "__main__":
+    print(f"🧮 Facet filter {FILTERS} + counts")
+    print(f"   {'persons':>9} {'build':>8} {'matched':>9} {'filter':>10} {'counts':>10} {'all counts':>11} {'scan':>10}")
+    for count in SIZES:
+        persons = [record for collection, record in generate_records(count, count * 2, seed=count) if collection == "persons"]
+        index = FacetIndex()
+        start = time.perf_counter()
+        index.rebuild(persons)
+        build_s = time.perf_counter() - start
+
+        matched = index.match(FILTERS)
+        filter_ms = timed(lambda: index.ids(index.match(FILTERS)))
+        counts_ms = timed(lambda: index.counts(matched))
+        all_counts_ms = timed(lambda: index.counts())
+        start = time.perf_counter()
+        scanned, _ = scan(persons)
+        scan_ms = (time.perf_counter() - start) * 1000
+        assert sorted(scanned) == sorted(index.ids(matched))
+        print(f"   {count:>9,} {build_s:>7.1f}s {matched.bit_count():>9,} {filter_ms:>7.2f} ms "
+              f"{counts_ms:>7.2f} ms {all_counts_ms:>8.2f} ms {scan_ms:>7.0f} ms")
+    sparse_counts()
+
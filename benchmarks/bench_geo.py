@@ -0,0 +1,70 @@
+"""
+Benchmark: "near <area>" lookups - GeoIndex grid vs measuring the distance to every person
+Persons are scattered around the area centroids of geo_index, like vendors across Bengaluru
+
+Usage:
+    python benchmarks/bench_geo.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from geo_index import AREA_CENTROIDS, GeoIndex, coordinates_from_maps_url, distance_km
+
+SIZES = [10_000, 100_000, 1_000_000]
+RADII_KM = [1, 3, 5]
+LIMIT = 20
+QUERIES = 200
+
+
+def build(count, rng):
+    centres = [(lat, lng) for lat, lng, _ in AREA_CENTROIDS.values()]
+    persons = []
+    for i in range(count):
+        lat, lng = rng.choice(centres)
+        lat, lng = rng.gauss(lat, 0.02), rng.gauss(lng, 0.02)
+        persons.append({"id": f"person{i}", "google_maps_url": f"https://www.google.com/maps/@{lat:.6f},{lng:.6f},17z"})
+    return persons
+
+
+def scan(points, lat, lng, radius_km):
+    """Without the index: distance to every person"""
+    found = []
+    for person_id, (point_lat, point_lng) in points.items():
+        distance = distance_km(lat, lng, point_lat, point_lng)
+        if distance <= radius_km:
+            found.append((person_id, distance))
+    found.sort(key=lambda item: item[1])
+    return found
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    centres = [(lat, lng) for lat, lng, _ in AREA_CENTROIDS.values()]
+    print(f"📍 Radius lookups around area centres ({QUERIES} queries per radius)")
+    print(f"   {'persons':>9} {'build':>8} {'radius':>7} {'found':>8} {'grid':>10} {'nearest ' + str(LIMIT):>11} {'scan':>10}")
+    for count in SIZES:
+        persons = build(count, rng)
+        index = GeoIndex()
+        start = time.perf_counter()
+        index.rebuild(persons)
+        build_s = time.perf_counter() - start
+        points = {person["id"]: coordinates_from_maps_url(person["google_maps_url"]) for person in persons}
+        for radius in RADII_KM:
+            queries = [rng.choice(centres) for _ in range(QUERIES)]
+            start = time.perf_counter()
+            found = sum(len(index.nearby(lat, lng, radius)) for lat, lng in queries) / QUERIES
+            grid_ms = (time.perf_counter() - start) / QUERIES * 1000
+            start = time.perf_counter()
+            for lat, lng in queries:
+                index.nearby(lat, lng, radius, LIMIT)
+            nearest_ms = (time.perf_counter() - start) / QUERIES * 1000
+            start = time.perf_counter()
+            scan(points, *queries[0], radius)
+            scan_ms = (time.perf_counter() - start) * 1000
+            size, built = (f"{count:,}", f"{build_s:.1f}s") if radius == RADII_KM[0] else ("", "")
+            print(f"   {size:>9} {built:>8} {radius:>4} km {found:>8,.0f} {grid_ms:>7.2f} ms {nearest_ms:>8.2f} ms {scan_ms:>7.1f} ms")
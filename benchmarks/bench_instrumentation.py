@@ -0,0 +1,80 @@
+"""
+Benchmark: MetricsMiddleware overhead on real routes of main.app
+Drives the ASGI app directly (no network) with and without the middleware wrapped around it
+
+Usage:
+    python benchmarks/bench_instrumentation.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+import asyncio
+import logging
+import time
+
+logging.disable(logging.INFO)
+
+import main  # noqa: E402
+from instrumentation import Metrics, MetricsMiddleware  # noqa: E402
+
+REQUESTS = 2_000
+ROUNDS = 5
+
+
+def make_scope(path, query=b""):
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query,
+        "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+    }
+
+
+async def drive(app, scope):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await app(dict(scope), receive, send)
+        best = min(best, time.perf_counter() - start)
+    return best / REQUESTS * 1e6
+
+
+async def run():
+    person_id = next(iter(main.DATABASE["persons"]))
+    routes = [
+        ("/api/stats", make_scope("/api/stats")),
+        ("/api/persons/{id}", make_scope(f"/api/persons/{person_id}")),
+        ("/api/persons/search", make_scope("/api/persons/search", b"q=plumber+in+indiranagar")),
+    ]
+    print(f"📈 MetricsMiddleware overhead (best of {ROUNDS} x {REQUESTS:,} requests)")
+    print(f"   {'route':<22} {'plain':>9} {'spans 10%':>11} {'spans 100%':>11} {'overhead @10%':>14}")
+    for label, scope in routes:
+        plain = await drive(main.app, scope)
+        sampled = await drive(MetricsMiddleware(main.app, Metrics(enabled=True, span_sample_rate=0.1)), scope)
+        every = await drive(MetricsMiddleware(main.app, Metrics(enabled=True, span_sample_rate=1.0)), scope)
+        overhead = (sampled - plain) / plain * 100
+        print(f"   {label:<22} {plain:7.1f}µs {sampled:9.1f}µs {every:9.1f}µs {overhead:12.1f}%")
+
+    async def noop(scope, receive, send):
+        scope["route"] = main.app.routes[-1]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    scope = make_scope("/api/stats")
+    fixed = await drive(MetricsMiddleware(noop, Metrics(enabled=True, span_sample_rate=0.1)), scope) \
+        - await drive(noop, scope)
+    print(f"   middleware alone (no-op app): {fixed:.1f} µs per request")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
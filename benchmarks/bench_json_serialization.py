@@ -0,0 +1,111 @@
+"""
+Benchmark: serializing a get_person payload (one person with 5k reviews)
+Compares FastAPI's jsonable_encoder path with FastJSONResponse (orjson and stdlib)
+
+Usage:
+    python benchmarks/bench_json_serialization.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import json_response
+from json_response import FastJSONResponse
+
+REVIEW_COUNT = 5000
+ROUNDS = 20
+
+
+def build_payload():
+    now = datetime.utcnow()
+    person = {
+        "id": str(ObjectId()),
+        "name": "Namma Plumbers Collective",
+        "category": "Plumber",
+        "area": "HSR Layout Sector 2",
+        "skills": ["Leak fixing", "Bathroom remodel", "Water tank cleaning"],
+        "created_at": now - timedelta(days=400),
+        "updated_at": now,
+        "review_count": REVIEW_COUNT,
+        "average_rating": 4.4,
+        "total_rating": REVIEW_COUNT * 4
+    }
+    reviews = []
+    for i in range(REVIEW_COUNT):
+        reviews.append({
+            "id": ObjectId(),
+            "person_id": person["id"],
+            "reviewer_id": f"user{i}",
+            "reviewer_username": f"reviewer_{i}",
+            "rating": 1 + i % 5,
+            "title": "Quick response and neat work",
+            "comment": "Came within the hour, fixed the leak and cleaned up after. Fair pricing.",
+            "relationship": "customer",
+            "work_quality": 4,
+            "communication": 5,
+            "reliability": 4,
+            "professionalism": 5,
+            "would_recommend": True,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+            "is_verified": i % 3 == 0,
+            "verification_status": "verified" if i % 3 == 0 else "no_proof",
+            "helpful_count": i % 7,
+            "reported_count": 0,
+            "reviewer_email_verified": True,
+            "reviewer_linkedin_verified": False,
+            "reviewer_company_verified": False
+        })
+    return {"person": person, "reviews": reviews}
+
+
+def time_it(render, payload):
+    best = float("inf")
+    size = 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        body = render(payload)
+        best = min(best, time.perf_counter() - start)
+        size = len(body)
+    return best, size
+
+
+def default_path(payload):
+    # What FastAPI does for a plain dict return value
+    return JSONResponse(jsonable_encoder(payload, custom_encoder={ObjectId: str})).body
+
+
+def fast_path(payload):
+    return FastJSONResponse(payload).body
+
+
+def stdlib_fallback(payload):
+    json_response.HAS_ORJSON = False
+    try:
+        return FastJSONResponse(payload).body
+    finally:
+        json_response.HAS_ORJSON = json_response.orjson is not None
+
+
+if __name__ == "__main__":
+    payload = build_payload()
+    assert json.loads(default_path(payload)) == json.loads(fast_path(payload)) == json.loads(stdlib_fallback(payload))
+
+    baseline, size = time_it(default_path, payload)
+    print(f"📦 get_person payload: 1 person + {REVIEW_COUNT:,} reviews ({size / 1024:,.0f} KB), best of {ROUNDS}")
+    print(f"   jsonable_encoder + JSONResponse: {baseline * 1000:8.1f} ms")
+    for label, render in [("FastJSONResponse (stdlib)", stdlib_fallback), ("FastJSONResponse (orjson)", fast_path)]:
+        if label.endswith("(orjson)") and not json_response.HAS_ORJSON:
+            print(f"   {label}: orjson not installed")
+            continue
+        elapsed, _ = time_it(render, payload)
+        print(f"   {label}: {elapsed * 1000:8.1f} ms  ({baseline / elapsed:.1f}x)")
@@ -0,0 +1,83 @@
+"""
+Benchmark: admin moderation queue - scanning every flag vs ModerationQueue
+Times building the admin page's pending list and resolving one review's flags
+
+Usage:
+    python benchmarks/bench_moderation_queue.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from moderation_queue import ModerationQueue
+
+FLAGS = 100_000
+REVIEWS = 20_000
+PENDING_RATIO = 0.2
+PAGE = 50
+CALLS = 50
+
+
+def build(rng):
+    now = datetime.utcnow()
+    flags = {}
+    for i in range(FLAGS):
+        flags[f"flag{i}"] = {
+            "id": f"flag{i}",
+            "review_id": f"review{int(rng.paretovariate(1.2)) % REVIEWS}",
+            "status": "pending" if rng.random() < PENDING_RATIO else rng.choice(("resolved", "dismissed")),
+            "created_at": now - timedelta(minutes=rng.randrange(60 * 24 * 30)),
+        }
+    return flags
+
+
+def scan_pending(flags):
+    """admin_page before the queue: every flag checked, unordered"""
+    return [flag_id for flag_id, flag in flags.items() if flag["status"] == "pending"][:PAGE]
+
+
+def scan_resolve(flags, review_id):
+    """moderate_review before the queue: every flag checked for the review id"""
+    for flag in flags.values():
+        if flag["review_id"] == review_id and flag["status"] == "pending":
+            flag["status"] = "resolved"
+
+
+def timed(func, calls=CALLS):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    flags = build(rng)
+    queue = ModerationQueue()
+    start = time.perf_counter()
+    queue.rebuild(flags.values())
+    rebuild_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🛡️  Moderation queue ({FLAGS:,} flags on {REVIEWS:,} reviews, {queue.pending_count:,} pending)")
+    print(f"   queue rebuild                         {rebuild_ms:9.1f} ms")
+    scan = timed(lambda i: scan_pending(flags))
+    indexed = timed(lambda i: queue.top(PAGE))
+    print(f"   admin page top {PAGE} pending           scan {scan:9.1f} µs   queue {indexed:7.1f} µs (priority ordered)")
+
+    review_ids = [f"review{rng.randrange(REVIEWS)}" for _ in range(CALLS)]
+    scan = timed(lambda i: scan_resolve(flags, review_ids[i]))
+
+    def resolve(i):
+        for flag_id in queue.flag_ids(review_ids[i]):
+            flag = flags[flag_id]
+            if flag["status"] == "pending":
+                flag["status"] = "resolved"
+                queue.update(flag)
+
+    indexed = timed(resolve)
+    print(f"   resolve one review's flags            scan {scan:9.1f} µs   queue {indexed:7.1f} µs")
@@ -0,0 +1,102 @@
+"""
+Benchmark: typo-tolerant name lookup - NameIndex.similar vs directory size
+Compares the trigram index with the substring scan search_persons used for names. Names are
+built from syllables and drawn Zipf-style from fixed pools, like real directories: the
+distinct-word vocabulary the index searches grows much slower than the person count.
+
+Usage:
+    python benchmarks/bench_name_index.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from name_index import NameIndex
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+FIRST_NAMES = 5_000
+SURNAMES = 20_000
+BUSINESS_WORDS = 20_000
+QUERIES = 200
+SYLLABLES = [
+    "sri", "ni", "vas", "lak", "shmi", "ven", "ka", "te", "sha", "ra", "me", "ku", "mar", "an", "ja",
+    "li", "pra", "kash", "su", "re", "sh", "ma", "dhu", "ga", "ne", "san", "ji", "vi", "jay", "ha",
+    "ri", "de", "vi", "na", "ga", "raj", "pa", "dma", "bal", "ki", "ran", "go", "pal", "sa", "si",
+]
+TRADES = ["Plumbing", "Electricals", "Woodcraft", "Tiffins", "Motors", "Tailors", "Pharma", "Traders"]
+
+
+def make_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+
+def zipf_pool(size, rng):
+    """Words with Zipf (1/rank) cumulative weights"""
+    weights, total = [], 0.0
+    for rank in range(1, size + 1):
+        total += 1 / rank
+        weights.append(total)
+    return [make_word(rng) for _ in range(size)], weights
+
+
+def build(count, rng):
+    pools = [zipf_pool(size, rng) for size in (FIRST_NAMES, SURNAMES, BUSINESS_WORDS)]
+    first, last, business = (rng.choices(words, cum_weights=weights, k=count) for words, weights in pools)
+    return [
+        {"id": f"person{i}", "name": f"{first[i]} {last[i]}", "company": f"{business[i]} {rng.choice(TRADES)}"}
+        for i in range(count)
+    ]
+
+
+def typo(word, rng):
+    """Drop, double or swap one character"""
+    i = rng.randrange(1, len(word) - 1)
+    return rng.choice([word[:i] + word[i + 1:], word[:i] + word[i] + word[i:], word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]])
+
+
+def scan(persons, query):
+    """The pre-index name check: substring either way, else any query word in the name"""
+    hits = []
+    for person in persons:
+        name = person["name"].lower()
+        if query in name or name in query or any(part in name for part in query.split()):
+            hits.append(person["id"])
+    return hits
+
+
+def timed(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(11)
+    print(f"🔤 Fuzzy name lookup ({QUERIES} misspelled queries per size)")
+    print(f"   {'persons':>9} {'words':>8} {'build':>9} {'scan (exact only)':>18} {'1-word query':>13} {'2-word query':>13} {'recall':>7}")
+    for count in SIZES:
+        persons = build(count, rng)
+        index = NameIndex()
+        start = time.perf_counter()
+        index.rebuild(persons)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        targets = [rng.choice(persons) for _ in range(QUERIES)]
+        queries = [typo(target["name"].split()[0].lower(), rng) for target in targets]
+        pairs = [f"{target['name'].split()[0]} {typo(target['name'].split()[1].lower(), rng)}" for target in targets]
+        scan_us = timed(lambda q: scan(persons, q), queries[:20])
+        index_us = timed(index.similar, queries)
+        pair_us = timed(index.similar, pairs)
+        # Found = a person with the intended name is returned (popular names repeat)
+        names = {person["id"]: person["name"] for person in persons}
+        recall = sum(
+            target["name"] in {names[person_id] for person_id in index.similar(query)}
+            for target, query in zip(targets, pairs)
+        ) / QUERIES
+        print(f"   {count:>9,} {index.vocabulary_size:>8,} {build_ms:>7.0f}ms {scan_us:>15.1f} µs "
+              f"{index_us:>10.1f} µs {pair_us:>10.1f} µs {recall:>6.0%}")
@@ -0,0 +1,58 @@
+"""
+Benchmark: batch NLP extraction - BatchExtractor process pool vs one description at a time
+Descriptions are built from the generated persons; speedup is bounded by the CPU count
+
+Usage:
+    python benchmarks/bench_nlp_batch.py [--records 5000]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+
+from batch_import import BatchExtractor
+from benchmarks.datagen import generate_records
+from nlp_processor import nlp_processor
+
+
+def descriptions(count):
+    for collection, person in generate_records(count, 0, seed=count):
+        if collection == "persons":
+            yield (f"{person['name']} is a {person.get('job_title') or person.get('category')} at {person.get('company')} "
+                   f"in {person.get('city')}. Phone: {person.get('phone')}")
+
+
+async def pooled(texts, workers):
+    async def records():
+        for number, text in enumerate(texts, 1):
+            yield number, text, None
+
+    extractor = BatchExtractor(workers=workers)
+    try:
+        return [result async for result in extractor.extract(records())]
+    finally:
+        extractor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    args = parser.parse_args()
+    texts = list(descriptions(args.records))
+
+    print(f"🧵 Extracting {len(texts):,} descriptions ({os.cpu_count()} CPUs)")
+    start = time.perf_counter()
+    for text in texts:
+        nlp_processor.extract_person_fields(text)
+    sequential = time.perf_counter() - start
+    print(f"   {'sequential':>12}: {len(texts) / sequential:>8,.0f} records/s")
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        results = asyncio.run(pooled(texts, workers))
+        elapsed = time.perf_counter() - start
+        assert len(results) == len(texts)
+        print(f"   {f'{workers} workers':>12}: {len(texts) / elapsed:>8,.0f} records/s ({sequential / elapsed:.1f}x)")
@@ -0,0 +1,63 @@
+"""
+Benchmark: phonetic name lookup - PhoneticIndex.matches vs keying every person per query
+Queries are transliteration variants of generated names (Shrinivas for Srinivas, Laxmi for Lakshmi)
+
+Usage:
+    python benchmarks/bench_phonetic.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from benchmarks.datagen import generate_records
+from phonetic_index import PhoneticIndex, phonetic_keys
+
+SIZES = [10_000, 100_000, 1_000_000]
+QUERIES = 300
+VARIANTS = [("sri", "shri"), ("ee", "i"), ("ksh", "x"), ("th", "t"), ("v", "w"), ("sh", "s")]
+
+
+def variant(name, rng):
+    """Respell a name the way transliterations differ; unchanged if no rule applies"""
+    lowered = name.lower()
+    rules = [(a, b) for a, b in VARIANTS if a in lowered] + [(b, a) for a, b in VARIANTS if b in lowered]
+    if not rules:
+        return lowered
+    old, new = rng.choice(rules)
+    return lowered.replace(old, new, 1)
+
+
+def scan(persons, query):
+    """Without the index: compute every person's keys for each query"""
+    wanted = set(phonetic_keys(query))
+    return [person["id"] for person in persons if wanted & set(phonetic_keys(person["name"]))]
+
+
+def timed(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+    print(f"🗣️ Phonetic name lookup ({QUERIES} respelled queries per size)")
+    print(f"   {'persons':>9} {'keys':>9} {'probe':>10} {'scan':>10} {'found':>7}")
+    for count in SIZES:
+        persons = [record for collection, record in generate_records(count, count * 2, seed=count) if collection == "persons"]
+        start = time.perf_counter()
+        index = PhoneticIndex()
+        index.rebuild(persons)
+        keys_s = time.perf_counter() - start
+
+        targets = [rng.choice(persons) for _ in range(QUERIES)]
+        queries = [variant(target["name"], rng) for target in targets]
+        probe_us = timed(index.matches, queries)
+        scan_us = timed(lambda query: scan(persons, query), queries[:5])
+        found = sum(index.matches(query).get(target["id"]) == 1.0 for target, query in zip(targets, queries)) / QUERIES
+        print(f"   {count:>9,} {keys_s:>8.1f}s {probe_us:>7.1f} µs {scan_us / 1000:>7.1f} ms {found:>6.0%}")
@@ -0,0 +1,133 @@
+"""
+Benchmark: per-request overhead of the slowapi limiter for each storage backend
+Calls a @limiter.limit-decorated endpoint directly and subtracts the undecorated cost,
+then compares the default-limit middlewares on an app with ROUTES routes
+
+Usage:
+    python benchmarks/bench_rate_limiter.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import logging
+import tempfile
+import time
+
+from fastapi import FastAPI
+from slowapi import Limiter
+from slowapi.middleware import SlowAPIASGIMiddleware
+from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from rate_limiting import DefaultLimitMiddleware, client_ip  # also registers sliding-memory:// and sqlite://
+
+CALLS = 20_000
+CLIENTS = 200
+ROUTES = 60  # about the size of main.app
+
+logging.getLogger("slowapi").setLevel(logging.CRITICAL)
+
+
+def make_scope(i):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/persons/search",
+        "query_string": b"",
+        "headers": [],
+        "client": (f"10.0.{i // 256}.{i % 256}", 50000),
+        "app": None,
+    }
+
+
+async def endpoint(request: Request):
+    return {"ok": True}
+
+
+async def per_call_us(func, scopes, rounds=5):
+    # A fresh Request per call - slowapi marks a request as checked in request.state
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            await func(request=Request(dict(scopes[i % CLIENTS])))
+        best = min(best, time.perf_counter() - start)
+    return best / CALLS * 1e6
+
+
+def build_app(limiter):
+    app = FastAPI()
+    app.state.limiter = limiter
+    for i in range(ROUTES):
+        app.add_api_route(f"/api/resource{i}/{{item_id}}", endpoint, methods=["GET"])
+
+    @app.post("/api/auth/login")
+    @limiter.limit("10/minute")
+    async def login(request: Request):
+        return {"ok": True}
+
+    app.add_api_route("/api/persons/{person_id}", endpoint, methods=["GET"])
+    return app
+
+
+async def middleware_us(middleware, scopes, rounds=5):
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            await middleware(dict(scopes[i % CLIENTS]), receive, send)
+        best = min(best, time.perf_counter() - start)
+    return best / CALLS * 1e6
+
+
+async def bench_middleware(scopes):
+    async def inner(scope, receive, send):
+        pass
+
+    print(f"⏱️  Default-limit middleware overhead ({ROUTES + 2} routes, last route matched)")
+    baseline = await middleware_us(inner, scopes)
+    for label, build in (
+        ("slowapi SlowAPIASGIMiddleware", lambda app, limiter: SlowAPIASGIMiddleware(inner)),
+        ("rate_limiting.DefaultLimitMiddleware", lambda app, limiter: DefaultLimitMiddleware(
+            inner, limiter=limiter, limit="1000000/minute")),
+    ):
+        limiter = Limiter(key_func=client_ip, storage_uri="sliding-memory://",
+                          strategy="sliding-window-counter", default_limits=["1000000/minute"])
+        app = build_app(limiter)
+        app_scopes = [dict(scope, app=app, path="/api/persons/p1") for scope in scopes]
+        overhead = await middleware_us(build(app, limiter), app_scopes) - baseline
+        print(f"   {label:<42} {overhead:7.1f} µs")
+
+
+async def main():
+    scopes = [make_scope(i) for i in range(CLIENTS)]
+    baseline = await per_call_us(endpoint, scopes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            ("memory:// fixed-window (limits default)", "memory://", "fixed-window"),
+            ("sliding-memory:// sliding-window", "sliding-memory://", "sliding-window-counter"),
+            ("sqlite:// sliding-window (shared)", f"sqlite:///{tmp}/limits.db", "sliding-window-counter"),
+        ]
+        print(f"⏱️  Limiter overhead per request ({CALLS:,} calls, {CLIENTS} client IPs, best of 5)")
+        for label, uri, strategy in backends:
+            for key_label, key_func in (("get_remote_address", get_remote_address), ("client_ip", client_ip)):
+                limiter = Limiter(key_func=key_func, storage_uri=uri, strategy=strategy)
+                limited = limiter.limit("1000000/minute")(endpoint)
+                overhead = await per_call_us(limited, scopes) - baseline
+                print(f"   {label:<42} {key_label:<20} {overhead:7.1f} µs")
+
+    await bench_middleware(scopes)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
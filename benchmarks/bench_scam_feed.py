@@ -0,0 +1,73 @@
+"""
+Benchmark: scam feed page cost - sort per request vs the incrementally kept ScamRanking
+Also measures the cost a vote pays to re-key its scam in both orderings
+
+Usage:
+    python benchmarks/bench_scam_feed.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from scam_ranking import ScamRanking
+
+SCAM_COUNTS = (100, 1_000, 10_000)
+PAGE = 50
+CALLS = 500
+
+
+def build(count, rng):
+    now = datetime.utcnow()
+    return {
+        f"scam{i}": {
+            "id": f"scam{i}",
+            "upvotes": rng.randrange(5000),
+            "downvotes": rng.randrange(500),
+            "reported_date": now - timedelta(hours=rng.randrange(24 * 90)),
+        }
+        for i in range(count)
+    }
+
+
+def sort_per_request(scams):
+    """get_scams before the ranking: net votes computed and all scams sorted on every call"""
+    ordered = list(scams.values())
+    for scam in ordered:
+        scam["net_votes"] = scam["upvotes"] - scam["downvotes"]
+    ordered.sort(key=lambda x: x["net_votes"], reverse=True)
+    return ordered[:PAGE]
+
+
+def timed(func, calls=CALLS):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+    print(f"🚨 Scam feed, first page of {PAGE} ({CALLS} calls each)")
+    print(f"   {'scams':>7} {'sort/request':>14} {'ranking top':>12} {'ranking hot':>12} {'vote re-key':>12}")
+    for count in SCAM_COUNTS:
+        scams = build(count, rng)
+        ranking = ScamRanking()
+        ranking.rebuild(scams.values())
+        ids = list(scams)
+
+        sorted_us = timed(lambda i: sort_per_request(scams))
+        top_us = timed(lambda i: [scams[s] for s in ranking.page("top", 0, PAGE)[1]])
+        hot_us = timed(lambda i: [scams[s] for s in ranking.page("hot", 0, PAGE)[1]])
+
+        def vote(i):
+            scam = scams[ids[i % count]]
+            scam["upvotes"] += 1
+            ranking.update(scam)
+
+        vote_us = timed(vote)
+        print(f"   {count:>7,} {sorted_us:>11.1f} µs {top_us:>9.1f} µs {hot_us:>9.1f} µs {vote_us:>9.1f} µs")
@@ -0,0 +1,120 @@
+"""
+Benchmark: scam vote lookups with 100k votes - linear scans vs ScamVoteIndex
+Compares the old per-scam scan in get_scams and per-vote scan in vote_on_scam with
+index lookups, then checks the counters after concurrent voting from several threads
+
+Usage:
+    python benchmarks/bench_scam_votes.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import threading
+import time
+from datetime import datetime
+
+from scam_vote_index import ScamVoteIndex
+
+SCAMS = 200
+USERS = 20_000
+VOTES = 100_000
+LOOKUPS = 2_000
+THREADS = 8
+
+
+def build(rng):
+    scams = {f"scam{i}": {"id": f"scam{i}", "upvotes": 0, "downvotes": 0} for i in range(SCAMS)}
+    votes = {}
+    pairs = set()
+    while len(votes) < VOTES:
+        scam_id, user_id = f"scam{rng.randrange(SCAMS)}", f"user{rng.randrange(USERS)}"
+        if (scam_id, user_id) in pairs:
+            continue
+        pairs.add((scam_id, user_id))
+        vote_type = "upvote" if rng.random() < 0.7 else "downvote"
+        vote_id = f"vote{len(votes)}"
+        votes[vote_id] = {"id": vote_id, "scam_id": scam_id, "user_id": user_id, "vote_type": vote_type}
+        scams[scam_id]["upvotes" if vote_type == "upvote" else "downvotes"] += 1
+    return scams, votes
+
+
+def scan_user_votes(scams, votes, user_id):
+    """get_scams before the index: one scan of scam_votes per scam"""
+    result = {}
+    for scam in scams.values():
+        for vote in votes.values():
+            if vote["scam_id"] == scam["id"] and vote["user_id"] == user_id:
+                result[scam["id"]] = vote["vote_type"]
+                break
+    return result
+
+
+def scan_find(votes, scam_id, user_id):
+    """vote_on_scam before the index"""
+    for key, vote in votes.items():
+        if vote["scam_id"] == scam_id and vote["user_id"] == user_id:
+            return key
+    return None
+
+
+def timed(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def concurrent_votes(scams, votes, index):
+    """Threads toggle and flip votes; afterwards counters must match the stored votes"""
+    def worker(seed):
+        rng = random.Random(seed)
+        for i in range(5_000):
+            scam = scams[f"scam{rng.randrange(SCAMS)}"]
+            new_vote = {"id": f"t{seed}-{i}", "scam_id": scam["id"], "user_id": f"user{rng.randrange(50)}",
+                        "vote_type": rng.choice(("upvote", "downvote")), "voted_at": datetime.utcnow()}
+            index.cast(votes, scam, new_vote["user_id"], new_vote["vote_type"], new_vote)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    expected = {scam_id: [0, 0] for scam_id in scams}
+    for vote in votes.values():
+        expected[vote["scam_id"]][0 if vote["vote_type"] == "upvote" else 1] += 1
+    consistent = all([scam["upvotes"], scam["downvotes"]] == expected[scam_id] for scam_id, scam in scams.items())
+    return elapsed / (THREADS * 5_000) * 1e6, consistent
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    scams, votes = build(rng)
+    vote_list = list(votes.values())
+    index = ScamVoteIndex()
+
+    start = time.perf_counter()
+    index.rebuild(vote_list)
+    rebuild_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🗳️  Scam votes ({SCAMS} scams, {VOTES:,} votes, {USERS:,} users)")
+    print(f"   index rebuild                     {rebuild_ms:10.1f} ms")
+
+    samples = [vote_list[rng.randrange(VOTES)] for _ in range(LOOKUPS)]
+    scan = timed(lambda i: scan_find(votes, samples[i]["scam_id"], samples[i]["user_id"]), 50)
+    indexed = timed(lambda i: index.find(samples[i]["scam_id"], samples[i]["user_id"]), LOOKUPS)
+    print(f"   find user's vote (vote_on_scam)   scan {scan:10.1f} µs   index {indexed:6.2f} µs")
+
+    users = [sample["user_id"] for sample in samples]
+    scan = timed(lambda i: scan_user_votes(scams, votes, users[i]), 2)
+    indexed = timed(lambda i: index.user_votes(users[i]), LOOKUPS)
+    print(f"   user's votes per page (get_scams) scan {scan / 1000:10.1f} ms   index {indexed:6.2f} µs")
+
+    per_vote, consistent = concurrent_votes(scams, votes, index)
+    print(f"   concurrent cast ({THREADS} threads)       {per_vote:10.2f} µs/vote  "
+          f"counters {'✅ consistent' if consistent else '❌ drifted'}")
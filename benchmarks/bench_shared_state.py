@@ -0,0 +1,97 @@
+"""
+Benchmark: shared-state (SQLite WAL + change feed) throughput as worker count grows
+Each worker process keeps a local read cache and runs a request mix against it:
+every request pulls the change feed first, 90% then read a record, 10% write one
+
+Usage:
+    python benchmarks/bench_shared_state.py [seconds_per_run]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import multiprocessing
+import random
+import tempfile
+import time
+
+from shared_store import SharedStore
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+WORKER_COUNTS = (1, 2, 4, 8)
+RECORDS = 10_000
+WRITE_RATIO = 0.1
+
+
+def seed(path):
+    store = SharedStore(path)
+    store.seed_if_empty({"reviews": {
+        f"review{i}": {"id": f"review{i}", "person_id": f"person{i % 100}", "rating": 1 + i % 5,
+                       "comment": "Came within the hour, fixed the leak and cleaned up after."}
+        for i in range(RECORDS)
+    }})
+    store.close()
+
+
+def worker(path, worker_id, start_at, results):
+    store = SharedStore(path)
+    cache = store.load_all()
+    reviews = cache["reviews"]
+    rng = random.Random(worker_id)
+    reads = writes = applied = 0
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + SECONDS
+    while time.time() < deadline:
+        for collection, key, record in store.pull() or []:
+            applied += 1
+            if record is None:
+                cache[collection].pop(key, None)
+            else:
+                cache[collection][key] = record
+
+        key = f"review{rng.randrange(RECORDS)}"
+        if rng.random() < WRITE_RATIO:
+            record = dict(reviews[key], rating=rng.randint(1, 5))
+            reviews[key] = record
+            store.put("reviews", key, record)
+            writes += 1
+        else:
+            reviews.get(key)
+            reads += 1
+
+    store.close()
+    results.put((reads, writes, applied))
+
+
+def run(worker_count):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.db")
+        seed(path)
+        results = multiprocessing.Queue()
+        start_at = time.time() + 1.0
+        processes = [
+            multiprocessing.Process(target=worker, args=(path, i, start_at, results))
+            for i in range(worker_count)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    reads = sum(t[0] for t in totals)
+    writes = sum(t[1] for t in totals)
+    applied = sum(t[2] for t in totals)
+    return reads / SECONDS, writes / SECONDS, applied / SECONDS
+
+
+if __name__ == "__main__":
+    print(f"🔗 Shared state throughput ({RECORDS:,} records, {int(WRITE_RATIO * 100)}% writes, "
+          f"{SECONDS:.0f}s per run, {os.cpu_count()} CPU)")
+    print(f"   {'workers':>7} {'reads/s':>12} {'writes/s':>10} {'feed applied/s':>15}")
+    for count in WORKER_COUNTS:
+        reads, writes, applied = run(count)
+        print(f"   {count:>7} {reads:>12,.0f} {writes:>10,.0f} {applied:>15,.0f}")
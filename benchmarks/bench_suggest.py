@@ -0,0 +1,73 @@
+"""
+Benchmark: /api/persons/suggest prefix lookups - SuggestIndex vs scanning every person
+Prefixes of 1-5 characters taken from generated names, companies, areas and categories
+
+Usage:
+    python benchmarks/bench_suggest.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from benchmarks.datagen import generate_records
+from suggest_index import FIELDS, SuggestIndex, normalize
+
+SIZES = [10_000, 100_000, 1_000_000]
+LIMIT = 8
+QUERIES = 300
+
+
+def scan(persons, prefix):
+    """Suggestions without the index: check every person, then sort the matches"""
+    prefix = normalize(prefix)
+    matches = [
+        person for person in persons
+        if any(word.startswith(prefix) for field in FIELDS for word in normalize(person.get(field) or "").split())
+    ]
+    matches.sort(key=lambda person: (-person.get("review_count", 0), -person.get("average_rating", 0.0)))
+    return matches[:LIMIT]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2] * 1e6, ordered[int(len(ordered) * 0.99)] * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(5)
+    print(f"🔡 Prefix suggestions, top {LIMIT} by review count ({QUERIES} prefixes per length)")
+    print(f"   {'persons':>9} {'build':>8} {'len':>4} {'index p50':>10} {'index p99':>10} {'scan':>10}")
+    for count in SIZES:
+        persons = [record for collection, record in generate_records(count, count * 2, seed=count) if collection == "persons"]
+        index = SuggestIndex()
+        start = time.perf_counter()
+        index.rebuild(persons)
+        build_s = time.perf_counter() - start
+
+        for length in range(1, 6):
+            prefixes = []
+            while len(prefixes) < QUERIES:
+                person = rng.choice(persons)
+                words = normalize(person.get(rng.choice(FIELDS)) or "").split()
+                if words:
+                    prefixes.append(rng.choice(words)[:length])
+            samples = []
+            for prefix in prefixes:
+                started = time.perf_counter()
+                index.suggest(prefix, LIMIT)
+                samples.append(time.perf_counter() - started)
+            p50, p99 = percentiles(samples)
+            scan_start = time.perf_counter()
+            scan(persons, prefixes[0])
+            scan_us = (time.perf_counter() - scan_start) * 1e6
+            size, build = (f"{count:,}", f"{build_s:.1f}s") if length == 1 else ("", "")
+            print(f"   {size:>9} {build:>8} {length:>4} {p50:>7.1f} µs {p99:>7.1f} µs {scan_us / 1000:>7.1f} ms")
+
+        new_person = dict(persons[0], id="new_person", name="Zebra Crossing Repairs")
+        start = time.perf_counter()
+        index.add(new_person)
+        print(f"   incremental add: {(time.perf_counter() - start) * 1e6:.1f} µs")
@@ -0,0 +1,68 @@
+"""
+Benchmark: JWT verification with and without the token cache
+Simulates SPA bursts - 1k distinct tokens, each reused for several calls in a row
+
+Usage:
+    python benchmarks/bench_token_cache.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+import warnings
+
+import jwt
+
+warnings.filterwarnings("ignore")
+
+from main import JWT_ALGORITHM, JWT_SECRET, create_jwt_token, token_cache, verify_jwt_token
+
+DISTINCT_TOKENS = 1000
+REQUESTS = 100_000
+BURST_SIZE = 8
+
+
+def build_load():
+    """Token sequence where each picked token fires a short burst of calls"""
+    rng = random.Random(42)
+    tokens = [
+        create_jwt_token({"sub": f"user{i}", "email": f"user{i}@example.com", "username": f"user{i}"})
+        for i in range(DISTINCT_TOKENS)
+    ]
+    load = []
+    while len(load) < REQUESTS:
+        load.extend([rng.choice(tokens)] * BURST_SIZE)
+    return load[:REQUESTS]
+
+
+def run_uncached(load):
+    start = time.perf_counter()
+    for token in load:
+        jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    return time.perf_counter() - start
+
+
+def run_cached(load):
+    token_cache.clear()
+    start = time.perf_counter()
+    for token in load:
+        verify_jwt_token(token)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    load = build_load()
+
+    uncached = run_uncached(load)
+    cached = run_cached(load)
+    stats = token_cache.stats()
+
+    print(f"🔐 {REQUESTS:,} authenticated calls over {DISTINCT_TOKENS:,} distinct tokens")
+    print(f"   Uncached jwt.decode:   {REQUESTS / uncached:>12,.0f} verifications/sec")
+    print(f"   Cached verify_jwt:     {REQUESTS / cached:>12,.0f} verifications/sec")
+    print(f"   jwt.decode calls:      {REQUESTS:,} -> {stats['misses']:,}")
+    print(f"   Cache hits:            {stats['hits']:,} (size {stats['size']}/{stats['max_size']})")
+    print(f"   Speedup:               {uncached / cached:.1f}x")
@@ -0,0 +1,61 @@
+"""
+Benchmark: write-ahead log append cost per fsync policy
+Each append logs a review-sized record, as mark_changed does for a review write
+
+Usage:
+    python benchmarks/bench_wal.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from write_ahead_log import WriteAheadLog, read_wal
+
+WRITES = 20_000
+ALWAYS_WRITES = 2_000  # fsync per write is slow - keep the run short
+
+
+def review(i):
+    return {
+        "id": f"review{i}",
+        "person_id": f"person{i % 100}",
+        "reviewer_id": f"user{i % 500}",
+        "rating": 1 + i % 5,
+        "title": "Quick response and neat work",
+        "comment": "Came within the hour, fixed the leak and cleaned up after. Fair pricing.",
+        "would_recommend": True,
+        "created_at": datetime.utcnow(),
+        "is_verified": i % 3 == 0,
+        "verification_status": "no_proof",
+        "helpful_count": i % 7,
+        "reported_count": 0,
+    }
+
+
+def bench(policy, writes, directory):
+    path = Path(directory) / f"{policy}.wal"
+    records = [review(i) for i in range(writes)]
+    wal = WriteAheadLog(path, fsync_policy=policy, group_commit_ms=10)
+    start = time.perf_counter()
+    for record in records:
+        wal.append("put", "reviews", record["id"], record)
+    elapsed = time.perf_counter() - start
+    wal.close()
+    assert len(read_wal(path)[0]) == writes
+    return elapsed / writes * 1e6, path.stat().st_size / writes
+
+
+if __name__ == "__main__":
+    print(f"📝 WAL append cost (review-sized records)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for policy, writes in (("never", WRITES), ("batch", WRITES), ("always", ALWAYS_WRITES)):
+            per_write_us, bytes_per_write = bench(policy, writes, tmp)
+            budget = per_write_us / 1000 * 100  # % of a 1 ms budget at 1k writes/sec
+            print(f"   {policy:<7} {per_write_us:8.1f} µs/write  {bytes_per_write:6.0f} B/write  "
+                  f"{budget:5.1f}% of the budget at 1k writes/sec")
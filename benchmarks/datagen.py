@@ -0,0 +1,320 @@
+"""
+Synthetic Data Generator for PeopleRate benchmarks
+Seeded, streaming generation of users, persons, reviews and review flags at any scale (1k - 10M),
+built from the scripts/generate_50_users.py vocabularies and the Bengaluru seed schema
+
+    python -m benchmarks.datagen --persons 1000000 --reviews 5000000 --out data/bench
+
+The same seed always produces the same records. Records are yielded one at a time, so writing
+10M persons to JSONL needs no more memory than writing 1k; load_database() is for sizes that fit.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import bcrypt
+
+from scripts.generate_50_users import (
+    CITIES, COMPANIES, FIRST_NAMES, INDUSTRIES, JOB_TITLES, LAST_NAMES, SKILLS_BY_ROLE
+)
+from seed_snapshot import load_seed_snapshot
+
+# Fixed clock so timestamps are reproducible too
+EPOCH = datetime(2025, 1, 1)
+COLLECTIONS = ("users", "persons", "reviews", "flagged_reviews")
+PASSWORD = "password123"
+
+LOCAL_SHARE = 0.6  # fraction of persons shaped like the Bengaluru service listings
+FLAG_RATE = 0.02  # fraction of reviews with a flag
+PENDING_FLAG_RATE = 0.3
+FLAG_REASONS = ("spam", "harassment", "false_info", "inappropriate", "other")
+
+# Queries that match generated persons: local listings, professional profiles and names
+SEARCH_QUERIES = [
+    "plumber in HSR Layout",
+    "electrician whitefield",
+    "software engineer at Google in Seattle",
+    "carpenter koramangala",
+    "product manager who works at Microsoft",
+    "tiffin service jp nagar",
+    "data scientist skilled in Python",
+    "Priya Rao",
+]
+
+INDIAN_FIRST_NAMES = [
+    "Aditi", "Rahul", "Sahana", "Karthik", "Priya", "Vikram", "Lakshmi", "Arjun", "Divya", "Manjunath",
+    "Sneha", "Suresh", "Ananya", "Ravi", "Kavya", "Naveen", "Pooja", "Harish", "Meera", "Srinivas"
+]
+INDIAN_LAST_NAMES = [
+    "Rao", "Menon", "Iyer", "Reddy", "Gowda", "Sharma", "Nair", "Hegde", "Shetty", "Kumar",
+    "Pillai", "Bhat", "Naidu", "Patil", "Krishnan"
+]
+
+
+class Vocabulary:
+    """Value pools: professional profiles from generate_50_users, local listings from the seed snapshot"""
+
+    def __init__(self, seed_path: Optional[Path] = None):
+        snapshot = (load_seed_snapshot(seed_path) if seed_path else load_seed_snapshot()) or {}
+        self.vendors = [p for p in snapshot.get("persons", {}).values() if p.get("country") == "India"]
+        self.areas = sorted({vendor["area"] for vendor in self.vendors if vendor.get("area")})
+        reviews = list(snapshot.get("reviews", {}).values())
+        self.review_texts = [(review["title"], review["comment"]) for review in reviews] or [
+            ("Reliable and on time", "Did exactly what was promised and kept us updated throughout."),
+        ]
+        self.relationships = sorted({review.get("relationship", "customer") for review in reviews}) or ["customer"]
+        if not self.vendors:
+            print("⚠️ Seed snapshot not found - generating professional profiles only", file=sys.stderr)
+
+
+def _role_category(job_title: str) -> str:
+    """Same mapping generate_50_users.generate_person uses to pick skills"""
+    title = job_title.lower()
+    if any(word in title for word in ("engineer", "developer", "architect")):
+        return "engineer"
+    if "product" in title:
+        return "product"
+    if any(word in title for word in ("data", "scientist", "analyst")):
+        return "data"
+    if "design" in title:
+        return "design"
+    if any(word in title for word in ("marketing", "brand")):
+        return "marketing"
+    if "sales" in title:
+        return "sales"
+    return "business"
+
+
+def _when(rng: random.Random, max_days: int) -> datetime:
+    return EPOCH - timedelta(seconds=rng.randrange(max_days * 86400))
+
+
+def person_id(index: int) -> str:
+    return f"bench_person_{index}"
+
+
+def user_id(index: int) -> str:
+    return f"bench_user_{index}"
+
+
+def generate_user(rng: random.Random, index: int, password_hash: str) -> dict:
+    first, last = rng.choice(FIRST_NAMES + INDIAN_FIRST_NAMES), rng.choice(LAST_NAMES + INDIAN_LAST_NAMES)
+    return {
+        "id": user_id(index),
+        "email": f"{first.lower()}.{last.lower()}.{index}@example.com",
+        "full_name": f"{first} {last}",
+        "username": f"{first}_{last}_{index}",
+        "password": password_hash,
+        "is_active": True,
+        "created_at": _when(rng, 365),
+        "review_count": 0,
+        "reputation_score": rng.randint(50, 100),
+    }
+
+
+def generate_professional(rng: random.Random, index: int) -> dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    company, job_title, industry = rng.choice(COMPANIES), rng.choice(JOB_TITLES), rng.choice(INDUSTRIES)
+    city, state = rng.choice(CITIES)
+    skills = SKILLS_BY_ROLE[_role_category(job_title)]
+    experience_years = rng.randint(2, 20)
+    created_at = _when(rng, 730)
+    return {
+        "id": person_id(index),
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}.{index}@{company.lower().replace(' ', '')}.com",
+        "phone": f"+1-{rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "job_title": job_title,
+        "company": company,
+        "industry": industry,
+        "city": city,
+        "state": state,
+        "country": "USA",
+        "bio": f"{'Experienced' if experience_years > 7 else 'Skilled'} {job_title.lower()} at {company} "
+               f"with {experience_years} years in {industry.lower()}.",
+        "skills": rng.sample(skills, k=min(len(skills), rng.randint(4, 7))),
+        "experience_years": experience_years,
+        "linkedin_url": f"https://linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def generate_local(rng: random.Random, index: int, vocabulary: Vocabulary) -> dict:
+    template = rng.choice(vocabulary.vendors)
+    first, last = rng.choice(INDIAN_FIRST_NAMES), rng.choice(INDIAN_LAST_NAMES)
+    area = rng.choice(vocabulary.areas)
+    mobile = f"{rng.choice('6789')}{rng.randrange(10 ** 9):09d}"
+    created_at = _when(rng, 730)
+    return {
+        "id": person_id(index),
+        "name": f"{first} {last}",
+        "company": f"{area.split()[0]} {template['category']} Services",
+        "job_title": template["job_title"],
+        "category": template["category"],
+        "industry": template["industry"],
+        "city": "Bengaluru",
+        "state": "Karnataka",
+        "country": "India",
+        "area": area,
+        "phone": f"+91 {mobile[:5]} {mobile[5:]}",
+        "whatsapp_number": f"+91 {mobile}",
+        "google_maps_url": template.get("google_maps_url"),
+        "bio": template["bio"],
+        "skills": list(template.get("skills", ())),
+        "services_offered": list(template.get("services_offered", ())),
+        "languages": list(template.get("languages", ())),
+        "payment_modes": list(template.get("payment_modes", ())),
+        "established_year": rng.randint(1990, 2024),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def generate_records(
+    persons: int,
+    reviews: int,
+    users: Optional[int] = None,
+    seed: int = 42,
+    vocabulary: Optional[Vocabulary] = None,
+    password_hash: Optional[str] = None,
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Yield (collection, record) pairs: every user first, then each person followed by its reviews
+    and their flags. Review counts per person are long-tailed (a few popular listings, many with
+    none) and average reviews / persons; a person's rating fields match its reviews.
+    """
+    rng = random.Random(seed)
+    vocabulary = vocabulary or Vocabulary()
+    users = users if users is not None else max(100, persons // 10)
+    # One bcrypt hash shared by every user: hashing millions of passwords would take days
+    password_hash = password_hash or bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    usernames = []
+    for index in range(users):
+        user = generate_user(rng, index, password_hash)
+        usernames.append(user["username"])
+        yield "users", user
+
+    mean_reviews = reviews / persons if persons else 0
+    local_share = LOCAL_SHARE if vocabulary.vendors else 0.0
+    review_serial = flag_serial = 0
+    for index in range(persons):
+        if rng.random() < local_share:
+            person = generate_local(rng, index, vocabulary)
+        else:
+            person = generate_professional(rng, index)
+        count = min(users, round(rng.expovariate(1 / mean_reviews))) if mean_reviews else 0
+        person_reviews = []
+        for reviewer in rng.sample(range(users), count):
+            rating = rng.choices((1, 2, 3, 4, 5), weights=(4, 5, 12, 35, 44))[0]
+            title, comment = rng.choice(vocabulary.review_texts)
+            created_at = person["created_at"] + timedelta(seconds=rng.randrange(max(1, int((EPOCH - person["created_at"]).total_seconds()))))
+            person_reviews.append({
+                "id": f"bench_review_{review_serial}",
+                "person_id": person["id"],
+                "reviewer_id": user_id(reviewer),
+                "reviewer_username": usernames[reviewer],
+                "rating": rating,
+                "title": title,
+                "comment": comment,
+                "relationship": rng.choice(vocabulary.relationships),
+                "work_quality": max(1, min(5, rating + rng.randint(-1, 1))),
+                "communication": max(1, min(5, rating + rng.randint(-1, 1))),
+                "reliability": max(1, min(5, rating + rng.randint(-1, 1))),
+                "professionalism": max(1, min(5, rating + rng.randint(-1, 1))),
+                "would_recommend": rating >= 4,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "is_verified": rng.random() < 0.3,
+                "helpful_count": int(rng.expovariate(0.5)),
+                "reported_count": 0,
+            })
+            review_serial += 1
+
+        total_rating = sum(review["rating"] for review in person_reviews)
+        person.update({
+            "review_count": len(person_reviews),
+            "total_rating": total_rating,
+            "average_rating": round(total_rating / len(person_reviews), 1) if person_reviews else 0.0,
+        })
+        yield "persons", person
+
+        for review in person_reviews:
+            flags = []
+            if rng.random() < FLAG_RATE:
+                for _ in range(1 + int(rng.expovariate(1.0))):
+                    flagger = rng.randrange(users)
+                    flags.append({
+                        "id": f"bench_flag_{flag_serial}",
+                        "review_id": review["id"],
+                        "flagger_id": user_id(flagger),
+                        "flagger_username": usernames[flagger],
+                        "reason": rng.choice(FLAG_REASONS),
+                        "description": "",
+                        "created_at": review["created_at"] + timedelta(hours=rng.randint(1, 240)),
+                        "status": "pending" if rng.random() < PENDING_FLAG_RATE else rng.choice(("resolved", "dismissed")),
+                        "reviewed_by": None,
+                        "reviewed_at": None,
+                    })
+                    flag_serial += 1
+                review["reported_count"] = len(flags)
+            yield "reviews", review
+            for flag in flags:
+                yield "flagged_reviews", flag
+
+
+def load_database(database: Dict[str, dict], persons: int, reviews: int, **options) -> Dict[str, int]:
+    """Fill an in-memory DATABASE (main.DATABASE shape) and return the record counts"""
+    counts = dict.fromkeys(COLLECTIONS, 0)
+    user_reviews: Dict[str, int] = {}
+    for collection, record in generate_records(persons, reviews, **options):
+        database[collection][record["id"]] = record
+        counts[collection] += 1
+        if collection == "reviews":
+            user_reviews[record["reviewer_id"]] = user_reviews.get(record["reviewer_id"], 0) + 1
+    for reviewer_id, count in user_reviews.items():
+        database["users"][reviewer_id]["review_count"] = count
+    return counts
+
+
+def write_jsonl(directory: Path, persons: int, reviews: int, **options) -> Dict[str, int]:
+    """Stream the dataset to <directory>/<collection>.jsonl, one record per line"""
+    directory.mkdir(parents=True, exist_ok=True)
+    files = {name: open(directory / f"{name}.jsonl", "w", encoding="utf-8") for name in COLLECTIONS}
+    counts = dict.fromkeys(COLLECTIONS, 0)
+    try:
+        for collection, record in generate_records(persons, reviews, **options):
+            files[collection].write(json.dumps(record, default=datetime.isoformat, separators=(",", ":")))
+            files[collection].write("\n")
+            counts[collection] += 1
+    finally:
+        for handle in files.values():
+            handle.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic PeopleRate dataset as JSONL")
+    parser.add_argument("--persons", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=50_000, help="approximate total review count")
+    parser.add_argument("--users", type=int, default=None, help="default: persons / 10 (at least 100)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=Path("data") / "bench")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    counts = write_jsonl(args.out, args.persons, args.reviews, users=args.users, seed=args.seed)
+    elapsed = time.perf_counter() - started
+    summary = ", ".join(f"{count:,} {name}" for name, count in counts.items())
+    print(f"✅ Wrote {summary} to {args.out} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
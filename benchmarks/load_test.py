@@ -0,0 +1,241 @@
+"""
+Load Test Harness for PeopleRate
+Drives main.app with concurrent simulated users over a seeded synthetic dataset and reports
+throughput and latency percentiles per route. Runs offline: requests go through httpx's
+in-process ASGI transport, or through a uvicorn server started inside this process.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 50 --duration 30
+    python -m benchmarks.load_test --transport uvicorn --persons 50000 --reviews 250000
+    python -m benchmarks.load_test --mix search=60,person=30,review=5,login=5 --output load.json
+
+Default mix: 80% search, 10% person pages, 5% review creates, 5% logins. Rate limiting is
+switched off; the response cache follows RESPONSE_CACHE_ENABLED as in production.
+"""
+
+import os
+
+os.environ["SEED_MODE"] = "none"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["DB_SNAPSHOT_PATH"] = ""
+os.environ["SHARED_STATE_PATH"] = ""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+
+logging.disable(logging.INFO)
+
+import main  # noqa: E402
+from benchmarks.datagen import PASSWORD, SEARCH_QUERIES, generate_user, load_database  # noqa: E402
+
+DEFAULT_MIX = "search=80,person=10,review=5,login=5"
+ROUTES = {
+    "search": "GET /api/persons/search",
+    "person": "GET /api/persons/{person_id}",
+    "review": "POST /api/reviews",
+    "login": "POST /api/auth/login",
+}
+
+
+def parse_mix(text: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"unknown action '{name}' (choose from {', '.join(ROUTES)})")
+        mix.append((name, float(weight)))
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+class LoadTest:
+    """Simulated users sharing one client; latencies are recorded per action"""
+
+    def __init__(self, client: httpx.AsyncClient, mix: List[Tuple[str, float]], seed: int):
+        self.client = client
+        self.actions = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.seed = seed
+        self.person_ids = list(main.DATABASE["persons"])
+        self.logins = [user["email"] for user in main.DATABASE["users"].values()]
+        self.comments = [review["comment"] for _, review in zip(range(1000), main.DATABASE["reviews"].values())]
+        self.latencies: Dict[str, List[float]] = {name: [] for name in self.actions}
+        self.statuses: Dict[str, Dict[int, int]] = {name: {} for name in self.actions}
+        self.recording = False
+        self._writers: List[str] = []
+        self._next_review = 0
+        self._password_hash = next(iter(main.DATABASE["users"].values()))["password"]
+
+    def _writer_token(self, writer: int) -> str:
+        # Users with no reviews, so each (writer, person) pair is a fresh review that gets accepted
+        while len(self._writers) <= writer:
+            user = generate_user(random.Random(len(self._writers)), len(self._writers), self._password_hash)
+            user["id"] = user["username"] = f"load_writer_{len(self._writers)}"
+            main.DATABASE["users"][user["id"]] = user
+            self._writers.append(main.create_jwt_token({"sub": user["id"]}))
+        return self._writers[writer]
+
+    async def _request(self, action: str, rng: random.Random) -> int:
+        if action == "search":
+            response = await self.client.get("/api/persons/search", params={"q": rng.choice(SEARCH_QUERIES)})
+        elif action == "person":
+            # A few popular profiles get most of the page views
+            index = min(len(self.person_ids), int(rng.paretovariate(1.1))) - 1
+            response = await self.client.get(f"/api/persons/{self.person_ids[index]}")
+        elif action == "review":
+            writer, position = divmod(self._next_review, len(self.person_ids))
+            self._next_review += 1
+            response = await self.client.post("/api/reviews", json={
+                "person_id": self.person_ids[position],
+                "rating": rng.randint(1, 5),
+                "comment": rng.choice(self.comments) if self.comments else "Prompt and professional",
+                "relationship": "customer",
+            }, headers={"Authorization": f"Bearer {self._writer_token(writer)}"})
+        else:
+            response = await self.client.post(
+                "/api/auth/login", data={"email": rng.choice(self.logins), "password": PASSWORD}
+            )
+        return response.status_code
+
+    async def user(self, number: int, deadline: float) -> None:
+        rng = random.Random(self.seed * 100_003 + number)
+        while time.perf_counter() < deadline:
+            action = rng.choices(self.actions, self.weights)[0]
+            started = time.perf_counter()
+            try:
+                status = await self._request(action, rng)
+            except httpx.HTTPError:
+                status = 0  # connection-level failure
+            elapsed = time.perf_counter() - started
+            if self.recording:
+                self.latencies[action].append(elapsed)
+                self.statuses[action][status] = self.statuses[action].get(status, 0) + 1
+
+    async def run(self, concurrency: int, duration: float, warmup: float) -> float:
+        """Warm up, then measure for `duration` seconds; returns the measured wall time"""
+        if warmup > 0:
+            await asyncio.gather(*(self.user(n, time.perf_counter() + warmup) for n in range(concurrency)))
+        self.recording = True
+        started = time.perf_counter()
+        await asyncio.gather(*(self.user(n, started + duration) for n in range(concurrency)))
+        return time.perf_counter() - started
+
+    def report(self, wall_time: float) -> dict:
+        routes = {}
+        for action in self.actions:
+            ordered = sorted(self.latencies[action])
+            errors = sum(count for status, count in self.statuses[action].items() if not 200 <= status < 300)
+            routes[ROUTES[action]] = {
+                "requests": len(ordered),
+                "errors": errors,
+                "statuses": {str(status): count for status, count in sorted(self.statuses[action].items())},
+                "throughput_rps": len(ordered) / wall_time,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {"wall_time_s": wall_time, "requests": total, "throughput_rps": total / wall_time, "routes": routes}
+
+
+def print_report(report: dict) -> None:
+    print(f"📊 {report['requests']:,} requests in {report['wall_time_s']:.1f}s - {report['throughput_rps']:.1f} req/s")
+    print(f"   {'route':<30} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for route, stats in report["routes"].items():
+        print(
+            f"   {route:<30} {stats['requests']:>7,} {stats['errors']:>5,} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+        )
+    failed = {route: stats["statuses"] for route, stats in report["routes"].items() if stats["errors"]}
+    for route, statuses in failed.items():
+        print(f"⚠️ {route} responses by status: {statuses}")
+
+
+async def run_load_test(args) -> dict:
+    mix = parse_mix(args.mix)
+    server = None
+    if args.transport == "uvicorn":
+        # Same process and event loop as the simulated users, but a real socket and HTTP parser
+        config = uvicorn.Config(main.app, host="127.0.0.1", port=args.port, lifespan="off", log_level="warning")
+        server = uvicorn.Server(config)
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            if serve_task.done():
+                serve_task.result()  # surfaces bind errors
+            await asyncio.sleep(0.01)
+        transport = httpx.AsyncHTTPTransport()
+        base_url = f"http://127.0.0.1:{args.port}"
+    else:
+        transport = httpx.ASGITransport(app=main.app)
+        base_url = "http://testserver"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60, limits=limits) as client:
+            load_test = LoadTest(client, mix, args.seed)
+            wall_time = await load_test.run(args.concurrency, args.duration, args.warmup)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await serve_task
+    return load_test.report(wall_time)
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a mixed-traffic load test against main.app")
+    parser.add_argument("--concurrency", type=int, default=20, help="simulated users")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before the run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"action weights (default {DEFAULT_MIX})")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--port", type=int, default=8765, help="uvicorn transport only")
+    parser.add_argument("--persons", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="write the report as JSON")
+    args = parser.parse_args(argv)
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    started = time.perf_counter()
+    counts = load_database(main.DATABASE, args.persons, args.reviews, users=args.users, seed=args.seed)
+    main.rebuild_indexes()
+    summary = ", ".join(f"{count:,} {name}" for name, count in counts.items())
+    print(f"🌱 Generated {summary} (seed {args.seed}) in {time.perf_counter() - started:.1f}s")
+    print(f"🚀 {args.concurrency} users for {args.duration:.0f}s over {args.transport} ({args.mix})")
+
+    report = asyncio.run(run_load_test(args))
+    report.update({
+        "transport": args.transport, "concurrency": args.concurrency, "mix": args.mix,
+        "dataset": {"seed": args.seed, **counts},
+    })
+    print_report(report)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"💾 Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
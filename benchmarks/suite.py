@@ -0,0 +1,345 @@
+"""
+Benchmark Suite for PeopleRate
+Times the hot paths of main.py against a seeded synthetic dataset (benchmarks.datagen) and writes
+the results to JSON, so two commits can be compared on the same machine
+
+Usage:
+    python -m benchmarks.suite --persons 10000 --reviews 50000
+    python -m benchmarks.suite --persons 100000 --reviews 500000 --only search_persons,get_person
+    python -m benchmarks.suite --compare benchmarks/results/<baseline>.json --threshold 0.2
+
+Each benchmark is run in rounds of N calls (N calibrated so a round takes --min-time seconds);
+the per-call time of every round is recorded and medians are compared. --compare exits with
+status 1 when any benchmark's median got slower by more than --threshold.
+"""
+
+import os
+
+# Benchmarks run against the generated dataset only, with nothing in front of the handlers
+# that would turn repeated calls into cache hits or 429s
+os.environ["SEED_MODE"] = "none"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+os.environ["DB_SNAPSHOT_PATH"] = ""
+os.environ["SHARED_STATE_PATH"] = ""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+logging.disable(logging.INFO)
+
+import main  # noqa: E402
+from benchmarks.datagen import SEARCH_QUERIES, generate_user, load_database  # noqa: E402
+from moderation import analyze_content, should_auto_flag  # noqa: E402
+from moderation_queue import moderation_queue  # noqa: E402
+from nlp_processor import nlp_processor  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_VERSION = 1
+
+# name -> setup(context) returning the callable to time; async callables are awaited
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Context:
+    """Shared state for benchmark setups: the loaded dataset and an in-process ASGI client"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, counts: Dict[str, int], seed: int):
+        self.loop = loop
+        self.counts = counts
+        self.seed = seed
+        self.person_ids = list(main.DATABASE["persons"])
+        self.reviews = list(main.DATABASE["reviews"].values())
+
+    async def request(self, method: str, path: str, query: Optional[dict] = None,
+                      body: Optional[bytes] = None, token: Optional[str] = None) -> int:
+        """Send one request straight into main.app and return the status code"""
+        headers = [(b"host", b"testserver")]
+        if body is not None:
+            headers.append((b"content-type", b"application/json"))
+            headers.append((b"content-length", str(len(body)).encode()))
+        if token is not None:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": urlencode(query or {}).encode(), "headers": headers,
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+        status = 500
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body or b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await main.app(scope, receive, send)
+        return status
+
+    def expect_ok(self, call) -> None:
+        """Run one call up front so a benchmark never times an error response"""
+        status = self.loop.run_until_complete(call(0))
+        if status != 200:
+            raise RuntimeError(f"warm-up request returned HTTP {status}")
+
+
+@benchmark("parse_search_query")
+def bench_parse_search_query(ctx: Context):
+    return lambda i: nlp_processor.parse_search_query(SEARCH_QUERIES[i % len(SEARCH_QUERIES)])
+
+
+@benchmark("generate_search_score")
+def bench_generate_search_score(ctx: Context):
+    parsed = nlp_processor.parse_search_query(SEARCH_QUERIES[0])
+    persons = [main.DATABASE["persons"][person_id] for person_id in ctx.person_ids[:10_000]]
+    return lambda i: nlp_processor.generate_search_score(persons[i % len(persons)], parsed)
+
+
+@benchmark("search_persons")
+def bench_search_persons(ctx: Context):
+    async def call(i):
+        return await ctx.request("GET", "/api/persons/search", {"q": SEARCH_QUERIES[i % len(SEARCH_QUERIES)]})
+    ctx.expect_ok(call)
+    return call
+
+
+@benchmark("get_person")
+def bench_get_person(ctx: Context):
+    async def call(i):
+        return await ctx.request("GET", f"/api/persons/{ctx.person_ids[i * 7919 % len(ctx.person_ids)]}")
+    ctx.expect_ok(call)
+    return call
+
+
+@benchmark("api_stats")
+def bench_api_stats(ctx: Context):
+    async def call(i):
+        return await ctx.request("GET", "/api/stats")
+    ctx.expect_ok(call)
+    return call
+
+
+@benchmark("moderation_analyze")
+def bench_moderation_analyze(ctx: Context):
+    comments = [review["comment"] for review in ctx.reviews[:1000]] or ["Great work, would hire again"]
+
+    def call(i):
+        comment = comments[i % len(comments)]
+        return analyze_content(comment), should_auto_flag(comment)
+    return call
+
+
+@benchmark("moderation_queue_top")
+def bench_moderation_queue_top(ctx: Context):
+    return lambda i: moderation_queue.top(main.ADMIN_QUEUE_SIZE)
+
+
+@benchmark("create_review")
+def bench_create_review(ctx: Context):
+    # Writers with no reviews yet, so every (writer, person) pair is a fresh, accepted review
+    rng = random.Random(ctx.seed)
+    password_hash = next(iter(main.DATABASE["users"].values()))["password"]
+    tokens: List[str] = []
+
+    def token_for(writer: int) -> str:
+        while len(tokens) <= writer:
+            user = generate_user(rng, len(tokens), password_hash)
+            user["id"] = f"suite_writer_{len(tokens)}"
+            user["username"] = f"suite_writer_{len(tokens)}"
+            main.DATABASE["users"][user["id"]] = user
+            tokens.append(main.create_jwt_token({"sub": user["id"]}))
+        return tokens[writer]
+
+    async def call(i):
+        writer, position = divmod(i, len(ctx.person_ids))
+        body = json.dumps({
+            "person_id": ctx.person_ids[position],
+            "rating": 1 + i % 5,
+            "comment": ctx.reviews[i % len(ctx.reviews)]["comment"] if ctx.reviews else "Prompt and professional",
+            "relationship": "customer",
+        }).encode()
+        return await ctx.request("POST", "/api/reviews", body=body, token=token_for(writer))
+
+    counter = iter(range(10 ** 12))
+    ctx.expect_ok(lambda _: call(next(counter)))
+    return lambda _: call(next(counter))
+
+
+# Read-only benchmarks first; create_review grows the dataset
+ORDER = [
+    "parse_search_query", "generate_search_score", "search_persons", "get_person", "api_stats",
+    "moderation_analyze", "moderation_queue_top", "create_review",
+]
+
+
+def run_benchmark(func, loop, rounds: int, min_time: float, max_calls: int) -> dict:
+    probe = func(0)
+    is_async = asyncio.iscoroutine(probe)
+    if is_async:
+        loop.run_until_complete(probe)
+
+    def run(calls: int) -> float:
+        started = time.perf_counter()
+        if is_async:
+            async def batch():
+                for i in range(calls):
+                    await func(i)
+            loop.run_until_complete(batch())
+        else:
+            for i in range(calls):
+                func(i)
+        return time.perf_counter() - started
+
+    # Calibrate: double the batch until one round takes min_time
+    calls = 1
+    while calls < max_calls:
+        elapsed = run(calls)
+        if elapsed >= min_time:
+            break
+        calls = min(max_calls, calls * 2 if elapsed <= 0 else max(calls * 2, int(calls * min_time / elapsed)))
+
+    per_call = [run(calls) / calls for _ in range(rounds)]
+    return {
+        "unit": "seconds",
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "stdev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "rounds": rounds,
+        "calls_per_round": calls,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print median changes against a baseline results file; returns the regressed benchmark names"""
+    if current["dataset"] != baseline.get("dataset"):
+        print(f"⚠️ Baseline dataset differs: {baseline.get('dataset')} - ratios are not comparable")
+    print(f"\n🔍 Against {baseline.get('commit') or 'baseline'} (threshold +{threshold:.0%})")
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"   {name:<24} new")
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > 1 + threshold:
+            marker = "❌ slower"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            marker = "✅ faster"
+        else:
+            marker = "  ~"
+        print(f"   {name:<24} {format_time(before['median']):>10} -> {format_time(result['median']):>10}  {ratio:5.2f}x {marker}")
+    return regressions
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the PeopleRate benchmark suite")
+    parser.add_argument("--persons", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default="", help="comma-separated benchmark names")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--max-calls", type=int, default=100_000, help="cap on calls per round")
+    parser.add_argument("--output", type=Path, default=None, help="default: benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()] or ORDER
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)} (available: {', '.join(ORDER)})")
+
+    started = time.perf_counter()
+    counts = load_database(main.DATABASE, args.persons, args.reviews, users=args.users, seed=args.seed)
+    main.rebuild_indexes()
+    summary = ", ".join(f"{count:,} {name}" for name, count in counts.items())
+    print(f"🌱 Generated {summary} (seed {args.seed}) in {time.perf_counter() - started:.1f}s")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    ctx = Context(loop, counts, args.seed)
+    results = {}
+    print(f"⏱️  {'benchmark':<24} {'median':>10} {'min':>10} {'calls/round':>12}")
+    for name in [name for name in ORDER if name in selected]:
+        func = BENCHMARKS[name](ctx)
+        result = run_benchmark(func, loop, args.rounds, args.min_time, args.max_calls)
+        results[name] = result
+        print(f"   {name:<24} {format_time(result['median']):>10} {format_time(result['min']):>10} {result['calls_per_round']:>12,}")
+    loop.close()
+
+    commit = git_commit()
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "dataset": {"seed": args.seed, **counts},
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{commit or datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"💾 Results written to {output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
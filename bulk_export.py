@@ -0,0 +1,145 @@
+"""
+Bulk Export for PeopleRate
+Streams DATABASE collections as NDJSON or CSV, optionally gzipped, with an updated-since filter
+"""
+
+import csv
+import io
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from json_response import dumps
+
+# Export name -> DATABASE collection
+EXPORT_COLLECTIONS = {
+    "persons": "persons",
+    "reviews": "reviews",
+    "claims": "profile_claims",
+    "scams": "scams",
+}
+
+# CSV columns; NDJSON carries every field of the record
+CSV_COLUMNS: Dict[str, List[str]] = {
+    "persons": [
+        "id", "name", "company", "job_title", "category", "industry", "area", "city", "state", "country",
+        "phone", "whatsapp_number", "email", "google_maps_url", "website_url", "services_offered", "languages",
+        "payment_modes", "skills", "established_year", "experience_years", "review_count", "average_rating",
+        "created_at", "updated_at",
+    ],
+    "reviews": [
+        "id", "person_id", "reviewer_id", "reviewer_username", "rating", "title", "comment", "relationship",
+        "work_quality", "communication", "reliability", "professionalism", "would_recommend", "is_verified",
+        "verification_status", "helpful_count", "reported_count", "created_at", "updated_at",
+    ],
+    "claims": [
+        "id", "person_id", "user_id", "username", "verification_method", "message", "status",
+        "created_at", "reviewed_at", "reviewed_by", "admin_notes",
+    ],
+    "scams": [
+        "id", "title", "description", "how_it_works", "prevention_tips", "severity", "location",
+        "reported_cases", "upvotes", "downvotes", "reported_date", "last_updated",
+    ],
+}
+
+# The latest of these is when a record last changed (scams use last_updated, claims reviewed_at)
+CHANGED_AT_FIELDS = ("updated_at", "last_updated", "reviewed_at", "created_at", "reported_date")
+
+# Records per yielded chunk: big enough that per-chunk overhead disappears, small enough to stream
+CHUNK_RECORDS = 500
+
+
+def _as_naive_utc(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def changed_at(record: dict) -> Optional[datetime]:
+    """When the record last changed, or None if it carries no timestamp (e.g. seeded vendors)"""
+    stamps = [stamp for stamp in (_as_naive_utc(record.get(field)) for field in CHANGED_AT_FIELDS) if stamp]
+    return max(stamps) if stamps else None
+
+
+def iter_records(collection: Dict[str, dict], updated_since: Optional[datetime] = None) -> Iterator[dict]:
+    """
+    Records of a DATABASE collection, read one at a time. Only the keys are copied up front (so
+    writes during the export can't break the iteration); a record deleted meanwhile is skipped,
+    one updated meanwhile is exported as it is when reached.
+    """
+    since = _as_naive_utc(updated_since)
+    for key in list(collection):
+        record = collection.get(key)
+        if record is None:
+            continue
+        if since is not None:
+            stamp = changed_at(record)
+            if stamp is None or stamp < since:
+                continue
+        yield record
+
+
+# csv.writer formats these itself (None as an empty field)
+_CSV_NATIVE = (str, int, float, bool, type(None))
+
+
+def _csv_value(value) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        return "; ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return dumps(value).decode("utf-8")
+    return str(value)
+
+
+def ndjson_chunks(records: Iterable[dict]) -> Iterator[bytes]:
+    lines = []
+    for record in records:
+        lines.append(dumps(record))
+        if len(lines) >= CHUNK_RECORDS:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def csv_chunks(records: Iterable[dict], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for record in records:
+        row = [record.get(column) for column in columns]
+        writer.writerow([value if type(value) in _CSV_NATIVE else _csv_value(value) for value in row])
+        count += 1
+        if count % CHUNK_RECORDS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip header and trailer
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(name: str, collection: Dict[str, dict], fmt: str, gzip: bool = False,
+                  updated_since: Optional[datetime] = None) -> Iterator[bytes]:
+    records = iter_records(collection, updated_since)
+    chunks = ndjson_chunks(records) if fmt == "ndjson" else csv_chunks(records, CSV_COLUMNS[name])
+    return gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,81 @@
+"""
+Profile Claim Index for PeopleRate
+Lookups over DATABASE["profile_claims"] by (user, person, status), status and user
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sorted_keys import discard, insert, timestamp
+
+
+class ClaimIndex:
+    """(user_id, person_id, status) -> claim ids, status -> ids by age, user_id -> ids by age"""
+
+    def __init__(self):
+        self._by_key: Dict[Tuple[str, str, str], Dict[str, None]] = {}
+        self._by_status: Dict[str, List[Tuple[float, str]]] = {}
+        self._by_user: Dict[str, List[Tuple[float, str]]] = {}
+        self._entries: Dict[str, Tuple[str, str, str, float]] = {}  # claim_id -> (user, person, status, created)
+        self._lock = threading.Lock()
+
+    def add(self, claim: dict) -> None:
+        with self._lock:
+            self._remove(claim["id"])
+            self._add(claim)
+
+    def update(self, claim: dict) -> None:
+        """Re-index a claim after its status changed"""
+        self.add(claim)
+
+    def remove(self, claim_id: str) -> None:
+        with self._lock:
+            self._remove(claim_id)
+
+    def rebuild(self, claims: Iterable[dict]) -> None:
+        with self._lock:
+            self._by_key.clear()
+            self._by_status.clear()
+            self._by_user.clear()
+            self._entries.clear()
+            for claim in claims:
+                self._add(claim)
+
+    def find(self, user_id: str, person_id: str, status: str = "pending") -> Optional[str]:
+        """Any claim id the user has on the person with that status"""
+        with self._lock:
+            ids = self._by_key.get((user_id, person_id, status))
+            return next(iter(ids)) if ids else None
+
+    def with_status(self, status: str) -> List[str]:
+        """Claim ids with the status, oldest first"""
+        with self._lock:
+            return [claim_id for _, claim_id in self._by_status.get(status, ())]
+
+    def for_user(self, user_id: str) -> List[str]:
+        """The user's claim ids, newest first"""
+        with self._lock:
+            return [claim_id for _, claim_id in reversed(self._by_user.get(user_id, ()))]
+
+    def _add(self, claim: dict) -> None:
+        claim_id, user_id, person_id, status = claim["id"], claim["user_id"], claim["person_id"], claim["status"]
+        created_at = timestamp(claim.get("created_at"))
+        self._by_key.setdefault((user_id, person_id, status), {})[claim_id] = None
+        insert(self._by_status.setdefault(status, []), (created_at, claim_id))
+        insert(self._by_user.setdefault(user_id, []), (created_at, claim_id))
+        self._entries[claim_id] = (user_id, person_id, status, created_at)
+
+    def _remove(self, claim_id: str) -> None:
+        entry = self._entries.pop(claim_id, None)
+        if entry is None:
+            return
+        user_id, person_id, status, created_at = entry
+        key = (user_id, person_id, status)
+        self._by_key[key].pop(claim_id, None)
+        if not self._by_key[key]:
+            del self._by_key[key]
+        for ordered in (self._by_status[status], self._by_user[user_id]):
+            discard(ordered, (created_at, claim_id))
+
+
+claim_index = ClaimIndex()
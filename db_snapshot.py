@@ -0,0 +1,122 @@
+"""
+Database Snapshots for PeopleRate
+Compact, versioned binary dumps of the in-memory DATABASE with atomic writes
+
+File layout:
+    b"PRDB" | format version (u16) | flags (u16) | meta length (u32) | meta JSON | payload
+
+The payload is a pickle (protocol 5) of {collection: {id: record}}, optionally
+zlib-compressed. Restores read the payload through mmap so large snapshots are
+not copied into a separate bytes buffer before unpickling.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+MAGIC = b"PRDB"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x1
+_HEADER = struct.Struct("<4sHHI")
+
+
+class SnapshotError(Exception):
+    """Snapshot file is missing, truncated, corrupt or from an unknown format version"""
+
+
+def save_snapshot(
+    collections: Dict[str, dict],
+    path: Path,
+    meta: Optional[dict] = None,
+    compress: bool = False
+) -> int:
+    """Atomically write collections to path; returns the file size in bytes"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    payload = pickle.dumps(collections, protocol=5)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_ZLIB
+
+    meta = dict(meta or {})
+    meta.setdefault("created_at", datetime.utcnow().isoformat())
+    meta["counts"] = {name: len(records) for name, records in collections.items()}
+    meta["payload_crc32"] = zlib.crc32(payload)
+    meta_bytes = json.dumps(meta).encode("utf-8")
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(meta_bytes)))
+            f.write(meta_bytes)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Make the rename itself durable
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    return _HEADER.size + len(meta_bytes) + len(payload)
+
+
+def load_snapshot(path: Path, use_mmap: bool = True) -> Tuple[dict, Dict[str, dict]]:
+    """Return (meta, collections) from a snapshot file"""
+    path = Path(path)
+    if not path.exists():
+        raise SnapshotError(f"Snapshot not found: {path}")
+
+    with open(path, "rb") as f:
+        meta, flags, offset = _read_header(f.read(_HEADER.size), f)
+
+        if use_mmap and os.path.getsize(path) > offset:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view, view[offset:] as payload:
+                    collections = _decode_payload(payload, flags, meta)
+        else:
+            f.seek(offset)
+            collections = _decode_payload(f.read(), flags, meta)
+
+    return meta, collections
+
+
+def _read_header(raw: bytes, f) -> Tuple[dict, int, int]:
+    if len(raw) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version, flags, meta_length = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise SnapshotError("Not a PeopleRate snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version {version}")
+
+    meta_bytes = f.read(meta_length)
+    if len(meta_bytes) != meta_length:
+        raise SnapshotError("Snapshot is truncated")
+    return json.loads(meta_bytes), flags, _HEADER.size + meta_length
+
+
+def _decode_payload(payload, flags: int, meta: dict) -> Dict[str, dict]:
+    if zlib.crc32(payload) != meta.get("payload_crc32"):
+        raise SnapshotError("Snapshot payload checksum mismatch")
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return pickle.loads(payload)
@@ -0,0 +1,248 @@
+"""
+Facet Index for PeopleRate
+Per-value bitmaps over category, area, languages, payment modes and services for filtered
+search and facet counts
+"""
+
+import heapq
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from geo_index import find_area
+
+FACETS = ("category", "area", "languages", "payment_modes", "services_offered")
+
+
+@lru_cache(maxsize=65536)
+def _label(facet: str, value: str) -> str:
+    """Display form of a value; areas are folded onto their canonical name ("HSR Layout Sector 2" -> "HSR Layout")"""
+    if facet == "area":
+        found = find_area(value)
+        if found:
+            return found[0]
+    return " ".join(value.split())
+
+
+def _key(facet: str, value: str) -> str:
+    return _label(facet, value).lower()
+
+
+def facet_values(person: dict) -> Dict[str, Dict[str, str]]:
+    """facet -> {normalized key: label} for a person"""
+    values = {}
+    for facet in FACETS:
+        raw = person.get(facet)
+        if not raw:
+            continue
+        labels = {}
+        for value in ([raw] if isinstance(raw, str) else raw):
+            if not isinstance(value, str) or not value.strip():
+                continue
+            label = _label(facet, value)
+            labels.setdefault(label.lower(), label)
+        if labels:
+            values[facet] = labels
+    return values
+
+
+def _iter_bits(bitmap: int) -> Iterator[int]:
+    bits = bin(bitmap)[:1:-1]  # bit 0 first
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class FacetIndex:
+    """
+    Every person gets a small integer position; each facet value is a bitmap (a Python int) of
+    the positions holding it, so filters are & (across facets) and | (within one) and counts
+    are int.bit_count(). A bitmap costs one bit per position whatever its population, so
+    values held by fewer than 1/64 of positions - most services and raw areas - keep a set of
+    positions instead and are turned into bitmaps only while a query uses them. Counting those
+    walks either all their positions or, when that is fewer steps, the result's own entries.
+    """
+
+    def __init__(self):
+        self._positions: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._all = 0
+        self._dense: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self._sparse: Dict[str, Dict[str, Set[int]]] = {facet: {} for facet in FACETS}
+        self._labels: Dict[str, Dict[str, str]] = {facet: {} for facet in FACETS}
+        self._entries: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._sparse_total = 0  # positions across all sparse values
+        self._value_total = 0  # values across all entries
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, person: dict) -> None:
+        with self._lock:
+            self._remove(person["id"])
+            self._add(person["id"], facet_values(person))
+
+    def update(self, person: dict) -> None:
+        """Re-index a person if any of its facet values changed"""
+        values = facet_values(person)
+        with self._lock:
+            if self._entries.get(person["id"]) == values:
+                return
+            self._remove(person["id"])
+            self._add(person["id"], values)
+
+    def remove(self, person_id: str) -> None:
+        with self._lock:
+            self._remove(person_id)
+
+    def rebuild(self, persons: Iterable[dict]) -> None:
+        with self._lock:
+            self._positions, self._ids, self._free, self._entries = {}, [], [], {}
+            self._value_total = 0
+            members: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+            self._labels = {facet: {} for facet in FACETS}
+            for person in persons:
+                values = facet_values(person)
+                position = self._positions[person["id"]] = len(self._ids)
+                self._ids.append(person["id"])
+                self._entries[person["id"]] = values
+                self._value_total += sum(len(labels) for labels in values.values())
+                for facet, labels in values.items():
+                    for key, label in labels.items():
+                        members[facet].setdefault(key, []).append(position)
+                        self._labels[facet].setdefault(key, label)
+            self._all = self._from_positions(range(len(self._ids)))
+            self._dense = {facet: {} for facet in FACETS}
+            self._sparse = {facet: {} for facet in FACETS}
+            self._sparse_total = 0
+            for facet, by_key in members.items():
+                for key, positions in by_key.items():
+                    if self._is_dense(len(positions)):
+                        self._dense[facet][key] = self._from_positions(positions)
+                    else:
+                        self._sparse[facet][key] = set(positions)
+                        self._sparse_total += len(positions)
+
+    def match(self, filters: Dict[str, List[str]]) -> int:
+        """Bitmap of persons matching every facet in filters, and any of the values given for each"""
+        with self._lock:
+            matched = self._all
+            for facet, values in filters.items():
+                either = 0
+                for value in values:
+                    either |= self._bitmap(facet, _key(facet, value))
+                matched &= either
+            return matched
+
+    def bitmap_of(self, person_ids: Iterable[str]) -> int:
+        with self._lock:
+            return self._from_positions(
+                self._positions[person_id] for person_id in person_ids if person_id in self._positions
+            )
+
+    def ids(self, bitmap: int) -> List[str]:
+        with self._lock:
+            return [self._ids[position] for position in _iter_bits(bitmap)]
+
+    def counts(self, within: Optional[int] = None, top: int = 20) -> Dict[str, List[dict]]:
+        """Per facet, the `top` values by number of persons in `within` (default: everyone)"""
+        with self._lock:
+            # Persons removed since the caller built `within` no longer have an entry
+            within = self._all if within is None else within & self._all
+            # Walking the result's entries costs about its share of all values
+            if within.bit_count() * self._value_total < self._sparse_total * max(len(self._positions), 1):
+                sparse_counts: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+                for position in _iter_bits(within):
+                    for facet, labels in self._entries[self._ids[position]].items():
+                        sparse, counted = self._sparse[facet], sparse_counts[facet]
+                        for key in labels:
+                            if key in sparse:
+                                counted[key] = counted.get(key, 0) + 1
+            else:
+                within_bytes = within.to_bytes((len(self._ids) + 7) // 8 or 1, "little")
+                sparse_counts = {
+                    facet: {
+                        key: sum(within_bytes[position >> 3] >> (position & 7) & 1 for position in positions)
+                        for key, positions in self._sparse[facet].items()
+                    }
+                    for facet in FACETS
+                }
+            result = {}
+            for facet in FACETS:
+                counted = [(key, (bitmap & within).bit_count()) for key, bitmap in self._dense[facet].items()]
+                counted += sparse_counts[facet].items()
+                best = heapq.nsmallest(top, ((-count, key) for key, count in counted if count))
+                result[facet] = [{"value": self._labels[facet][key], "count": -count} for count, key in best]
+            return result
+
+    def _is_dense(self, population: int) -> bool:
+        return population * 64 >= len(self._ids)
+
+    def _from_positions(self, positions: Iterable[int]) -> int:
+        bits = bytearray((len(self._ids) + 7) // 8)
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(bits, "little")
+
+    def _bitmap(self, facet: str, key: str) -> int:
+        bitmap = self._dense.get(facet, {}).get(key)
+        if bitmap is not None:
+            return bitmap
+        return self._from_positions(self._sparse.get(facet, {}).get(key, ()))
+
+    def _add(self, person_id: str, values: Dict[str, Dict[str, str]]) -> None:
+        if self._free:
+            position = self._free.pop()
+            self._ids[position] = person_id
+        else:
+            position = len(self._ids)
+            self._ids.append(person_id)
+        self._positions[person_id] = position
+        self._entries[person_id] = values
+        self._value_total += sum(len(labels) for labels in values.values())
+        bit = 1 << position
+        self._all |= bit
+        for facet, labels in values.items():
+            for key, label in labels.items():
+                self._labels[facet].setdefault(key, label)
+                if key in self._dense[facet]:
+                    self._dense[facet][key] |= bit
+                    continue
+                positions = self._sparse[facet].setdefault(key, set())
+                positions.add(position)
+                self._sparse_total += 1
+                if self._is_dense(len(positions)):
+                    self._dense[facet][key] = self._from_positions(positions)
+                    del self._sparse[facet][key]
+                    self._sparse_total -= len(positions)
+
+    def _remove(self, person_id: str) -> None:
+        position = self._positions.pop(person_id, None)
+        if position is None:
+            return
+        bit = 1 << position
+        self._all &= ~bit
+        values = self._entries.pop(person_id)
+        self._value_total -= sum(len(labels) for labels in values.values())
+        for facet, labels in values.items():
+            for key in labels:
+                if key in self._dense[facet]:
+                    self._dense[facet][key] &= ~bit
+                    if not self._dense[facet][key]:
+                        del self._dense[facet][key]
+                        del self._labels[facet][key]
+                else:
+                    positions = self._sparse[facet][key]
+                    positions.discard(position)
+                    self._sparse_total -= 1
+                    if not positions:
+                        del self._sparse[facet][key]
+                        del self._labels[facet][key]
+        self._ids[position] = None
+        self._free.append(position)
+
+
+facet_index = FacetIndex()
@@ -0,0 +1,234 @@
+"""
+Geo Index for PeopleRate
+Person coordinates from Google Maps links or Bengaluru area centroids, and a grid index for
+"near Indiranagar" lookups
+"""
+
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+# Approximate centre of each area, with the spellings people use for it
+AREA_CENTROIDS: Dict[str, Tuple[float, float, Tuple[str, ...]]] = {
+    "Indiranagar": (12.9719, 77.6412, ("indiranagar", "indira nagar", "hal 2nd stage")),
+    "Koramangala": (12.9352, 77.6245, ("koramangala", "koramangla")),
+    "HSR Layout": (12.9116, 77.6474, ("hsr layout", "hsr")),
+    "Whitefield": (12.9698, 77.7500, ("whitefield", "itpl")),
+    "Sarjapur Road": (12.9100, 77.6870, ("sarjapur road", "sarjapur", "kaikondrahalli")),
+    "JP Nagar": (12.9063, 77.5857, ("jp nagar", "j p nagar", "jayaprakash nagar")),
+    "Jayanagar": (12.9250, 77.5938, ("jayanagar", "jaya nagar")),
+    "Malleshwaram": (13.0035, 77.5710, ("malleshwaram", "malleswaram")),
+    "Hebbal": (13.0358, 77.5970, ("hebbal",)),
+    "RT Nagar": (13.0213, 77.5950, ("rt nagar", "r t nagar")),
+    "Ulsoor": (12.9817, 77.6286, ("ulsoor", "halasuru")),
+    "MG Road": (12.9756, 77.6066, ("mg road", "m g road", "brigade road")),
+    "BTM Layout": (12.9166, 77.6101, ("btm layout", "btm")),
+    "Electronic City": (12.8452, 77.6602, ("electronic city", "electronics city", "e city")),
+    "Marathahalli": (12.9569, 77.7011, ("marathahalli", "marathalli")),
+    "Bellandur": (12.9304, 77.6784, ("bellandur",)),
+    "Banashankari": (12.9255, 77.5468, ("banashankari",)),
+    "Basavanagudi": (12.9422, 77.5760, ("basavanagudi",)),
+    "Rajajinagar": (12.9915, 77.5554, ("rajajinagar", "rajaji nagar")),
+    "Vijayanagar": (12.9719, 77.5300, ("vijayanagar", "vijaya nagar")),
+    "Yelahanka": (13.1005, 77.5963, ("yelahanka",)),
+    "Yeshwanthpur": (13.0280, 77.5409, ("yeshwanthpur", "yeshwantpur", "yesvantpur")),
+    "Frazer Town": (12.9975, 77.6150, ("frazer town", "pulikeshi nagar")),
+    "Richmond Town": (12.9630, 77.6000, ("richmond town",)),
+    "Shivajinagar": (12.9857, 77.6057, ("shivajinagar", "shivaji nagar")),
+    "Sadashivanagar": (13.0068, 77.5813, ("sadashivanagar", "sadashiva nagar")),
+    "Domlur": (12.9610, 77.6387, ("domlur",)),
+    "Banaswadi": (13.0104, 77.6482, ("banaswadi",)),
+    "Kammanahalli": (13.0159, 77.6379, ("kammanahalli",)),
+    "CV Raman Nagar": (12.9855, 77.6633, ("cv raman nagar", "c v raman nagar")),
+    "KR Puram": (13.0074, 77.6950, ("kr puram", "k r puram", "krishnarajapuram")),
+    "Mahadevapura": (12.9915, 77.6926, ("mahadevapura",)),
+    "Brookefield": (12.9667, 77.7167, ("brookefield",)),
+    "Hennur": (13.0358, 77.6430, ("hennur",)),
+    "Sahakar Nagar": (13.0626, 77.5870, ("sahakar nagar", "sahakarnagar")),
+    "Bannerghatta Road": (12.8880, 77.5970, ("bannerghatta road", "bannerghatta")),
+    "Bommanahalli": (12.9081, 77.6238, ("bommanahalli",)),
+    "Kengeri": (12.9141, 77.4838, ("kengeri",)),
+    "Majestic": (12.9767, 77.5713, ("majestic", "gandhi nagar")),
+}
+
+# Longest spelling first, so "hsr layout" wins over "hsr"
+_AREA_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(
+        (re.escape(alias) for _, _, aliases in AREA_CENTROIDS.values() for alias in aliases),
+        key=len, reverse=True
+    )) + r")\b"
+)
+_AREA_BY_ALIAS = {alias: area for area, (_, _, aliases) in AREA_CENTROIDS.items() for alias in aliases}
+
+# "@12.97,77.64,17z", "?q=12.97,77.64", "&ll=12.97,77.64", "!3d12.97!4d77.64"
+_MAPS_COORDINATES = [
+    re.compile(r"@(-?\d{1,2}\.\d+),(-?\d{1,3}\.\d+)"),
+    re.compile(r"[?&](?:q|query|ll|destination|center)=(-?\d{1,2}\.\d+),\s*(-?\d{1,3}\.\d+)"),
+    re.compile(r"!3d(-?\d{1,2}\.\d+)!4d(-?\d{1,3}\.\d+)"),
+]
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+GRID_DEGREES = 0.01  # ~1.1 km cells
+
+
+def find_area(text: Optional[str]) -> Optional[Tuple[str, int, int]]:
+    """First Bengaluru area named in text: (area, start, end) of the match in text.lower()"""
+    if not text:
+        return None
+    match = _AREA_PATTERN.search(text.lower())
+    if match is None:
+        return None
+    return _AREA_BY_ALIAS[match.group(1)], match.start(), match.end()
+
+
+def area_centroid(area: str) -> Optional[Tuple[float, float]]:
+    entry = AREA_CENTROIDS.get(area)
+    return (entry[0], entry[1]) if entry else None
+
+
+def coordinates_from_maps_url(url: Optional[str]) -> Optional[Tuple[float, float]]:
+    """(lat, lng) written in a Google Maps link; short maps.app.goo.gl links carry none"""
+    if not url:
+        return None
+    url = unquote(url)
+    for pattern in _MAPS_COORDINATES:
+        match = pattern.search(url)
+        if match:
+            lat, lng = float(match.group(1)), float(match.group(2))
+            if -90 <= lat <= 90 and -180 <= lng <= 180:
+                return lat, lng
+    return None
+
+
+def locate(person: dict) -> Optional[dict]:
+    """Where a person is: the maps link if it has coordinates, else its area's centroid"""
+    coordinates = coordinates_from_maps_url(person.get("google_maps_url"))
+    if coordinates:
+        return {"lat": coordinates[0], "lng": coordinates[1], "source": "google_maps_url"}
+    found = find_area(person.get("area"))
+    if found:
+        lat, lng = area_centroid(found[0])
+        return {"lat": lat, "lng": lng, "source": "area", "area": found[0]}
+    return None
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Haversine distance"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / GRID_DEGREES), math.floor(lng / GRID_DEGREES)
+
+
+def _ring(row: int, col: int, ring: int) -> Iterable[Tuple[int, int]]:
+    """Cells exactly `ring` steps (Chebyshev distance) from (row, col)"""
+    if ring == 0:
+        yield row, col
+        return
+    for offset in range(-ring, ring + 1):
+        yield row - ring, col + offset
+        yield row + ring, col + offset
+    for offset in range(-ring + 1, ring):
+        yield row + offset, col - ring
+        yield row + offset, col + ring
+
+
+class GeoIndex:
+    """
+    Persons bucketed into a fixed lat/lng grid. A radius query reads only the cells overlapping
+    the radius's bounding box, then keeps points within the radius. Points are located on
+    add/update and live here, not on the person record.
+    """
+
+    def __init__(self):
+        self._cells: Dict[Tuple[int, int], Dict[str, None]] = {}
+        self._points: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def add(self, person: dict) -> None:
+        with self._lock:
+            self._remove(person["id"])
+            self._add(person)
+
+    def update(self, person: dict) -> None:
+        """Re-index a person if its maps link or area (and so its location) changed"""
+        location = locate(person)
+        point = (location["lat"], location["lng"]) if location else None
+        with self._lock:
+            if self._points.get(person["id"]) == point:
+                return
+            self._remove(person["id"])
+            self._add(person)
+
+    def remove(self, person_id: str) -> None:
+        with self._lock:
+            self._remove(person_id)
+
+    def rebuild(self, persons: Iterable[dict]) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._points.clear()
+            for person in persons:
+                self._add(person)
+
+    def nearby(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        (person id, distance in km) within radius_km of the point, nearest first. Cells are read
+        in rings outward from the point's cell; with a limit, the walk stops once `limit` persons
+        are closer than anything the unread rings could hold.
+        """
+        # Equirectangular distances: within a city the error against haversine is far below 1%
+        km_per_lng = KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01)
+        ring_km = GRID_DEGREES * min(KM_PER_DEGREE, km_per_lng)
+        max_rows = math.ceil(radius_km / (GRID_DEGREES * KM_PER_DEGREE))
+        max_cols = math.ceil(radius_km / (GRID_DEGREES * km_per_lng))
+        center_row, center_col = _cell(lat, lng)
+        found = []
+        with self._lock:
+            for ring in range(max(max_rows, max_cols) + 1):
+                for row, col in _ring(center_row, center_col, ring):
+                    if abs(row - center_row) > max_rows or abs(col - center_col) > max_cols:
+                        continue
+                    for person_id in self._cells.get((row, col), ()):
+                        point_lat, point_lng = self._points[person_id]
+                        distance = math.hypot((point_lat - lat) * KM_PER_DEGREE, (point_lng - lng) * km_per_lng)
+                        if distance <= radius_km:
+                            found.append((person_id, distance))
+                # Anything in ring + 1 or beyond is at least ring * ring_km away
+                if limit is not None and len(found) >= limit:
+                    settled = ring * ring_km
+                    if sum(1 for _, distance in found if distance <= settled) >= limit:
+                        break
+        found.sort(key=lambda item: item[1])
+        if limit is not None:
+            found = found[:limit]
+        return [(person_id, round(distance, 2)) for person_id, distance in found]
+
+    def _add(self, person: dict) -> None:
+        location = locate(person)
+        if not location:
+            return
+        point = self._points[person["id"]] = (location["lat"], location["lng"])
+        self._cells.setdefault(_cell(*point), {})[person["id"]] = None
+
+    def _remove(self, person_id: str) -> None:
+        point = self._points.pop(person_id, None)
+        if point is None:
+            return
+        cell = _cell(*point)
+        persons = self._cells[cell]
+        del persons[person_id]
+        if not persons:
+            del self._cells[cell]
+
+
+geo_index = GeoIndex()
@@ -0,0 +1,125 @@
+"""
+Contact Identifier Index for PeopleRate
+Canonical phone numbers (E.164) and emails, and an exact-match index from identifier to persons
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Country code assumed for numbers written without one ("98450 12345", "080-2345 6789")
+DEFAULT_PHONE_COUNTRY_CODE = os.getenv("DEFAULT_PHONE_COUNTRY_CODE", "91")
+
+PHONE_FIELDS = ("phone", "whatsapp_number")
+_NON_DIGIT = re.compile(r"\D+")
+_GMAIL_DOMAINS = ("gmail.com", "googlemail.com")
+
+
+def canonical_phone(raw: Optional[str]) -> Optional[str]:
+    """
+    E.164 form of a phone number, or None if it can't be one:
+    "+91 98450 12345", "098450-12345", "919845012345" and "9845012345" -> "+919845012345"
+    """
+    if not raw:
+        return None
+    raw = raw.strip()
+    digits = _NON_DIGIT.sub("", raw)
+    if raw.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith(DEFAULT_PHONE_COUNTRY_CODE) and len(digits) == len(DEFAULT_PHONE_COUNTRY_CODE) + 10:
+        pass
+    else:
+        national = digits.lstrip("0")
+        # A number without a country code is a full 10-digit national number, not "2020 - 2021"
+        if len(national) < 10:
+            return None
+        digits = DEFAULT_PHONE_COUNTRY_CODE + national
+    # E.164 allows at most 15 digits; anything under 10 is a fragment, not a number
+    if not 10 <= len(digits) <= 15:
+        return None
+    return "+" + digits
+
+
+def canonical_email(raw: Optional[str]) -> Optional[str]:
+    """Lower-cased email; Gmail addresses also lose dots and +tags in the local part"""
+    if not raw or "@" not in raw:
+        return None
+    local, _, domain = raw.strip().lower().rpartition("@")
+    if not local or not domain:
+        return None
+    if domain in _GMAIL_DOMAINS:
+        local = local.split("+", 1)[0].replace(".", "")
+        domain = "gmail.com"
+    return f"{local}@{domain}"
+
+
+def identifiers(person: dict) -> List[str]:
+    """Canonical phones (phone and WhatsApp) and email of a person"""
+    found = []
+    for value in [canonical_phone(person.get(field)) for field in PHONE_FIELDS] + [canonical_email(person.get("email"))]:
+        if value and value not in found:
+            found.append(value)
+    return found
+
+
+class IdentifierIndex:
+    """canonical phone / email -> person ids; each person's identifiers live here, not on the record"""
+
+    def __init__(self):
+        self._persons: Dict[str, Dict[str, None]] = {}
+        self._entries: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, person: dict) -> None:
+        with self._lock:
+            self._remove(person["id"])
+            self._add(person)
+
+    def update(self, person: dict) -> None:
+        """Re-index a person if its phone, WhatsApp number or email changed"""
+        with self._lock:
+            if self._entries.get(person["id"]) == identifiers(person):
+                return
+            self._remove(person["id"])
+            self._add(person)
+
+    def remove(self, person_id: str) -> None:
+        with self._lock:
+            self._remove(person_id)
+
+    def rebuild(self, persons: Iterable[dict]) -> None:
+        with self._lock:
+            self._persons.clear()
+            self._entries.clear()
+            for person in persons:
+                self._add(person)
+
+    def lookup(self, *canonical: Optional[str]) -> List[str]:
+        """Ids of persons with any of the given canonical identifiers (None entries are ignored)"""
+        found: Dict[str, None] = {}
+        with self._lock:
+            for identifier in canonical:
+                if identifier:
+                    found.update(self._persons.get(identifier, {}))
+        return list(found)
+
+    def _add(self, person: dict) -> None:
+        found = identifiers(person)
+        if not found:
+            return
+        self._entries[person["id"]] = found
+        for identifier in found:
+            self._persons.setdefault(identifier, {})[person["id"]] = None
+
+    def _remove(self, person_id: str) -> None:
+        for identifier in self._entries.pop(person_id, ()):
+            persons = self._persons[identifier]
+            del persons[person_id]
+            if not persons:
+                del self._persons[identifier]
+
+
+identifier_index = IdentifierIndex()
@@ -0,0 +1,247 @@
+"""
+Request Instrumentation for PeopleRate
+Per-route latency histograms, timing spans around hot spots, Prometheus text output,
+and optional profile capture for slow requests
+
+    METRICS_ENABLED=true            record histograms and serve /metrics
+    METRICS_SPAN_SAMPLE_RATE=0.1    fraction of requests whose spans are timed
+    PROFILE_SLOW_REQUEST_MS=500     profile sampled requests, keep profiles of slower ones
+    PROFILE_SAMPLE_RATE=0.05        fraction of requests run under the profiler
+    PROFILE_DIR=data/profiles       where .prof / .html captures are written
+    PROFILER=cprofile               cprofile or pyinstrument (if installed)
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # optional - cProfile is used instead
+    PyinstrumentProfiler = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds; roughly Prometheus' defaults with finer steps under 10 ms for the in-memory routes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# True while the current request's spans are being timed
+_sampled: contextvars.ContextVar[bool] = contextvars.ContextVar("metrics_sampled", default=False)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram for one label set"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class Metrics:
+    """Histograms keyed by label tuple, for request latency and for spans"""
+
+    def __init__(self, enabled: bool = False, span_sample_rate: float = 0.1):
+        self.enabled = enabled
+        self.span_sample_rate = span_sample_rate
+        self.requests: Dict[Tuple[str, str, str], Histogram] = {}  # (method, route, status class)
+        self.spans: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, f"{status // 100}xx")
+        with self._lock:
+            histogram = self.requests.get(key)
+            if histogram is None:
+                histogram = self.requests[key] = Histogram()
+            histogram.observe(seconds)
+
+    def observe_span(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.spans.get(name)
+            if histogram is None:
+                histogram = self.spans[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block when the current request was sampled; otherwise a near no-op"""
+        if not _sampled.get():
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_span(name, time.perf_counter() - started)
+
+    def timed(self, name: str):
+        """Decorator form of span() for sync and async functions"""
+        def decorate(func):
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            requests = [(key, list(h.counts), h.total, h.count) for key, h in self.requests.items()]
+            spans = [((name,), list(h.counts), h.total, h.count) for name, h in self.spans.items()]
+
+        lines: List[str] = []
+        _render_histogram(
+            lines, "peoplerate_request_duration_seconds", "HTTP request latency by route",
+            ("method", "route", "status"), requests
+        )
+        _render_histogram(
+            lines, "peoplerate_span_duration_seconds",
+            "Time spent in instrumented hot spots (sampled requests only)", ("span",), spans
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines: List[str], name: str, help_text: str, label_names, series) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, counts, total, count in sorted(series):
+        label_text = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(label_names, labels))
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{label_text}}} {total:.6f}")
+        lines.append(f"{name}_count{{{label_text}}} {count}")
+
+
+class SlowRequestProfiler:
+    """
+    Runs a sample of requests under a profiler and keeps the profile when the request was slow
+    Only one request is profiled at a time, since both profilers see the whole event loop.
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float, directory: str, kind: str = "cprofile"):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.directory = Path(directory)
+        self.kind = "pyinstrument" if kind == "pyinstrument" and PyinstrumentProfiler is not None else "cprofile"
+        if kind == "pyinstrument" and self.kind != "pyinstrument":
+            logger.warning("⚠️ pyinstrument is not installed - profiling slow requests with cProfile")
+        self._busy = threading.Lock()
+
+    def start(self):
+        """A started profiler, or None if this request is not sampled or another is being profiled"""
+        if random.random() >= self.sample_rate or not self._busy.acquire(blocking=False):
+            return None
+        profiler = PyinstrumentProfiler(async_mode="enabled") if self.kind == "pyinstrument" else cProfile.Profile()
+        try:
+            if self.kind == "pyinstrument":
+                profiler.start()
+            else:
+                profiler.enable()
+        except BaseException:
+            self._busy.release()
+            raise
+        return profiler
+
+    def stop(self, profiler, method: str, path: str, seconds: float) -> Optional[Path]:
+        """Stop profiling; writes the capture if the request took longer than the threshold"""
+        try:
+            if self.kind == "pyinstrument":
+                profiler.stop()
+            else:
+                profiler.disable()
+            if seconds < self.threshold:
+                return None
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+            stem = f"{datetime.utcnow():%Y%m%dT%H%M%S}_{int(seconds * 1000)}ms_{method}_{slug}"
+            if self.kind == "pyinstrument":
+                target = self.directory / f"{stem}.html"
+                target.write_text(profiler.output_html(), encoding="utf-8")
+            else:
+                target = self.directory / f"{stem}.prof"
+                profiler.dump_stats(str(target))
+            logger.warning(f"🐢 Slow request {method} {path} took {seconds * 1000:.0f} ms - profile saved to {target}")
+            return target
+        finally:
+            self._busy.release()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template and sampling spans"""
+
+    def __init__(self, app, metrics: Metrics, profiler: Optional[SlowRequestProfiler] = None):
+        self.app = app
+        self.metrics = metrics
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        token = _sampled.set(random.random() < self.metrics.span_sample_rate)
+        profiler = self.profiler.start() if self.profiler is not None else None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _sampled.reset(token)
+            # The router stores the matched route in the scope (the response cache does for its hits);
+            # anything else shares one label so paths with ids cannot blow up the series count
+            route_path = getattr(scope.get("route"), "path", None) or scope.get("cache_route")
+            if route_path is None:
+                route_path = "/static/{path}" if scope["path"].startswith("/static/") else "<unmatched>"
+            self.metrics.observe_request(scope["method"], route_path, status, elapsed)
+            if profiler is not None:
+                self.profiler.stop(profiler, scope["method"], scope["path"], elapsed)
+
+
+metrics = Metrics(
+    enabled=os.getenv("METRICS_ENABLED", "false").lower() == "true",
+    span_sample_rate=float(os.getenv("METRICS_SPAN_SAMPLE_RATE", "0.1"))
+)
@@ -0,0 +1,94 @@
+"""
+Fast JSON Serialization for PeopleRate
+Response class and encoder that skip FastAPI's jsonable_encoder walk
+
+Uses orjson when installed and falls back to the stdlib json module.
+datetime and ObjectId values are encoded natively in both modes.
+"""
+
+import functools
+import inspect
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from bson import ObjectId
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+def _default(obj: Any) -> Any:
+    """Encode the types jsonable_encoder would otherwise convert for us"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps() - return it from a route to bypass jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    APIRoute that wraps plain return values in FastJSONResponse
+    Set app.router.route_class = FastJSONRoute before declaring routes to enable it globally
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = response_model.value
+        if response_model is None:
+            endpoint = self._wrap(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _wrap(endpoint):
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapped(*args, **kwargs):
+            if is_coroutine:
+                result = await endpoint(*args, **kwargs)
+            else:
+                result = await run_in_threadpool(endpoint, *args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return FastJSONResponse(result)
+
+        return wrapped
@@ -4,14 +4,17 @@ Features comprehensive search, user management, anonymous reviews, and privacy-f
 Empowering authentic peer reviews while protecting user identity
 """
 
+import time
+MODULE_LOAD_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException, Depends, Query, Request, Form, UploadFile, File
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel, Field, EmailStr, field_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta
 import jwt
 import bcrypt
@@ -23,7 +26,6 @@ from nlp_processor import nlp_processor
 import os
 from dotenv import load_dotenv
 from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import aiofiles
 from pathlib import Path
@@ -31,6 +33,9 @@ from PIL import Image
 from authlib.integrations.starlette_client import OAuth
 import httpx
 import shutil
+import asyncio
+import json
+import pickle
 
 # Load environment variables
 load_dotenv()
@@ -41,12 +46,73 @@ from moderation import contains_profanity, filter_profanity, analyze_content, sh
 # Import email service
 from email_service import send_verification_email, verify_token, send_password_reset_email
 
+# Import JWT claims cache
+from token_cache import TokenCache
+
+# Import incrementally maintained platform statistics
+from stats_registry import platform_stats
+
+# Import HTTP response cache
+from response_cache import CachePolicy, ResponseCacheMiddleware, change_counters
+
+# Import fast JSON serialization (orjson with stdlib fallback)
+from json_response import FastJSONResponse, FastJSONRoute
+
+# Import per-person ordered review index and rating summaries
+from review_index import SORT_KEYS as REVIEW_SORTS, person_review_index
+from claim_index import claim_index
+from moderation_queue import moderation_queue
+from name_index import name_index
+from suggest_index import suggest_index
+from phonetic_index import phonetic_index
+from identifier_index import canonical_email, canonical_phone, identifier_index, identifiers
+from geo_index import area_centroid, find_area, geo_index
+from facet_index import FACETS, facet_index
+from scam_ranking import scam_ranking
+from scam_vote_index import scam_vote_index
+
+# Import prebuilt seed data loader
+from seed_snapshot import DEFAULT_SNAPSHOT_PATH, SEED_COLLECTIONS, load_seed_snapshot
+
+# Import binary DATABASE snapshots (persistence for in-memory mode)
+from db_snapshot import SnapshotError, load_snapshot, save_snapshot
+
+# Import write-ahead log (crash recovery between snapshots)
+from write_ahead_log import WriteAheadLog, apply_entries, read_wal
+
+# Import SQLite shared state (multi-worker mode)
+from shared_store import ChangeFeedMiddleware, SharedStore
+
+# Import rate-limit key function and storage backends (sliding-memory://, sqlite://)
+from rate_limiting import DefaultLimitMiddleware, client_ip
+
+# Import request instrumentation (latency histograms, hot-path spans, slow-request profiles)
+from instrumentation import MetricsMiddleware, SlowRequestProfiler, metrics
+
+# Import batch person import (JSONL/CSV streams, process-pool NLP extraction)
+from batch_import import NLP_BATCH_MAX_LINES, UploadStreamingResponse, batch_extractor, read_descriptions
+from bulk_export import EXPORT_COLLECTIONS, export_stream
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Counters live per process by default; with several workers or instances on one host use
+# RATE_LIMIT_STORAGE_URI=sqlite:///data/rate_limits.db so they share one limit
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "sliding-memory://")
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "100/minute")
+RATE_LIMIT_SEARCH = os.getenv("RATE_LIMIT_SEARCH", "20/minute")
+RATE_LIMIT_REGISTER = os.getenv("RATE_LIMIT_REGISTER", "5/hour")
+RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/minute")
+RATE_LIMIT_SUGGEST = os.getenv("RATE_LIMIT_SUGGEST", "120/minute")  # one call per keystroke
+limiter = Limiter(
+    key_func=client_ip,
+    enabled=RATE_LIMIT_ENABLED,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter"
+)
 
 # Try to import MongoDB models and utilities
 USE_MONGODB = False
@@ -69,6 +135,10 @@ app = FastAPI(
     version="2.2.0"
 )
 
+# Large list responses return FastJSONResponse directly; this switches every route over
+if os.getenv("FAST_JSON_ALL_ROUTES", "false").lower() == "true":
+    app.router.route_class = FastJSONRoute
+
 # OAuth Configuration
 oauth = OAuth()
 
@@ -136,13 +206,81 @@ async def internal_error_handler(request: Request, exc: Exception):
 @app.on_event("startup")
 async def startup_event():
     """Async startup handler"""
+    asyncio.create_task(stats_recount_loop())
+    restored = open_shared_state() if SHARED_STATE_PATH else await recover_database()
+    if DB_SNAPSHOT_PATH and DB_SNAPSHOT_SECONDS > 0:
+        app.state.snapshot_task = asyncio.create_task(database_snapshot_loop())
+    record_timing("until_ready", MODULE_LOAD_STARTED)
+    if SEED_MODE == "lazy" and not restored:
+        app.state.seed_task = asyncio.create_task(lazy_seed_database())
+    else:
+        log_startup_timings()
     logger.info("✅ Server startup complete - ready to handle requests")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Async shutdown handler"""
+    if DB_SNAPSHOT_PATH:
+        try:
+            await write_database_snapshot("shutdown")
+        except Exception as e:
+            logger.error(f"❌ Shutdown snapshot failed: {e}")
+    if write_ahead_log is not None:
+        write_ahead_log.close()
+    if shared_store is not None:
+        shared_store.close()
+    batch_extractor.close()
     logger.info("👋 Server shutting down")
 
+def person_page_versions(person_id: str) -> List[str]:
+    """Counters behind a person's page: the person, their reviews, and each reviewer (reviews embed reviewer badges)"""
+    return [f"persons:{person_id}", f"person_reviews:{person_id}"] + [
+        f"users:{reviewer_id}" for reviewer_id in person_review_index.reviewers(person_id)
+    ]
+
+# Response cache for public read-heavy endpoints (ETags follow change counters)
+# Order matters: "/api/persons/search", "/suggest" and "/nearby" must be matched before "/api/persons/{person_id}"
+RESPONSE_CACHE_POLICIES = [
+    CachePolicy("/api/stats", lambda params: ["users", "persons", "reviews"], ttl=30, stale_while_revalidate=60),
+    CachePolicy("/api/scams", lambda params: ["scams"], ttl=60, stale_while_revalidate=120),
+    # Users expect to see their own new profiles and reviews right away - no stale serving
+    CachePolicy("/api/persons/search", lambda params: ["persons", "reviews"], ttl=30, stale_while_revalidate=0),
+    # Suggestions only rank by review stats, so a few seconds of staleness is fine while typing
+    CachePolicy("/api/persons/suggest", lambda params: ["persons"], ttl=30, stale_while_revalidate=30),
+    CachePolicy("/api/persons/nearby", lambda params: ["persons", "reviews"], ttl=30, stale_while_revalidate=0),
+    CachePolicy(
+        "/api/persons/{person_id}",
+        lambda params: person_page_versions(params["person_id"]),
+        ttl=60,
+        stale_while_revalidate=0
+    ),
+    CachePolicy(
+        "/api/persons/{person_id}/summary",
+        lambda params: person_page_versions(params["person_id"]),
+        ttl=60,
+        stale_while_revalidate=0
+    ),
+    CachePolicy(
+        "/api/persons/{person_id}/reviews",
+        lambda params: person_page_versions(params["person_id"])[1:],
+        ttl=60,
+        stale_while_revalidate=0
+    ),
+]
+if os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true":
+    app.add_middleware(ResponseCacheMiddleware, policies=RESPONSE_CACHE_POLICIES)
+
+# RATE_LIMIT_DEFAULT for /api routes without their own limit, and each route's own @limiter.limit;
+# outside the response cache so cached responses still count against both
+app.add_middleware(DefaultLimitMiddleware, limiter=limiter, limit=RATE_LIMIT_DEFAULT)
+
+# Multi-worker mode (uvicorn --workers N): every worker opens the same SQLite file and
+# keeps DATABASE as a read cache, refreshed from the change feed before each request.
+# Added after the response cache so changes are applied before ETags are computed.
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "")
+if SHARED_STATE_PATH:
+    app.add_middleware(ChangeFeedMiddleware, sync=lambda: sync_shared_state())
+
 # CORS middleware - restrict in production
 allowed_origins = os.getenv("CORS_ORIGINS", "*").split(",") if os.getenv("ENVIRONMENT") == "production" else ["*"]
 app.add_middleware(
@@ -163,9 +301,22 @@ async def add_security_headers(request: Request, call_next):
     response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
     return response
 
+# Instrumentation - outermost, so its timings include every other middleware
+# METRICS_ENABLED serves /metrics; PROFILE_SLOW_REQUEST_MS > 0 profiles a sample of requests
+PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))
+slow_request_profiler = SlowRequestProfiler(
+    threshold_ms=PROFILE_SLOW_REQUEST_MS,
+    sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0.05")),
+    directory=os.getenv("PROFILE_DIR", "data/profiles"),
+    kind=os.getenv("PROFILER", "cprofile").lower()
+) if PROFILE_SLOW_REQUEST_MS > 0 else None
+if metrics.enabled or slow_request_profiler is not None:
+    app.add_middleware(MetricsMiddleware, metrics=metrics, profiler=slow_request_profiler)
+
 # Static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.TemplateResponse = metrics.timed("template_render")(templates.TemplateResponse)
 
 # File upload configuration
 UPLOAD_DIR = Path("uploads/review_proofs")
@@ -173,6 +324,7 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".pdf", ".doc", ".docx"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+@metrics.timed("save_proof_file")
 async def save_proof_file(file: UploadFile, review_id: str) -> str:
     """Save uploaded proof file and return file path"""
     if not file:
@@ -222,10 +374,14 @@ async def save_proof_file(file: UploadFile, review_id: str) -> str:
 
 # Security
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 JWT_SECRET = os.getenv("SECRET_KEY", "your-enhanced-secret-key-here")
 JWT_ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Verified JWT claims, reused until the token expires
+token_cache = TokenCache(max_size=int(os.getenv("TOKEN_CACHE_SIZE", "1024")))
+
 # In-memory database with enhanced sample data
 DATABASE = {
     "users": {},
@@ -233,10 +389,46 @@ DATABASE = {
     "reviews": {},
     "scams": {},
     "scam_votes": {},
-    "profile_claims": {},  # Profile claiming requests
-    "oauth_accounts": {}  # OAuth linked accounts
+    "profile_claims": {},  # Profile claims from /api/claims and /api/claim-profile
+    "oauth_accounts": {},  # OAuth linked accounts
+    "flagged_reviews": {}  # Review flags - the admin moderation queue indexes these
 }
 
+# Opened in startup_event when snapshots are enabled (see recover_database)
+write_ahead_log: Optional[WriteAheadLog] = None
+
+# Opened in startup_event when SHARED_STATE_PATH is set (see open_shared_state)
+shared_store: Optional[SharedStore] = None
+
+def mark_changed(collection: str, key: str, increments: Optional[Dict[str, int]] = None,
+                 resets: Iterable[str] = ()) -> None:
+    """
+    Record a write to DATABASE[collection][key]: cached responses revalidate and the WAL logs it
+    increments - how much this write changed counter fields (see shared_store.COUNTER_FIELDS), so
+    concurrent increments from other workers are added up rather than overwritten
+    resets - counter fields this write sets outright; the record's value replaces the stored one
+    """
+    change_counters.bump(collection, key)
+    if write_ahead_log is None and shared_store is None:
+        return
+    record = DATABASE.get(collection, {}).get(key)
+    if shared_store is not None:
+        if record is None:
+            shared_store.delete(collection, key)
+        else:
+            record.update(shared_store.put(collection, key, record, increments, resets))
+    if write_ahead_log is not None:
+        if record is None:
+            write_ahead_log.append("delete", collection, key)
+        else:
+            write_ahead_log.append("put", collection, key, record)
+
+def mark_review_changed(review: dict, increments: Optional[Dict[str, int]] = None,
+                        resets: Iterable[str] = ()) -> None:
+    """Record a review write; also revalidates the reviewed person's page"""
+    mark_changed("reviews", review["id"], increments, resets)
+    change_counters.bump("person_reviews", review["person_id"])
+
 # Enhanced Pydantic Models
 class PyObjectId(ObjectId):
     @classmethod
@@ -1129,11 +1321,321 @@ def initialize_scam_alerts():
     for scam in scams_data:
         DATABASE["scams"][scam["id"]] = scam
 
+def rebuild_indexes():
+    """Recompute counters and indexes derived from DATABASE (after seeding or restoring)"""
+    platform_stats.recount(DATABASE)
+    person_review_index.rebuild(DATABASE["reviews"].values())
+    scam_vote_index.rebuild(DATABASE["scam_votes"].values())
+    scam_ranking.rebuild(DATABASE["scams"].values())
+    moderation_queue.rebuild(DATABASE["flagged_reviews"].values())
+    name_index.rebuild(DATABASE["persons"].values())
+    suggest_index.rebuild(DATABASE["persons"].values())
+    phonetic_index.rebuild(DATABASE["persons"].values())
+    identifier_index.rebuild(DATABASE["persons"].values())
+    geo_index.rebuild(DATABASE["persons"].values())
+    facet_index.rebuild(DATABASE["persons"].values())
+    claim_index.rebuild(DATABASE["profile_claims"].values())
+
+# Seeding mode:
+#   snapshot - load data/seed_snapshot.json (precomputed hashes), fall back to eager if missing
+#   eager    - generate sample data at import (bcrypt-hashes every seed user)
+#   lazy     - start empty and load the seed in the background once the server is up
+#   none     - start with an empty database
+SEED_MODE = os.getenv("SEED_MODE", "snapshot").lower()
+SEED_SNAPSHOT_PATH = Path(os.getenv("SEED_SNAPSHOT_PATH", str(DEFAULT_SNAPSHOT_PATH)))
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+def record_timing(phase: str, started: float) -> float:
+    """Store the duration of a startup phase and return the time it ended"""
+    now = time.perf_counter()
+    STARTUP_TIMINGS[phase] = round(now - started, 4)
+    return now
+
+def log_startup_timings():
+    breakdown = " | ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in STARTUP_TIMINGS.items())
+    logger.info(f"⏱️ Startup timing: {breakdown}")
+
+def apply_seed_snapshot(snapshot: Dict[str, dict]):
+    """Replace the seed collections of DATABASE with snapshot contents"""
+    for name in SEED_COLLECTIONS:
+        DATABASE[name].clear()
+        DATABASE[name].update(snapshot.get(name, {}))
+
+def seed_database(allow_snapshot: bool = True):
+    """Fill DATABASE with sample data, preferring the prebuilt snapshot"""
+    started = time.perf_counter()
+    snapshot = load_seed_snapshot(SEED_SNAPSHOT_PATH) if allow_snapshot else None
+    if snapshot is not None:
+        started = record_timing("seed_snapshot_load", started)
+        apply_seed_snapshot(snapshot)
+        started = record_timing("seed_apply", started)
+    else:
+        if allow_snapshot:
+            logger.warning(f"⚠️ Seed snapshot not found at {SEED_SNAPSHOT_PATH} - generating sample data")
+        initialize_sample_data()
+        started = record_timing("seed_generate", started)
+    rebuild_indexes()
+    record_timing("indexes", started)
+    logger.info(f"✅ Database ready: {len(DATABASE['users'])} users, {len(DATABASE['persons'])} persons, {len(DATABASE['reviews'])} reviews, {len(DATABASE['scams'])} scam alerts")
+
+async def lazy_seed_database():
+    """Seed after startup; file reads and bcrypt run off the event loop"""
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    snapshot = await asyncio.to_thread(load_seed_snapshot, SEED_SNAPSHOT_PATH)
+    if snapshot is None:
+        # Importing the seed module is where the bcrypt cost is paid
+        await asyncio.to_thread(__import__, "scripts.bangalore_seed_data")
+        initialize_sample_data()
+    else:
+        apply_seed_snapshot(snapshot)
+    rebuild_indexes()
+    record_timing("lazy_seed", started)
+    logger.info(f"✅ Lazy seed complete: {len(DATABASE['users'])} users, {len(DATABASE['persons'])} persons, {len(DATABASE['reviews'])} reviews")
+    log_startup_timings()
+
+# DATABASE snapshots - restored in startup_event, written periodically and on shutdown
+# Disabled unless DB_SNAPSHOT_PATH is set (e.g. data/peoplerate.snapshot on a persistent disk)
+PERSISTED_COLLECTIONS = (
+    "users", "persons", "reviews", "scams", "scam_votes",
+    "profile_claims", "oauth_accounts", "flagged_reviews"
+)
+DB_SNAPSHOT_PATH = os.getenv("DB_SNAPSHOT_PATH", "")
+if SHARED_STATE_PATH and DB_SNAPSHOT_PATH:
+    logger.warning("⚠️ SHARED_STATE_PATH is set - SQLite persists the data, DB_SNAPSHOT_PATH is ignored")
+    DB_SNAPSHOT_PATH = ""
+DB_SNAPSHOT_SECONDS = int(os.getenv("DB_SNAPSHOT_SECONDS", "300"))
+DB_SNAPSHOT_COMPRESS = os.getenv("DB_SNAPSHOT_COMPRESS", "true").lower() == "true"
+DB_SNAPSHOT_MMAP = os.getenv("DB_SNAPSHOT_MMAP", "true").lower() == "true"
+_last_snapshot_generation = None
+
+# Write-ahead log next to the snapshot; replayed on top of it after a crash
+WAL_ENABLED = os.getenv("WAL_ENABLED", "true").lower() == "true"
+WAL_PATH = f"{DB_SNAPSHOT_PATH}.wal" if DB_SNAPSHOT_PATH and WAL_ENABLED else ""
+WAL_FSYNC = os.getenv("WAL_FSYNC", "batch")  # always | batch | never
+WAL_GROUP_COMMIT_MS = int(os.getenv("WAL_GROUP_COMMIT_MS", "10"))
+
+def persisted_generation() -> int:
+    """Sum of change counters for persisted collections - unchanged means nothing to snapshot"""
+    return sum(change_counters.version(name) for name in PERSISTED_COLLECTIONS)
+
+def restore_database_snapshot() -> Optional[dict]:
+    """Replace DATABASE collections with the latest snapshot; returns its metadata if restored"""
+    global _last_snapshot_generation
+    if not DB_SNAPSHOT_PATH or not os.path.exists(DB_SNAPSHOT_PATH):
+        return None
+
+    started = time.perf_counter()
+    try:
+        meta, collections = load_snapshot(DB_SNAPSHOT_PATH, use_mmap=DB_SNAPSHOT_MMAP)
+    except (SnapshotError, OSError, EOFError, pickle.UnpicklingError) as e:
+        logger.error(f"❌ Could not restore snapshot {DB_SNAPSHOT_PATH}: {e} - keeping seed data")
+        return None
+
+    for name in PERSISTED_COLLECTIONS:
+        if name in collections:
+            DATABASE[name] = collections[name]
+    started = record_timing("snapshot_restore", started)
+    rebuild_indexes()
+    record_timing("snapshot_indexes", started)
+    _last_snapshot_generation = persisted_generation()
+    logger.info(f"💾 Restored snapshot from {meta.get('created_at')}: {meta.get('counts')}")
+    return meta
+
+async def recover_database() -> bool:
+    """
+    Startup recovery: restore the snapshot, replay newer WAL entries on top of it,
+    then compact (fresh snapshot + truncated WAL). Returns True if any data was recovered.
+    """
+    global write_ahead_log
+    meta = restore_database_snapshot()
+    if not WAL_PATH:
+        return meta is not None
+
+    snapshot_seq = meta.get("wal_seq", 0) if meta else 0
+    started = time.perf_counter()
+    entries, valid_length = read_wal(Path(WAL_PATH))
+    applied, last_seq = apply_entries(DATABASE, entries, after_seq=snapshot_seq)
+    last_seq = max([last_seq] + [entry[0] for entry in entries])
+    if applied:
+        rebuild_indexes()
+        logger.info(f"📜 Replayed {applied} WAL entries after snapshot seq {snapshot_seq}")
+    record_timing("wal_replay", started)
+
+    write_ahead_log = WriteAheadLog(
+        Path(WAL_PATH), fsync_policy=WAL_FSYNC, group_commit_ms=WAL_GROUP_COMMIT_MS, start_seq=last_seq
+    )
+    if entries or valid_length < os.path.getsize(WAL_PATH):
+        await write_database_snapshot("recovery", force=True)
+    return meta is not None or applied > 0
+
+def open_shared_state() -> bool:
+    """
+    Multi-worker startup: the first worker copies its seed data into the shared store,
+    then every worker replaces its DATABASE with the store's contents
+    """
+    global shared_store
+    started = time.perf_counter()
+    shared_store = SharedStore(SHARED_STATE_PATH)
+    seeded = shared_store.seed_if_empty(
+        {name: DATABASE[name] for name in PERSISTED_COLLECTIONS if name in DATABASE}
+    )
+    reload_shared_state()
+    record_timing("shared_state_load", started)
+    logger.info(
+        f"🔗 Shared state {'seeded' if seeded else 'loaded'} from {SHARED_STATE_PATH}: "
+        f"{len(DATABASE['users'])} users, {len(DATABASE['persons'])} persons, {len(DATABASE['reviews'])} reviews"
+    )
+    return True
+
+def reload_shared_state():
+    collections = shared_store.load_all()
+    for name in PERSISTED_COLLECTIONS:
+        DATABASE[name] = collections.get(name, {})
+    rebuild_indexes()
+    for name in PERSISTED_COLLECTIONS:
+        change_counters.bump(name)
+
+def apply_remote_change(collection: str, key: str, record: Optional[dict]):
+    """Apply a write made by another worker to DATABASE and the derived counters/indexes"""
+    records = DATABASE.setdefault(collection, {})
+    before = records.get(key)
+    if record is None:
+        records.pop(key, None)
+    else:
+        records[key] = record
+
+    if collection == "reviews":
+        if before is not None:
+            platform_stats.remove_review(before)
+            change_counters.bump("person_reviews", before["person_id"])
+        if record is not None:
+            platform_stats.add_review(record)
+            person_review_index.add(record)
+            change_counters.bump("person_reviews", record["person_id"])
+        else:
+            person_review_index.remove(key)
+    elif collection == "persons":
+        if record is None:
+            name_index.remove(key)
+            suggest_index.remove(key)
+            phonetic_index.remove(key)
+            identifier_index.remove(key)
+            geo_index.remove(key)
+            facet_index.remove(key)
+        elif before is None:
+            platform_stats.add_person(record)
+            name_index.add(record)
+            suggest_index.add(record)
+            phonetic_index.add(record)
+            identifier_index.add(record)
+            geo_index.add(record)
+            facet_index.add(record)
+        else:
+            platform_stats.update_person(platform_stats.person_snapshot(before), record)
+            name_index.update(record)
+            suggest_index.update(record)
+            phonetic_index.update(record)
+            identifier_index.update(record)
+            geo_index.update(record)
+            facet_index.update(record)
+    elif collection == "users":
+        if before is None and record is not None:
+            platform_stats.add_user()
+        token_cache.invalidate_user(key)
+    elif collection == "scams":
+        if record is not None:
+            scam_ranking.update(record)
+        else:
+            scam_ranking.remove(key)
+    elif collection == "profile_claims":
+        if record is not None:
+            claim_index.update(record)
+        else:
+            claim_index.remove(key)
+    elif collection == "flagged_reviews":
+        if record is not None:
+            moderation_queue.update(record)
+        else:
+            moderation_queue.remove(key)
+    elif collection == "scam_votes":
+        if record is not None:
+            scam_vote_index.add(record)
+        else:
+            scam_vote_index.remove(key)
+
+    change_counters.bump(collection, key)
+
+def sync_shared_state():
+    """Pull other workers' writes into this process (called before every request)"""
+    if shared_store is None:
+        return
+    changes = shared_store.pull()
+    if changes is None:
+        logger.warning("⚠️ Fell behind the shared change feed - reloading all data")
+        reload_shared_state()
+        return
+    for collection, key, record in changes:
+        apply_remote_change(collection, key, record)
+
+def _collect_persisted() -> Tuple[Dict[str, dict], int]:
+    """Shallow copy of the persisted collections plus the WAL position they include"""
+    wal_seq = write_ahead_log.last_seq if write_ahead_log is not None else 0
+    return {name: dict(DATABASE[name]) for name in PERSISTED_COLLECTIONS if name in DATABASE}, wal_seq
+
+def _save_collected(collected: Tuple[Dict[str, dict], int], reason: str) -> int:
+    collections, wal_seq = collected
+    size = save_snapshot(
+        collections, Path(DB_SNAPSHOT_PATH), {"reason": reason, "wal_seq": wal_seq}, DB_SNAPSHOT_COMPRESS
+    )
+    # Entries up to wal_seq are in the snapshot now
+    if write_ahead_log is not None:
+        write_ahead_log.truncate_through(wal_seq)
+    return size
+
+async def write_database_snapshot(reason: str, force: bool = False) -> Optional[int]:
+    """Write DATABASE to DB_SNAPSHOT_PATH and compact the WAL; returns the file size, or None if skipped"""
+    global _last_snapshot_generation
+    generation = persisted_generation()
+    if not DB_SNAPSHOT_PATH or (generation == _last_snapshot_generation and not force):
+        return None
+
+    started = time.perf_counter()
+    size = None
+    # Serialize and write in a worker thread (compression, write and fsync release the GIL).
+    # A record mutated mid-pickle by a threadpool handler raises RuntimeError, so retry
+    # a few times before falling back to pickling on the event loop itself
+    for _ in range(3):
+        try:
+            size = await asyncio.to_thread(_save_collected, _collect_persisted(), reason)
+            break
+        except RuntimeError:
+            await asyncio.sleep(0.05)
+    if size is None:
+        size = _save_collected(_collect_persisted(), reason)
+
+    _last_snapshot_generation = generation
+    logger.info(f"💾 Snapshot written ({reason}): {size / 1024:.1f} KB in {time.perf_counter() - started:.2f}s")
+    return size
+
+async def database_snapshot_loop():
+    """Write a snapshot every DB_SNAPSHOT_SECONDS when DATABASE has changed"""
+    while True:
+        await asyncio.sleep(DB_SNAPSHOT_SECONDS)
+        try:
+            await write_database_snapshot("periodic")
+        except Exception as e:
+            logger.error(f"❌ Periodic snapshot failed: {e}")
+
 # INITIALIZE DATABASE IMMEDIATELY ON MODULE LOAD
 logger.info("🚀 PeopleRate starting up...")
-logger.info("🔧 Initializing in-memory database...")
-initialize_sample_data()
-logger.info(f"✅ Database ready: {len(DATABASE['users'])} users, {len(DATABASE['persons'])} persons, {len(DATABASE['reviews'])} reviews, {len(DATABASE['scams'])} scam alerts")
+record_timing("imports_and_setup", MODULE_LOAD_STARTED)
+if SEED_MODE in ("snapshot", "eager"):
+    logger.info(f"🔧 Initializing in-memory database ({SEED_MODE} seed)...")
+    seed_database(allow_snapshot=SEED_MODE == "snapshot")
+else:
+    rebuild_indexes()
+    logger.info(f"🔧 Starting with an empty database (SEED_MODE={SEED_MODE})")
 logger.info("🌐 Server is ready to accept connections on http://localhost:8080")
 
 # Helper functions
@@ -1144,11 +1646,18 @@ def create_jwt_token(data: dict) -> str:
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def verify_jwt_token(token: str) -> dict:
+    # Bursts of requests reuse the same token - skip HMAC verification on repeats
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
     except jwt.PyJWTError:
         return None
+    
+    token_cache.put(token, payload)
+    return payload
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
@@ -1156,17 +1665,60 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     
+    # The user record is always resolved fresh, so profile changes show up immediately
     user_id = payload.get("sub")
     user = DATABASE["users"].get(user_id)
     if user is None:
+        token_cache.invalidate_user(user_id)
         raise HTTPException(status_code=401, detail="User not found")
     
+    if not user.get("is_active", True):
+        token_cache.invalidate_user(user_id)
+        raise HTTPException(status_code=401, detail="User account is deactivated")
+    
     return user
 
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[dict]:
+    """The logged-in user, or None for anonymous requests and invalid tokens"""
+    if credentials is None:
+        return None
+    try:
+        return await get_current_user(credentials)
+    except HTTPException:
+        return None
+
 # Note: Content moderation functions imported from moderation.py
 # Functions available: contains_profanity(), filter_profanity(), analyze_content(), should_auto_flag()
 
 MIN_SEARCH_CONFIDENCE = 55
+SEARCH_FUZZY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.35"))
+SEARCH_NEAR_RADIUS_KM = float(os.getenv("SEARCH_NEAR_RADIUS_KM", "5"))
+SEARCH_FACET_VALUES = int(os.getenv("SEARCH_FACET_VALUES", "20"))  # values listed per facet
+
+def resolve_bare_area(parsed_query: dict) -> None:
+    """
+    Decide what an area alias not preceded by "near"/"in" is. "Majestic Tailors" is a name when
+    someone's name or company holds the alias and the rest of the query; "electrician Koramangala"
+    is a place when the query still matches without the alias. Otherwise the alias stays in the
+    name. A name reading clears parsed_query["area"], so no radius filter applies.
+    """
+    with_area = parsed_query.get("name_with_area")
+    if not parsed_query.get("area") or parsed_query.get("area_explicit") or not with_area:
+        return
+    name = parsed_query.get("name")
+    alias_words = [word for word in with_area.split() if word not in (name or "").split()]
+    holding_alias = name_index.similar(" ".join(alias_words), 0.8) if alias_words else {}
+    if holding_alias and holding_alias.keys() & name_index.similar(with_area, SEARCH_FUZZY_THRESHOLD).keys():
+        as_name = True
+    elif not name:
+        as_name = False  # only a trade or the area itself is left
+    else:
+        as_name = not (name_index.similar(name, SEARCH_FUZZY_THRESHOLD) or phonetic_index.matches(name))
+    if as_name:
+        parsed_query["name"] = with_area
+        parsed_query["area"] = None
 
 def search_persons_enhanced(query: str, limit: int = 10) -> List[Dict]:
     """Enhanced search with pattern recognition and scoring"""
@@ -1183,23 +1735,27 @@ def search_persons_enhanced(query: str, limit: int = 10) -> List[Dict]:
     phone_pattern = re.compile(r'[\+]?[\d\s\-\(\)]{10,}')
     linkedin_pattern = re.compile(r'linkedin\.com/in/[\w\-]+')
     
-    is_email_search = bool(email_pattern.search(query))
-    is_phone_search = bool(phone_pattern.search(query))
+    email_match = email_pattern.search(query)
+    phone_match = phone_pattern.search(query)
+    is_email_search = bool(email_match)
+    is_phone_search = bool(phone_match)
     is_linkedin_search = bool(linkedin_pattern.search(query))
     
-    for person in DATABASE["persons"].values():
+    # Emails and phones are looked up by canonical form; no need to visit every person
+    candidates = DATABASE["persons"].values()
+    if is_email_search or is_phone_search:
+        wanted = canonical_email(email_match.group()) if is_email_search else canonical_phone(phone_match.group())
+        candidates = [DATABASE["persons"][person_id] for person_id in identifier_index.lookup(wanted)
+                      if person_id in DATABASE["persons"]]
+    
+    for person in candidates:
         score = 0
         match_found = False
         
         # Exact match scoring
-        if is_email_search and person.get("email"):
-            if query_lower in person["email"].lower():
-                score += 100
-                match_found = True
-        elif is_phone_search and person.get("phone"):
-            if query in person["phone"]:
-                score += 100
-                match_found = True
+        if is_email_search or is_phone_search:
+            score += 100
+            match_found = True
         elif is_linkedin_search and person.get("linkedin_url"):
             if query_lower in person["linkedin_url"].lower():
                 score += 100
@@ -1295,7 +1851,7 @@ async def scam_alert_page(request: Request):
     return templates.TemplateResponse("scam-alert.html", {"request": request})
 
 @app.post("/api/auth/register")
-@limiter.limit("5/hour")  # Prevent spam registration
+@limiter.limit(RATE_LIMIT_REGISTER)  # Prevent spam registration
 async def register_user(request: Request, user: UserCreate):
     """Register a new user with username for anonymous reviews"""
     # Check if email exists
@@ -1309,7 +1865,8 @@ async def register_user(request: Request, user: UserCreate):
             raise HTTPException(status_code=400, detail="Username already taken")
     
     # Hash password
-    hashed_password = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt())
+    with metrics.span("bcrypt"):
+        hashed_password = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt())
     
     # Create user
     user_id = str(ObjectId())
@@ -1327,11 +1884,14 @@ async def register_user(request: Request, user: UserCreate):
     }
     
     DATABASE["users"][user_id] = user_data
+    platform_stats.add_user()
+    mark_changed("users", user_id)
     
     # Send verification email (MVP: file-based)
     try:
         base_url = str(request.base_url).rstrip('/')
-        send_verification_email(user.email, user_id, user.username, base_url)
+        with metrics.span("email_send"):
+            send_verification_email(user.email, user_id, user.username, base_url)
         logger.info(f"📧 Verification email sent for user: {user.username}")
     except Exception as e:
         logger.error(f"Failed to send verification email: {e}")
@@ -1352,7 +1912,7 @@ async def register_user(request: Request, user: UserCreate):
     }
 
 @app.post("/api/auth/login")
-@limiter.limit("10/minute")  # Prevent brute force attacks
+@limiter.limit(RATE_LIMIT_LOGIN)  # Prevent brute force attacks
 async def login_user(request: Request, email: str = Form(...), password: str = Form(...)):
     """Login user"""
     # Find user
@@ -1366,7 +1926,9 @@ async def login_user(request: Request, email: str = Form(...), password: str = F
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Verify password
-    if not bcrypt.checkpw(password.encode('utf-8'), user["password"].encode('utf-8')):
+    with metrics.span("bcrypt"):
+        password_ok = bcrypt.checkpw(password.encode('utf-8'), user["password"].encode('utf-8'))
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Create JWT token
@@ -1398,26 +1960,116 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
         "reputation_score": current_user.get("reputation_score", 0)
     }
 
+def facet_counts(within: int) -> dict:
+    """Facet counts over the persons in a bitmap; an empty result has none to count"""
+    if not within:
+        return {facet: [] for facet in FACETS}
+    with metrics.span("facet_counts"):
+        return facet_index.counts(within, SEARCH_FACET_VALUES)
+
 @app.get("/api/persons/search")
+@limiter.limit(RATE_LIMIT_SEARCH)
 async def search_persons(
+    request: Request,
     q: str = Query("", description="Natural language search query"),
-    limit: int = Query(10, le=50, description="Maximum number of results")
+    limit: int = Query(10, le=50, description="Maximum number of results"),
+    category: Optional[List[str]] = Query(None, description="Facet filter; repeat or comma-separate for any of several"),
+    area: Optional[List[str]] = Query(None),
+    languages: Optional[List[str]] = Query(None),
+    payment_modes: Optional[List[str]] = Query(None),
+    services_offered: Optional[List[str]] = Query(None),
+    facets: bool = Query(False, description="Include per-value facet counts over the matches")
 ):
-    """Natural language search for persons - understands queries like 'sasikala who is into consulting business in Hyderabad'"""
+    """
+    Natural language search for persons - understands queries like 'sasikala who is into consulting business in Hyderabad'
+    
+    Facet filters match any of the values given for a facet and every facet given. With
+    facets=true, "facets" holds counts per facet value over the matching persons.
+    """
     try:
+        filters = {
+            facet: [value.strip() for given in values for value in given.split(",") if value.strip()]
+            for facet, values in (
+                ("category", category), ("area", area), ("languages", languages),
+                ("payment_modes", payment_modes), ("services_offered", services_offered)
+            ) if values
+        }
+        allowed = None
+        if filters:
+            with metrics.span("facet_filter"):
+                allowed = facet_index.match(filters)
+        
+        # Filters alone: every matching person, most reviewed first
+        if not q.strip() and allowed is not None:
+            matched = [DATABASE["persons"][person_id] for person_id in facet_index.ids(allowed)
+                       if person_id in DATABASE["persons"]]
+            matched.sort(key=lambda person: (-person.get("review_count", 0), -person.get("average_rating", 0.0)))
+            response = {
+                "query": q,
+                "filters": filters,
+                "count": min(len(matched), limit),
+                "total": len(matched),
+                "persons": matched[:limit],
+                "suggest_add_person": not matched
+            }
+            if facets:
+                response["facets"] = facet_counts(allowed if matched else 0)
+            return response
+        
         # Parse natural language query
-        parsed_query = nlp_processor.parse_search_query(q)
+        with metrics.span("nlp_parse"):
+            parsed_query = nlp_processor.parse_search_query(q)
+            resolve_bare_area(parsed_query)
         logger.info(f"Parsed query: {parsed_query}")
         
-        # Get all persons and score them
+        # Typo-tolerant name candidates (trigram similarity to the name or company) and
+        # transliteration variants (same phonetic key: Shrinivas -> Srinivas, Laxmi -> Lakshmi)
+        name_matches = {}
+        phonetic_matches = {}
+        if parsed_query.get("name"):
+            with metrics.span("name_fuzzy"):
+                name_matches = name_index.similar(parsed_query["name"], SEARCH_FUZZY_THRESHOLD)
+                phonetic_matches = phonetic_index.matches(parsed_query["name"])
+        
+        # An email or phone in the query identifies the person: score only the exact
+        # (canonical) matches instead of every person
+        candidates = DATABASE["persons"].values()
+        proximity = {}
+        wanted = canonical_email(parsed_query.get("email")), canonical_phone(parsed_query.get("phone"))
+        if any(wanted):
+            with metrics.span("identifier_lookup"):
+                candidates = [DATABASE["persons"][person_id] for person_id in identifier_index.lookup(*wanted)
+                              if person_id in DATABASE["persons"]]
+        elif parsed_query.get("area"):
+            # "near Indiranagar": only persons within SEARCH_NEAR_RADIUS_KM, closer ones ranked higher
+            with metrics.span("geo_lookup"):
+                lat, lng = area_centroid(parsed_query["area"])
+                nearby = geo_index.nearby(lat, lng, SEARCH_NEAR_RADIUS_KM)
+                proximity = {person_id: 1 - distance / SEARCH_NEAR_RADIUS_KM for person_id, distance in nearby}
+                candidates = [DATABASE["persons"][person_id] for person_id in proximity if person_id in DATABASE["persons"]]
+        if allowed is not None:
+            # Facet filters narrow whichever candidates the lookups above left
+            allowed_ids = facet_index.ids(allowed)
+            if isinstance(candidates, list):
+                allowed_ids = set(allowed_ids)
+                candidates = [person for person in candidates if person["id"] in allowed_ids]
+            else:
+                candidates = [DATABASE["persons"][person_id] for person_id in allowed_ids if person_id in DATABASE["persons"]]
+        
+        # Score the candidates
         results = []
-        for person in DATABASE["persons"].values():
-            score = nlp_processor.generate_search_score(person, parsed_query)
-            # Only include results with meaningful matches (score >= 30)
-            # This filters out weak/random matches
-            if score >= 30:
-                results.append((person, score))
-                logger.info(f"Match found: {person.get('name')} with score {score}")
+        with metrics.span("search_scoring"):
+            for person in candidates:
+                score = nlp_processor.generate_search_score(
+                    person, parsed_query,
+                    name_matches.get(person["id"], 0.0), phonetic_matches.get(person["id"], 0.0),
+                    proximity.get(person["id"], 0.0)
+                )
+                # Only include results with meaningful matches (score >= 30)
+                # This filters out weak/random matches
+                if score >= 30:
+                    results.append((person, score))
+                    logger.info(f"Match found: {person.get('name')} with score {score}")
         
         # Sort by score
         results.sort(key=lambda x: x[1], reverse=True)
@@ -1426,8 +2078,10 @@ async def search_persons(
         suggest_add_person = True
         persons: List[Dict[str, Any]] = []
 
+        matched = []
         if results and top_score >= MIN_SEARCH_CONFIDENCE:
-            persons = [person for person, score in results if score >= confidence_cutoff][:limit]
+            matched = [person for person, score in results if score >= confidence_cutoff]
+            persons = matched[:limit]
             suggest_add_person = len(persons) == 0
         else:
             logger.info(
@@ -1438,19 +2092,85 @@ async def search_persons(
             suggest_add_person = True
             persons = []
         
-        return {
+        response = {
             "query": q,
             "parsed": parsed_query,
+            "filters": filters,
             "count": len(persons),
+            "total": len(matched),
             "persons": persons,
             "top_score": top_score,
             "confidence_cutoff": confidence_cutoff,
             "suggest_add_person": suggest_add_person
         }
+        if facets:
+            response["facets"] = facet_counts(facet_index.bitmap_of(person["id"] for person in matched))
+        return response
     except Exception as e:
         logger.error(f"Search error: {str(e)}")
         raise HTTPException(status_code=500, detail="Search failed")
 
+@app.get("/api/persons/suggest")
+@limiter.limit(RATE_LIMIT_SUGGEST)
+async def suggest_persons(
+    request: Request,
+    prefix: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """Autocomplete: best-rated persons whose name, company, area or category has a word starting with prefix"""
+    suggestions = []
+    for person_id in suggest_index.suggest(prefix, limit):
+        person = DATABASE["persons"].get(person_id)
+        if person is not None:
+            suggestions.append({
+                "id": person_id,
+                "name": person.get("name"),
+                "company": person.get("company"),
+                "job_title": person.get("job_title"),
+                "category": person.get("category"),
+                "area": person.get("area"),
+                "city": person.get("city"),
+                "review_count": person.get("review_count", 0),
+                "average_rating": person.get("average_rating", 0.0),
+            })
+    return {"prefix": prefix, "suggestions": suggestions}
+
+@app.get("/api/persons/nearby")
+@limiter.limit(RATE_LIMIT_SEARCH)
+async def nearby_persons(
+    request: Request,
+    area: Optional[str] = Query(None, max_length=100, description="Bengaluru area, e.g. Indiranagar"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(3.0, gt=0, le=25),
+    category: Optional[str] = Query(None, max_length=100),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Persons within radius_km of an area's centre or of lat/lng, nearest first"""
+    if lat is not None and lng is not None:
+        center = {"lat": lat, "lng": lng, "area": None}
+    elif area:
+        found = find_area(area)
+        if found is None:
+            raise HTTPException(status_code=400, detail=f"Unknown area: {area}")
+        center_lat, center_lng = area_centroid(found[0])
+        center = {"lat": center_lat, "lng": center_lng, "area": found[0]}
+    else:
+        raise HTTPException(status_code=400, detail="Pass an area, or both lat and lng")
+
+    persons = []
+    # Filtering by category reads the whole radius; without one, the nearest `limit` are enough
+    for person_id, distance in geo_index.nearby(center["lat"], center["lng"], radius_km, None if category else limit):
+        person = DATABASE["persons"].get(person_id)
+        if person is None:
+            continue
+        if category and (person.get("category") or "").lower() != category.lower():
+            continue
+        persons.append({**person, "distance_km": distance})
+        if len(persons) >= limit:
+            break
+    return {"center": center, "radius_km": radius_km, "count": len(persons), "persons": persons}
+
 @app.post("/api/persons")
 async def create_person(person: PersonBase, current_user: dict = Depends(get_current_user)):
     """Create a new person profile"""
@@ -1465,7 +2185,7 @@ async def create_person(person: PersonBase, current_user: dict = Depends(get_cur
         "total_rating": 0
     })
     
-    DATABASE["persons"][person_id] = person_data
+    insert_person(person_data)
     return {"message": "Person created successfully", "person_id": person_id}
 
 @app.post("/api/persons/nlp")
@@ -1493,36 +2213,12 @@ async def create_person_from_text(
             )
         
         # Create person
-        person_id = str(ObjectId())
-        person_data = {
-            "id": person_id,
-            "name": parsed_data["name"],
-            "email": parsed_data.get("email"),
-            "phone": parsed_data.get("phone"),
-            "job_title": parsed_data.get("job_title"),
-            "company": parsed_data.get("company"),
-            "industry": parsed_data.get("industry"),
-            "city": parsed_data.get("city"),
-            "state": parsed_data.get("state"),
-            "country": parsed_data.get("country"),
-            "linkedin_url": parsed_data.get("linkedin_url"),
-            "bio": parsed_data.get("bio") or description,  # Use description as bio
-            "skills": parsed_data.get("skills", []),
-            "experience_years": parsed_data.get("experience_years"),
-            "education": None,
-            "certifications": [],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
-            "review_count": 0,
-            "average_rating": 0.0,
-            "total_rating": 0
-        }
-        
-        DATABASE["persons"][person_id] = person_data
+        person_data = person_from_parsed(parsed_data, description)
+        insert_person(person_data)
         
         return {
             "message": "Person created successfully from natural language description",
-            "person_id": person_id,
+            "person_id": person_data["id"],
             "parsed_data": parsed_data,
             "person": person_data
         }
@@ -1532,6 +2228,95 @@ async def create_person_from_text(
         logger.error(f"Error creating person from NLP: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create person: {str(e)}")
 
+def person_from_parsed(parsed_data: dict, description: str) -> dict:
+    """A new person record from extract_person_fields output"""
+    return {
+        "id": str(ObjectId()),
+        "name": parsed_data["name"],
+        "email": parsed_data.get("email"),
+        "phone": parsed_data.get("phone"),
+        "job_title": parsed_data.get("job_title"),
+        "company": parsed_data.get("company"),
+        "industry": parsed_data.get("industry"),
+        "city": parsed_data.get("city"),
+        "state": parsed_data.get("state"),
+        "country": parsed_data.get("country"),
+        "linkedin_url": parsed_data.get("linkedin_url"),
+        "bio": parsed_data.get("bio") or description,  # Use description as bio
+        "skills": parsed_data.get("skills", []),
+        "experience_years": parsed_data.get("experience_years"),
+        "education": None,
+        "certifications": [],
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+        "review_count": 0,
+        "average_rating": 0.0,
+        "total_rating": 0
+    }
+
+def insert_person(person_data: dict) -> None:
+    """Store a new person, then update stats and indexes (which derive its search keys) and log the write"""
+    DATABASE["persons"][person_data["id"]] = person_data
+    platform_stats.add_person(person_data)
+    name_index.add(person_data)
+    suggest_index.add(person_data)
+    phonetic_index.add(person_data)
+    identifier_index.add(person_data)
+    geo_index.add(person_data)
+    facet_index.add(person_data)
+    mark_changed("persons", person_data["id"])
+
+@app.post("/api/persons/nlp/batch")
+async def create_persons_from_text_batch(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(jsonl|csv)$", description="Defaults to csv for text/csv bodies, else jsonl"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Create persons from a JSONL or CSV body of natural language descriptions (admin only)
+    
+    JSONL lines are strings or objects with a "description"; CSV needs a header row with a
+    "description" column (else the first column is used). Fields are extracted in a process
+    pool while the body is still uploading. Descriptions whose phone, WhatsApp number or email
+    already belongs to a person - including one created earlier in the same upload - are
+    skipped as duplicates. The response is NDJSON: one result per record as it is processed,
+    then a summary line.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "jsonl")
+
+    async def limited():
+        count = 0
+        async for record in read_descriptions(request.stream(), fmt):
+            count += 1
+            if count > NLP_BATCH_MAX_LINES:
+                yield record[0], None, f"Batch limit of {NLP_BATCH_MAX_LINES} records reached - rest of the body ignored"
+                return
+            yield record
+
+    async def results():
+        summary = {"created": 0, "duplicate": 0, "error": 0}
+        async for line, description, parsed_data in batch_extractor.extract(limited()):
+            if parsed_data.get("error"):
+                result = {"line": line, "status": "error", "detail": parsed_data["error"]}
+            elif not parsed_data.get("name"):
+                result = {"line": line, "status": "error", "detail": "Could not extract a name from the description"}
+            else:
+                person_data = person_from_parsed(parsed_data, description)
+                existing = identifier_index.lookup(*identifiers(person_data))
+                if existing:
+                    result = {"line": line, "status": "duplicate", "person_id": existing[0], "name": person_data["name"]}
+                else:
+                    insert_person(person_data)
+                    result = {"line": line, "status": "created", "person_id": person_data["id"], "name": person_data["name"]}
+            summary[result["status"]] += 1
+            yield json.dumps(result) + "\n"
+        logger.info(f"📥 NLP batch import by {current_user['id']}: {summary}")
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return UploadStreamingResponse(results(), media_type="application/x-ndjson")
+
 @app.get("/api/persons/{person_id}")
 async def get_person(person_id: str):
     """Get person details"""
@@ -1539,26 +2324,90 @@ async def get_person(person_id: str):
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
     
-    # Get reviews for this person with reviewer verification info
-    person_reviews = []
-    for review in DATABASE["reviews"].values():
-        if review["person_id"] == person_id:
-            # Add reviewer verification badges
-            reviewer = DATABASE["users"].get(review["reviewer_id"])
-            if reviewer:
-                review_copy = review.copy()
-                review_copy["reviewer_email_verified"] = reviewer.get("email_verified", False)
-                review_copy["reviewer_linkedin_verified"] = reviewer.get("linkedin_verified", False)
-                review_copy["reviewer_company_verified"] = reviewer.get("company_verified", False)
-                person_reviews.append(review_copy)
-            else:
-                person_reviews.append(review)
+    # Get reviews for this person (newest first) with reviewer verification info
+    person_reviews = [
+        with_reviewer_badges(DATABASE["reviews"][review_id])
+        for review_id in person_review_index.review_ids(person_id)
+        if review_id in DATABASE["reviews"]
+    ]
     
-    return {
+    return FastJSONResponse({
         "person": person,
         "reviews": person_reviews
+    })
+
+def with_reviewer_badges(review: dict) -> dict:
+    """Copy of a review with the reviewer's verification badges attached"""
+    reviewer = DATABASE["users"].get(review["reviewer_id"])
+    if not reviewer:
+        return review
+    
+    review_copy = review.copy()
+    review_copy["reviewer_email_verified"] = reviewer.get("email_verified", False)
+    review_copy["reviewer_linkedin_verified"] = reviewer.get("linkedin_verified", False)
+    review_copy["reviewer_company_verified"] = reviewer.get("company_verified", False)
+    return review_copy
+
+def person_rating(person_id: str) -> dict:
+    """A person's review_count, average_rating and total_rating from the review index summary"""
+    summary = person_review_index.summary(person_id)
+    return {
+        "review_count": summary["review_count"],
+        "average_rating": summary["average_rating"],
+        "total_rating": sum(int(star) * count for star, count in summary["rating_histogram"].items())
+    }
+
+def review_page(person_id: str, sort: str, offset: int, limit: int) -> dict:
+    """One page of a person's reviews served from the ordered per-person index"""
+    total, review_ids = person_review_index.page(person_id, sort, offset, limit)
+    reviews = [
+        with_reviewer_badges(DATABASE["reviews"][review_id])
+        for review_id in review_ids
+        if review_id in DATABASE["reviews"]
+    ]
+    return {
+        "sort": sort,
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "has_more": offset + len(reviews) < total,
+        "reviews": reviews
     }
 
+@app.get("/api/persons/{person_id}/reviews")
+async def get_person_reviews(
+    person_id: str,
+    sort: str = Query("newest", description="newest, highest, helpful or verified"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Paginated, sorted reviews for a person"""
+    if person_id not in DATABASE["persons"]:
+        raise HTTPException(status_code=404, detail="Person not found")
+    
+    if sort not in REVIEW_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Must be one of: {', '.join(REVIEW_SORTS)}")
+    
+    page = review_page(person_id, sort, offset, limit)
+    page["person_id"] = person_id
+    return FastJSONResponse(page)
+
+@app.get("/api/persons/{person_id}/summary")
+async def get_person_summary(
+    person_id: str,
+    limit: int = Query(5, ge=0, le=20, description="Number of newest reviews to include")
+):
+    """Person profile with precomputed rating summary and the first page of reviews"""
+    person = DATABASE["persons"].get(person_id)
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+    
+    return FastJSONResponse({
+        "person": person,
+        "summary": person_review_index.summary(person_id),
+        "reviews": review_page(person_id, "newest", 0, limit)
+    })
+
 @app.post("/api/reviews")
 @limiter.limit("5/hour")  # Prevent review spam
 async def create_review(request: Request, review: ReviewBase, current_user: dict = Depends(get_current_user)):
@@ -1569,18 +2418,13 @@ async def create_review(request: Request, review: ReviewBase, current_user: dict
         raise HTTPException(status_code=404, detail="Person not found")
     
     # Check if user already reviewed this person
-    existing_review = None
-    for r in DATABASE["reviews"].values():
-        if r["reviewer_id"] == current_user["id"] and r["person_id"] == review.person_id:
-            existing_review = r
-            break
-    
-    if existing_review:
+    if person_review_index.reviewed_by(review.person_id, current_user["id"]):
         raise HTTPException(status_code=400, detail="You have already reviewed this person")
     
     # Content moderation check
-    content_analysis = analyze_content(review.comment)
-    auto_flagged = should_auto_flag(review.comment)
+    with metrics.span("moderation"):
+        content_analysis = analyze_content(review.comment)
+        auto_flagged = should_auto_flag(review.comment)
     
     if content_analysis["has_profanity"]:
         # Filter profanity automatically
@@ -1607,23 +2451,25 @@ async def create_review(request: Request, review: ReviewBase, current_user: dict
     })
     
     DATABASE["reviews"][review_id] = review_data
+    platform_stats.add_review(review_data)
+    person_review_index.add(review_data)
     
     # Update person's rating
-    person_reviews = [r for r in DATABASE["reviews"].values() if r["person_id"] == review.person_id]
-    total_rating = sum(r["rating"] for r in person_reviews)
-    review_count = len(person_reviews)
-    average_rating = total_rating / review_count if review_count > 0 else 0
-    
+    person_before = platform_stats.person_snapshot(person)
     DATABASE["persons"][review.person_id].update({
-        "review_count": review_count,
-        "average_rating": round(average_rating, 1),
-        "total_rating": total_rating,
+        **person_rating(review.person_id),
         "updated_at": datetime.utcnow()
     })
+    platform_stats.update_person(person_before, person)
+    suggest_index.update(person)
     
     # Update user's review count
     DATABASE["users"][current_user["id"]]["review_count"] = DATABASE["users"][current_user["id"]].get("review_count", 0) + 1
     
+    mark_review_changed(review_data)
+    mark_changed("persons", review_data["person_id"])
+    mark_changed("users", current_user["id"], {"review_count": 1})
+    
     return {
         "message": "Review created successfully", 
         "review_id": review_id,
@@ -1657,18 +2503,13 @@ async def create_review_with_proof(
         raise HTTPException(status_code=404, detail="Person not found")
     
     # Check if user already reviewed this person
-    existing_review = None
-    for r in DATABASE["reviews"].values():
-        if r["reviewer_id"] == current_user["id"] and r["person_id"] == person_id:
-            existing_review = r
-            break
-    
-    if existing_review:
+    if person_review_index.reviewed_by(person_id, current_user["id"]):
         raise HTTPException(status_code=400, detail="You have already reviewed this person")
     
     # Content moderation
-    content_analysis = analyze_content(comment)
-    auto_flagged = should_auto_flag(comment)
+    with metrics.span("moderation"):
+        content_analysis = analyze_content(comment)
+        auto_flagged = should_auto_flag(comment)
     
     if content_analysis["has_profanity"]:
         comment = filter_profanity(comment)
@@ -1716,23 +2557,25 @@ async def create_review_with_proof(
     }
     
     DATABASE["reviews"][review_id] = review_data
+    platform_stats.add_review(review_data)
+    person_review_index.add(review_data)
     
     # Update person's rating
-    person_reviews = [r for r in DATABASE["reviews"].values() if r["person_id"] == person_id]
-    total_rating = sum(r["rating"] for r in person_reviews)
-    review_count = len(person_reviews)
-    average_rating = total_rating / review_count if review_count > 0 else 0
-    
+    person_before = platform_stats.person_snapshot(person)
     DATABASE["persons"][person_id].update({
-        "review_count": review_count,
-        "average_rating": round(average_rating, 1),
-        "total_rating": total_rating,
+        **person_rating(person_id),
         "updated_at": datetime.utcnow()
     })
+    platform_stats.update_person(person_before, person)
+    suggest_index.update(person)
     
     # Update user's review count
     DATABASE["users"][current_user["id"]]["review_count"] = DATABASE["users"][current_user["id"]].get("review_count", 0) + 1
     
+    mark_review_changed(review_data)
+    mark_changed("persons", review_data["person_id"])
+    mark_changed("users", current_user["id"], {"review_count": 1})
+    
     return {
         "message": "Review created successfully",
         "review_id": review_id,
@@ -1763,10 +2606,10 @@ async def get_reviews(
             review["person_name"] = person["name"]
         # Note: reviewer_username is already in the review, real name is protected
     
-    return {
+    return FastJSONResponse({
         "count": len(reviews),
         "reviews": reviews[:limit]
-    }
+    })
 
 @app.post("/api/flag-review")
 @limiter.limit("10/hour")  # Prevent flag spam
@@ -1803,19 +2646,19 @@ async def flag_review(
         "reviewed_at": None
     }
     
-    # Initialize flagged_reviews collection if not exists
-    if "flagged_reviews" not in DATABASE:
-        DATABASE["flagged_reviews"] = {}
-    
     DATABASE["flagged_reviews"][flag_id] = flag_data
+    moderation_queue.add(flag_data)
     
-    # Increment reported_count on the review
+    # Increment reported_count on the review (the write returns the count across workers)
     review["reported_count"] = review.get("reported_count", 0) + 1
+    mark_changed("flagged_reviews", flag_id)
+    mark_review_changed(review, {"reported_count": 1})
     
     # Auto-hide review if reported 3+ times
-    if review["reported_count"] >= 3:
+    if review["reported_count"] >= 3 and not review.get("is_hidden"):
         review["is_hidden"] = True
         logger.warning(f"Review {review_id} auto-hidden after {review['reported_count']} reports")
+        mark_review_changed(review)
     
     return {
         "message": "Review flagged successfully",
@@ -1862,10 +2705,10 @@ async def get_pending_reviews(
             review["reviewer_email"] = reviewer.get("email")
             review["reviewer_reputation"] = reviewer.get("reputation_score", 0)
     
-    return {
+    return FastJSONResponse({
         "count": len(pending_reviews),
         "reviews": pending_reviews[:limit]
-    }
+    })
 
 
 @app.get("/api/admin/reviews/{review_id}/proof")
@@ -1914,6 +2757,7 @@ async def verify_review(
         raise HTTPException(status_code=404, detail="Review not found")
     
     # Update review verification status
+    review_before = platform_stats.review_snapshot(review)
     if approved:
         review["is_verified"] = True
         review["verification_status"] = "verified"
@@ -1927,12 +2771,17 @@ async def verify_review(
     review["verified_by"] = current_user["username"]
     review["verified_at"] = datetime.utcnow()
     review["updated_at"] = datetime.utcnow()
+    platform_stats.update_review(review_before, review)
+    person_review_index.update(review)
     
     # Update reviewer's reputation (reward for verified reviews)
     reviewer = DATABASE["users"].get(review["reviewer_id"])
     if reviewer and approved:
         reviewer["reputation_score"] = reviewer.get("reputation_score", 0) + 10
         logger.info(f"👍 Reviewer {reviewer['username']} reputation +10 (verified review)")
+        mark_changed("users", reviewer["id"], {"reputation_score": 10})
+    
+    mark_review_changed(review)
     
     return {
         "message": f"Review {'verified' if approved else 'rejected'} successfully",
@@ -1950,28 +2799,59 @@ async def get_verification_stats(current_user: dict = Depends(get_current_user))
     if not is_admin(current_user):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    all_reviews = list(DATABASE["reviews"].values())
-    
-    stats = {
-        "total_reviews": len(all_reviews),
-        "pending_verification": len([r for r in all_reviews if r.get("verification_status") == "pending"]),
-        "verified": len([r for r in all_reviews if r.get("verification_status") == "verified"]),
-        "rejected": len([r for r in all_reviews if r.get("verification_status") == "rejected"]),
-        "no_proof": len([r for r in all_reviews if r.get("verification_status") == "no_proof"]),
-        "with_proof": len([r for r in all_reviews if r.get("proof_document")]),
-        "verification_rate": 0
-    }
-    
-    # Calculate verification rate
-    total_with_proof = stats["verified"] + stats["rejected"]
-    if total_with_proof > 0:
-        stats["verification_rate"] = round((stats["verified"] / total_with_proof) * 100, 1)
+    return platform_stats.verification_stats()
+
+
+@app.get("/api/admin/export/{collection}")
+async def export_collection(
+    collection: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False, description="Gzip the stream on the fly"),
+    updated_since: Optional[datetime] = Query(None, description="Only records created or changed at or after this time (UTC if no offset)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream persons, reviews, claims or scams as NDJSON or CSV (admin only)
     
-    return stats
+    Records are read and written one chunk at a time, so memory stays flat however large the
+    collection. For incremental exports pass the previous run's X-Export-Started-At header as
+    updated_since; records without any timestamp (seeded vendors) are only in full exports.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if collection not in EXPORT_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection. Choose from: {', '.join(EXPORT_COLLECTIONS)}")
+    
+    started_at = datetime.utcnow()
+    filename = f"{collection}-{started_at:%Y%m%dT%H%M%SZ}.{'jsonl' if format == 'ndjson' else 'csv'}"
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    logger.info(f"📤 Export of {collection} ({format}{', gzip' if gzip else ''}"
+                f"{f', since {updated_since.isoformat()}' if updated_since else ''}) by {current_user['id']}")
+    return StreamingResponse(
+        export_stream(collection, DATABASE[EXPORT_COLLECTIONS[collection]], format, gzip, updated_since),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Started-At": started_at.isoformat() + "Z",
+        }
+    )
 
 
 # ==================== PROFILE CLAIMING ====================
 
+def mark_person_claimed(claim: dict):
+    """Mark the claimed person as owned by the claimer (sets both claimed flags the two claim APIs use)"""
+    person = DATABASE["persons"].get(claim["person_id"])
+    if person:
+        person["claimed"] = person["is_claimed"] = True
+        person["claimed_by"] = claim["user_id"]
+        person["claimed_at"] = datetime.utcnow()
+        mark_changed("persons", claim["person_id"])
+        logger.info(f"Profile {claim['person_id']} claimed by user {claim['user_id']}")
+
 @app.post("/api/claims")
 @limiter.limit("5/hour")  # Prevent claim spam
 async def submit_profile_claim(
@@ -1986,17 +2866,11 @@ async def submit_profile_claim(
         raise HTTPException(status_code=404, detail="Person not found")
     
     # Check if profile is already claimed
-    if person.get("claimed"):
+    if person.get("claimed") or person.get("is_claimed"):
         raise HTTPException(status_code=400, detail="This profile has already been claimed")
     
     # Check if user has pending claim for this person
-    existing_claim = None
-    for c in DATABASE["profile_claims"].values():
-        if c["user_id"] == current_user["id"] and c["person_id"] == claim.person_id and c["status"] == "pending":
-            existing_claim = c
-            break
-    
-    if existing_claim:
+    if claim_index.find(current_user["id"], claim.person_id, "pending"):
         raise HTTPException(status_code=400, detail="You already have a pending claim for this profile")
     
     # Create claim
@@ -2014,6 +2888,8 @@ async def submit_profile_claim(
     })
     
     DATABASE["profile_claims"][claim_id] = claim_data
+    claim_index.add(claim_data)
+    mark_changed("profile_claims", claim_id)
     
     logger.info(f"Profile claim submitted: {claim_id} for person {claim.person_id} by {current_user['username']}")
     
@@ -2027,19 +2903,17 @@ async def submit_profile_claim(
 @app.get("/api/claims/my")
 async def get_my_claims(current_user: dict = Depends(get_current_user)):
     """Get current user's profile claims"""
-    user_claims = [
-        claim for claim in DATABASE["profile_claims"].values()
-        if claim["user_id"] == current_user["id"]
-    ]
-    
-    # Enrich with person info
-    for claim in user_claims:
+    user_claims = []
+    for claim_id in claim_index.for_user(current_user["id"]):
+        claim = dict(DATABASE["profile_claims"][claim_id])
+        # Enrich with person info
         person = DATABASE["persons"].get(claim["person_id"])
         if person:
             claim["person_name"] = person.get("name")
             claim["person_company"] = person.get("company")
+        user_claims.append(claim)
     
-    return {"claims": sorted(user_claims, key=lambda x: x["created_at"], reverse=True)}
+    return {"claims": user_claims}
 
 
 @app.get("/api/admin/claims/pending")
@@ -2048,13 +2922,12 @@ async def get_pending_claims(current_user: dict = Depends(get_current_user)):
     if not is_admin(current_user):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    pending_claims = [
-        claim for claim in DATABASE["profile_claims"].values()
-        if claim["status"] == "pending"
-    ]
-    
-    # Enrich with person and user info
-    for claim in pending_claims:
+    pending_claims = []
+    for claim_id in claim_index.with_status("pending"):
+        claim = dict(DATABASE["profile_claims"][claim_id])
+        pending_claims.append(claim)
+        
+        # Enrich with person and user info
         person = DATABASE["persons"].get(claim["person_id"])
         if person:
             claim["person_name"] = person.get("name")
@@ -2066,7 +2939,7 @@ async def get_pending_claims(current_user: dict = Depends(get_current_user)):
             claim["user_email"] = user.get("email")
             claim["user_full_name"] = user.get("full_name")
     
-    return {"claims": sorted(pending_claims, key=lambda x: x["created_at"])}
+    return {"claims": pending_claims}
 
 
 @app.post("/api/admin/claims/{claim_id}/review")
@@ -2096,14 +2969,10 @@ async def review_claim(
     
     # If approved, update person record
     if approved:
-        person = DATABASE["persons"].get(claim["person_id"])
-        if person:
-            person["claimed"] = True
-            person["claimed_by"] = claim["user_id"]
-            person["claimed_at"] = datetime.utcnow()
-            
-            logger.info(f"Profile {claim['person_id']} claimed by user {claim['user_id']}")
+        mark_person_claimed(claim)
     
+    claim_index.update(claim)
+    mark_changed("profile_claims", claim_id)
     logger.info(f"Claim {claim_id} {'approved' if approved else 'rejected'} by admin {current_user['username']}")
     
     return {
@@ -2230,6 +3099,7 @@ async def oauth_callback(provider: str, request: Request):
             existing_oauth["refresh_token"] = token.get('refresh_token')
             existing_oauth["token_expires_at"] = datetime.utcnow() + timedelta(seconds=token.get('expires_in', 3600))
             existing_oauth["updated_at"] = datetime.utcnow()
+            mark_changed("oauth_accounts", existing_oauth["id"])
             
             # Get existing user
             user = DATABASE["users"].get(existing_oauth["user_id"])
@@ -2265,6 +3135,8 @@ async def oauth_callback(provider: str, request: Request):
                     "company_verified": False
                 }
                 DATABASE["users"][user_id] = user
+                platform_stats.add_user()
+                mark_changed("users", user_id)
                 logger.info(f"New user created via {provider} OAuth: {email}")
             
             # Create OAuth account link
@@ -2283,6 +3155,7 @@ async def oauth_callback(provider: str, request: Request):
                 "updated_at": datetime.utcnow()
             }
             DATABASE["oauth_accounts"][oauth_id] = oauth_account
+            mark_changed("oauth_accounts", oauth_id)
             
             logger.info(f"OAuth account linked: {provider} for user {email}")
         
@@ -2327,6 +3200,7 @@ async def unlink_oauth_account(provider: str, current_user: dict = Depends(get_c
     for oauth_id, oauth_account in list(DATABASE["oauth_accounts"].items()):
         if oauth_account["user_id"] == current_user["id"] and oauth_account["provider"] == provider:
             del DATABASE["oauth_accounts"][oauth_id]
+            mark_changed("oauth_accounts", oauth_id)
             removed = True
             logger.info(f"Unlinked {provider} OAuth for user {current_user['email']}")
             break
@@ -2339,30 +3213,36 @@ async def unlink_oauth_account(provider: str, current_user: dict = Depends(get_c
 
 @app.get("/api/stats")
 async def get_stats():
-    """Get platform statistics"""
-    total_users = len(DATABASE["users"])
-    total_persons = len(DATABASE["persons"])
-    total_reviews = len(DATABASE["reviews"])
-    
-    # Calculate average rating across all persons
-    persons_with_ratings = [p for p in DATABASE["persons"].values() if p.get("review_count", 0) > 0]
-    avg_platform_rating = sum(p.get("average_rating", 0) for p in persons_with_ratings) / len(persons_with_ratings) if persons_with_ratings else 0
-    
-    return {
-        "total_users": total_users,
-        "total_persons": total_persons,
-        "total_reviews": total_reviews,
-        "average_rating": round(avg_platform_rating, 1),
-        "verified_reviews": sum(1 for r in DATABASE["reviews"].values() if r.get("is_verified", False))
-    }
+    """Get platform statistics (served from incrementally maintained counters)"""
+    return platform_stats.platform_stats()
 
-# ==================== ADMIN & MODERATION ====================
 
-# In-memory flagged content storage (move to database for production)
-FLAGGED_CONTENT = {}
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus scrape endpoint (METRICS_ENABLED=true; bearer METRICS_TOKEN if set)"""
+    if not metrics.enabled:
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        return PlainTextResponse("Unauthorized\n", status_code=401)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
-# Profile claim requests storage (move to database for production)
-PROFILE_CLAIMS = {}
+
+STATS_RECOUNT_SECONDS = int(os.getenv("STATS_RECOUNT_SECONDS", "300"))
+
+async def stats_recount_loop():
+    """Periodically recount stats from DATABASE to catch write paths that drifted"""
+    while True:
+        await asyncio.sleep(STATS_RECOUNT_SECONDS)
+        drift = platform_stats.recount(DATABASE)
+        if drift:
+            logger.warning(f"📊 Stats drift corrected: {drift}")
+
+# ==================== ADMIN & MODERATION ====================
+
+# Pending flags rendered on the admin dashboard; the rest stay queued
+ADMIN_QUEUE_SIZE = int(os.getenv("ADMIN_QUEUE_SIZE", "50"))
 
 @app.get("/admin")
 async def admin_page(request: Request, current_user: dict = Depends(get_current_user)):
@@ -2373,31 +3253,31 @@ async def admin_page(request: Request, current_user: dict = Depends(get_current_
     
     # Get statistics
     stats = {
-        "users": len(DATABASE["users"]),
-        "persons": len(DATABASE["persons"]),
-        "reviews": len(DATABASE["reviews"])
+        "users": platform_stats.total_users,
+        "persons": platform_stats.total_persons,
+        "reviews": platform_stats.total_reviews
     }
     
-    # Get flagged reviews
+    # Pending flags in priority order (most-reported review first, then oldest report)
     flagged_reviews = []
-    for flag_id, flag in FLAGGED_CONTENT.items():
-        if flag.get("status") == "pending":
-            review = DATABASE["reviews"].get(flag["review_id"])
-            if review:
-                person = DATABASE["persons"].get(review["person_id"])
-                flagged_reviews.append({
-                    "flag_id": flag_id,
-                    "review_id": flag["review_id"],
-                    "reason": flag["reason"],
-                    "description": flag.get("description"),
-                    "reporter_username": flag["reporter_username"],
-                    "reviewer_username": review["reviewer_username"],
-                    "person_name": person["name"] if person else "Unknown",
-                    "rating": review["rating"],
-                    "title": review.get("title"),
-                    "comment": review["comment"],
-                    "created_at": flag["created_at"]
-                })
+    for flag_id in moderation_queue.top(ADMIN_QUEUE_SIZE):
+        flag = DATABASE["flagged_reviews"][flag_id]
+        review = DATABASE["reviews"].get(flag["review_id"])
+        if review:
+            person = DATABASE["persons"].get(review["person_id"])
+            flagged_reviews.append({
+                "flag_id": flag_id,
+                "review_id": flag["review_id"],
+                "reason": flag["reason"],
+                "description": flag.get("description"),
+                "reporter_username": flag["flagger_username"],
+                "reviewer_username": review["reviewer_username"],
+                "person_name": person["name"] if person else "Unknown",
+                "rating": review["rating"],
+                "title": review.get("title"),
+                "comment": review["comment"],
+                "created_at": flag["created_at"]
+            })
     
     # Get recent reviews
     recent_reviews = sorted(
@@ -2420,7 +3300,7 @@ async def admin_page(request: Request, current_user: dict = Depends(get_current_
     return templates.TemplateResponse("admin.html", {
         "request": request,
         "stats": stats,
-        "flagged_count": len(flagged_reviews),
+        "flagged_count": moderation_queue.pending_count,
         "flagged_reviews": flagged_reviews,
         "recent_reviews": recent_reviews,
         "top_users": top_users
@@ -2441,31 +3321,44 @@ async def moderate_review(
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
+    resets = ()
     if action == "approve":
+        review_before = platform_stats.review_snapshot(review)
+        # Absolute, so reports another worker counted meanwhile are cleared too
+        resets = ("reported_count",)
         review["reported_count"] = 0
         review["is_verified"] = True
+        platform_stats.update_review(review_before, review)
+        person_review_index.update(review)
         message = "Review approved"
     elif action == "reject":
         # Remove the review
         del DATABASE["reviews"][review_id]
+        platform_stats.remove_review(review)
+        person_review_index.remove(review_id)
         # Update person stats
         person = DATABASE["persons"].get(review["person_id"])
         if person:
-            person["review_count"] = max(0, person.get("review_count", 1) - 1)
-            if person["review_count"] > 0:
-                remaining_reviews = [r for r in DATABASE["reviews"].values() if r["person_id"] == review["person_id"]]
-                total = sum(r["rating"] for r in remaining_reviews)
-                person["average_rating"] = total / len(remaining_reviews) if remaining_reviews else 0
-            else:
-                person["average_rating"] = 0
+            person_before = platform_stats.person_snapshot(person)
+            person.update(person_rating(person["id"]))
+            platform_stats.update_person(person_before, person)
+            suggest_index.update(person)
+            mark_changed("persons", person["id"])
         message = "Review removed"
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
     
-    # Remove flags for this review
-    for flag_id in list(FLAGGED_CONTENT.keys()):
-        if FLAGGED_CONTENT[flag_id]["review_id"] == review_id:
-            FLAGGED_CONTENT[flag_id]["status"] = "resolved"
+    mark_review_changed(review, resets=resets)
+    
+    # Resolve the review's pending flags
+    for flag_id in moderation_queue.flag_ids(review_id):
+        flag = DATABASE["flagged_reviews"][flag_id]
+        if flag["status"] == "pending":
+            flag["status"] = "resolved"
+            flag["reviewed_by"] = current_user["username"]
+            flag["reviewed_at"] = datetime.utcnow()
+            moderation_queue.update(flag)
+            mark_changed("flagged_reviews", flag_id)
     
     logger.info(f"Admin {current_user['username']} {action}ed review {review_id}")
     
@@ -2482,16 +3375,24 @@ async def moderate_flag(
     if current_user.get("username") not in ["TechReviewer2024", "ProjectManager_Pro"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    flag = FLAGGED_CONTENT.get(flag_id)
+    flag = DATABASE["flagged_reviews"].get(flag_id)
     if not flag:
         raise HTTPException(status_code=404, detail="Flag not found")
     
     if action == "dismiss":
+        if flag["status"] != "pending":
+            raise HTTPException(status_code=400, detail="Flag already reviewed")
         flag["status"] = "dismissed"
+        flag["reviewed_by"] = current_user["username"]
+        flag["reviewed_at"] = datetime.utcnow()
+        moderation_queue.update(flag)
+        mark_changed("flagged_reviews", flag_id)
         # Reset report count on review
         review = DATABASE["reviews"].get(flag["review_id"])
         if review:
-            review["reported_count"] = max(0, review.get("reported_count", 1) - 1)
+            reported_before = review.get("reported_count", 0)
+            review["reported_count"] = max(0, reported_before - 1)
+            mark_review_changed(review, {"reported_count": review["reported_count"] - reported_before})
         message = "Flag dismissed"
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
@@ -2522,6 +3423,7 @@ async def verify_email_page(request: Request, token: str):
     if user:
         user["email_verified"] = True
         user["verified_at"] = datetime.utcnow()
+        mark_changed("users", user_id)
         logger.info(f"✅ Email verified for user: {user['username']}")
         
         return templates.TemplateResponse("verification_success.html", {
@@ -2545,7 +3447,8 @@ async def resend_verification(request: Request, current_user: dict = Depends(get
     # Send new verification email
     try:
         base_url = str(request.base_url).rstrip('/')
-        send_verification_email(user["email"], user["id"], user["username"], base_url)
+        with metrics.span("email_send"):
+            send_verification_email(user["email"], user["id"], user["username"], base_url)
         logger.info(f"📧 Verification email resent for user: {user['username']}")
         return {"message": "Verification email sent. Please check your inbox."}
     except Exception as e:
@@ -2570,30 +3473,32 @@ async def claim_profile(
         raise HTTPException(status_code=404, detail="Person not found")
     
     # Check if already claimed
-    if person.get("is_claimed"):
+    if person.get("claimed") or person.get("is_claimed"):
         raise HTTPException(status_code=400, detail="This profile has already been claimed")
     
     # Check if user already has pending claim
-    for claim in PROFILE_CLAIMS.values():
-        if claim["person_id"] == person_id and claim["claimer_id"] == current_user["id"] and claim["status"] == "pending":
-            raise HTTPException(status_code=400, detail="You already have a pending claim for this profile")
+    if claim_index.find(current_user["id"], person_id, "pending"):
+        raise HTTPException(status_code=400, detail="You already have a pending claim for this profile")
     
-    # Create claim request
+    # Create claim request (same store and shape as /api/claims)
     claim_id = str(ObjectId())
-    PROFILE_CLAIMS[claim_id] = {
+    claim_data = {
         "id": claim_id,
         "person_id": person_id,
-        "person_name": person["name"],
-        "claimer_id": current_user["id"],
-        "claimer_username": current_user["username"],
-        "claimer_email": current_user["email"],
-        "reason": reason,
-        "evidence": evidence,
+        "user_id": current_user["id"],
+        "username": current_user["username"],
+        "verification_method": "other",
+        "message": reason,
+        "verification_proof": evidence,
         "status": "pending",  # pending, approved, rejected
         "created_at": datetime.utcnow(),
         "reviewed_at": None,
-        "reviewed_by": None
+        "reviewed_by": None,
+        "admin_notes": None
     }
+    DATABASE["profile_claims"][claim_id] = claim_data
+    claim_index.add(claim_data)
+    mark_changed("profile_claims", claim_id)
     
     logger.info(f"📋 Profile claim submitted: {person['name']} by {current_user['username']}")
     
@@ -2603,7 +3508,7 @@ async def claim_profile(
     }
 
 @app.post("/api/admin/review-claim/{claim_id}")
-async def review_claim(
+async def review_claim_form(
     claim_id: str,
     action: str = Form(...),  # approve or reject
     notes: Optional[str] = Form(None),
@@ -2614,33 +3519,32 @@ async def review_claim(
     if current_user.get("username") not in ["TechReviewer2024", "ProjectManager_Pro"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    claim = PROFILE_CLAIMS.get(claim_id)
+    claim = DATABASE["profile_claims"].get(claim_id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
     if claim["status"] != "pending":
         raise HTTPException(status_code=400, detail="Claim already reviewed")
     
+    person = DATABASE["persons"].get(claim["person_id"])
+    person_name = person["name"] if person else claim["person_id"]
     if action == "approve":
         # Mark profile as claimed
-        person = DATABASE["persons"].get(claim["person_id"])
-        if person:
-            person["is_claimed"] = True
-            person["claimed_by"] = claim["claimer_id"]
-            person["claimed_at"] = datetime.utcnow()
-        
+        mark_person_claimed(claim)
         claim["status"] = "approved"
-        message = f"Profile claim approved for {claim['person_name']}"
+        message = f"Profile claim approved for {person_name}"
         
     elif action == "reject":
         claim["status"] = "rejected"
-        message = f"Profile claim rejected for {claim['person_name']}"
+        message = f"Profile claim rejected for {person_name}"
     else:
         raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'reject'")
     
     claim["reviewed_at"] = datetime.utcnow()
     claim["reviewed_by"] = current_user["username"]
     claim["admin_notes"] = notes
+    claim_index.update(claim)
+    mark_changed("profile_claims", claim_id)
     
     logger.info(f"Admin {current_user['username']} {action}d claim {claim_id}")
     
@@ -2648,29 +3552,33 @@ async def review_claim(
 
 # Scam Alert API Endpoints
 @app.get("/api/scams")
-async def get_scams(current_user: dict = Depends(lambda: None)):
-    """Get all scam alerts sorted by net votes (upvotes - downvotes)"""
-    scams = list(DATABASE["scams"].values())
-    
-    # Calculate net votes and sort
-    for scam in scams:
-        scam["net_votes"] = scam["upvotes"] - scam["downvotes"]
-        
-        # If user is logged in, include their vote
-        if current_user:
-            user_vote = None
-            for vote in DATABASE["scam_votes"].values():
-                if vote["scam_id"] == scam["id"] and vote["user_id"] == current_user.get("id"):
-                    user_vote = vote["vote_type"]
-                    break
-            scam["user_vote"] = user_vote
-        else:
-            scam["user_vote"] = None
-    
-    # Sort by net votes descending (most upvoted first)
-    scams.sort(key=lambda x: x["net_votes"], reverse=True)
-    
-    return {"scams": scams, "count": len(scams)}
+async def get_scams(
+    sort: str = Query("top", description="top (net votes) or hot (net votes weighted by recency)"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """Get scam alerts, most upvoted first (sort=top) or trending first (sort=hot)"""
+    if sort not in scam_ranking.sorts:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Use one of: {', '.join(scam_ranking.sorts)}")
+    
+    # The ranking is kept sorted as votes come in, so a page costs O(limit)
+    total, scam_ids = scam_ranking.page(sort, offset, limit)
+    # One lookup for the user's votes instead of a scan of scam_votes per scam
+    user_votes = scam_vote_index.user_votes(current_user["id"]) if current_user else {}
+    scams = []
+    for scam_id in scam_ids:
+        scam = DATABASE["scams"][scam_id]
+        scams.append({**scam, "net_votes": scam["upvotes"] - scam["downvotes"], "user_vote": user_votes.get(scam_id)})
+    
+    return FastJSONResponse({
+        "scams": scams,
+        "count": total,
+        "total_votes": scam_ranking.total_votes,
+        "sort": sort,
+        "offset": offset,
+        "limit": limit
+    })
 
 @app.post("/api/scams/{scam_id}/vote")
 async def vote_on_scam(
@@ -2687,60 +3595,19 @@ async def vote_on_scam(
     if vote_type not in ["upvote", "downvote"]:
         raise HTTPException(status_code=400, detail="Invalid vote type. Use 'upvote' or 'downvote'")
     
-    user_id = current_user["id"]
-    
-    # Check if user already voted
-    existing_vote = None
-    vote_key = None
-    for key, vote in DATABASE["scam_votes"].items():
-        if vote["scam_id"] == scam_id and vote["user_id"] == user_id:
-            existing_vote = vote
-            vote_key = key
-            break
-    
-    if existing_vote:
-        old_vote_type = existing_vote["vote_type"]
-        
-        # If same vote type, remove vote (toggle off)
-        if old_vote_type == vote_type:
-            del DATABASE["scam_votes"][vote_key]
-            if vote_type == "upvote":
-                scam["upvotes"] = max(0, scam["upvotes"] - 1)
-            else:
-                scam["downvotes"] = max(0, scam["downvotes"] - 1)
-            return {"message": "Vote removed", "scam": scam}
-        else:
-            # Change vote type
-            existing_vote["vote_type"] = vote_type
-            existing_vote["voted_at"] = datetime.utcnow()
-            
-            # Update counts
-            if vote_type == "upvote":
-                scam["upvotes"] += 1
-                scam["downvotes"] = max(0, scam["downvotes"] - 1)
-            else:
-                scam["downvotes"] += 1
-                scam["upvotes"] = max(0, scam["upvotes"] - 1)
-            
-            return {"message": "Vote changed", "scam": scam}
-    else:
-        # New vote
-        vote_id = str(ObjectId())
-        new_vote = {
-            "id": vote_id,
-            "scam_id": scam_id,
-            "user_id": user_id,
-            "vote_type": vote_type,
-            "voted_at": datetime.utcnow()
-        }
-        DATABASE["scam_votes"][vote_id] = new_vote
-        
-        # Update scam counts
-        if vote_type == "upvote":
-            scam["upvotes"] += 1
-        else:
-            scam["downvotes"] += 1
-        
-        scam["last_updated"] = datetime.utcnow()
-        
-        return {"message": "Vote registered", "scam": scam}
\ No newline at end of file
+    new_vote = {
+        "id": str(ObjectId()),
+        "scam_id": scam_id,
+        "user_id": current_user["id"],
+        "vote_type": vote_type,
+        "voted_at": datetime.utcnow()
+    }
+    # Lookup, vote write and counter update happen under the index lock
+    counts_before = {field: scam[field] for field in ("upvotes", "downvotes")}
+    outcome, vote_id = scam_vote_index.cast(DATABASE["scam_votes"], scam, current_user["id"], vote_type, new_vote)
+    mark_changed("scam_votes", vote_id)
+    mark_changed("scams", scam_id, {field: scam[field] - before for field, before in counts_before.items()})
+    scam_ranking.update(scam)
+    
+    messages = {"registered": "Vote registered", "changed": "Vote changed", "removed": "Vote removed"}
+    return {"message": messages[outcome], "scam": scam}
@@ -0,0 +1,111 @@
+"""
+Moderation Queue for PeopleRate
+Review flags indexed by review, with pending reviews kept in priority order for the admin page
+"""
+
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from sorted_keys import discard, insert, timestamp
+
+PENDING = "pending"
+
+
+class ModerationQueue:
+    """
+    flag_id -> (review_id, status), review_id -> flag ids, and the reviews with pending flags
+    sorted by (most pending reports, oldest pending report). Resolving or dismissing a flag is
+    a dict update plus one re-key of its review in the sorted list.
+    """
+
+    def __init__(self):
+        self._flags: Dict[str, Tuple[str, str, float]] = {}  # flag_id -> (review_id, status, created_at)
+        self._by_review: Dict[str, Dict[str, None]] = {}  # review_id -> flag ids (insertion ordered)
+        self._pending: Dict[str, List[Tuple[float, str]]] = {}  # review_id -> sorted (created_at, flag_id)
+        self._order: List[Tuple[int, float, str]] = []  # (-pending count, oldest created_at, review_id)
+        self._keys: Dict[str, Tuple[int, float, str]] = {}
+        self.pending_count = 0  # pending flags across all reviews
+        self._lock = threading.Lock()
+
+    def add(self, flag: dict) -> None:
+        with self._lock:
+            self._remove(flag["id"])
+            self._add(flag)
+
+    def update(self, flag: dict) -> None:
+        """Apply a status change (pending -> resolved/dismissed) to an indexed flag"""
+        self.add(flag)
+
+    def remove(self, flag_id: str) -> None:
+        with self._lock:
+            self._remove(flag_id)
+
+    def rebuild(self, flags: Iterable[dict]) -> None:
+        with self._lock:
+            self._flags.clear()
+            self._by_review.clear()
+            self._pending.clear()
+            self._order.clear()
+            self._keys.clear()
+            self.pending_count = 0
+            for flag in flags:
+                self._add(flag)
+
+    def flag_ids(self, review_id: str) -> List[str]:
+        with self._lock:
+            return list(self._by_review.get(review_id, ()))
+
+    def top(self, limit: int) -> List[str]:
+        """Up to `limit` pending flag ids, highest-priority review first, oldest flag first within a review"""
+        flag_ids: List[str] = []
+        with self._lock:
+            for _, _, review_id in self._order:
+                flag_ids.extend(flag_id for _, flag_id in self._pending[review_id][:limit - len(flag_ids)])
+                if len(flag_ids) >= limit:
+                    break
+        return flag_ids
+
+    def _add(self, flag: dict) -> None:
+        flag_id, review_id = flag["id"], flag["review_id"]
+        status = flag.get("status", PENDING)
+        created_at = timestamp(flag.get("created_at"))
+        self._flags[flag_id] = (review_id, status, created_at)
+        self._by_review.setdefault(review_id, {})[flag_id] = None
+        if status == PENDING:
+            self._unqueue(review_id)
+            insert(self._pending.setdefault(review_id, []), (created_at, flag_id))
+            self.pending_count += 1
+            self._queue(review_id)
+
+    def _remove(self, flag_id: str) -> None:
+        entry = self._flags.pop(flag_id, None)
+        if entry is None:
+            return
+        review_id, status, created_at = entry
+        flags = self._by_review[review_id]
+        del flags[flag_id]
+        if not flags:
+            del self._by_review[review_id]
+        if status == PENDING:
+            self._unqueue(review_id)
+            pending = self._pending[review_id]
+            discard(pending, (created_at, flag_id))
+            self.pending_count -= 1
+            if pending:
+                self._queue(review_id)
+            else:
+                del self._pending[review_id]
+
+    def _queue(self, review_id: str) -> None:
+        pending = self._pending[review_id]
+        key = (-len(pending), pending[0][0], review_id)
+        insert(self._order, key)
+        self._keys[review_id] = key
+
+    def _unqueue(self, review_id: str) -> None:
+        key = self._keys.pop(review_id, None)
+        if key is not None:
+            discard(self._order, key)
+
+
+moderation_queue = ModerationQueue()
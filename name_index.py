@@ -0,0 +1,187 @@
+"""
+Fuzzy Name Index for PeopleRate
+Character-trigram index over the words of person names and companies for typo-tolerant search
+("Sasikla" -> "Sasikala", "Ramesh Kumaar" -> "Ramesh Kumar")
+"""
+
+import heapq
+import re
+import threading
+from math import ceil
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+FIELDS = ("name", "company")
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in _NON_WORD.split(text.lower()) if word]
+
+
+def word_trigrams(word: str) -> FrozenSet[str]:
+    """Trigrams of one word, padded like pg_trgm: two spaces in front, one behind"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class NameIndex:
+    """
+    Trigrams index the distinct words of names and companies, not the persons: a directory of
+    millions has far fewer distinct name words, and that vocabulary grows much slower than the
+    directory. Query words are matched against the vocabulary, then mapped to persons.
+
+    Word candidates come from prefix filtering: a word with Jaccard similarity >= t shares at
+    least ceil(t * |q|) of the query word's |q| trigrams, so it must contain one of the
+    |q| - ceil(t * |q|) + 1 rarest ones. Only those posting lists are read.
+    """
+
+    def __init__(self):
+        self._grams: Dict[str, Dict[str, None]] = {}  # trigram -> words
+        self._word_grams: Dict[str, FrozenSet[str]] = {}
+        self._persons: Dict[str, Dict[str, None]] = {}  # word -> person ids
+        self._entries: Dict[str, Tuple[Tuple[str, ...], ...]] = {}  # person id -> words per field
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._word_grams)
+
+    def add(self, person: dict) -> None:
+        with self._lock:
+            self._remove(person["id"])
+            self._add(person["id"], self._fields(person))
+
+    def update(self, person: dict) -> None:
+        """Re-index a person if its name or company changed"""
+        fields = self._fields(person)
+        with self._lock:
+            if self._entries.get(person["id"]) == fields:
+                return
+            self._remove(person["id"])
+            self._add(person["id"], fields)
+
+    def remove(self, person_id: str) -> None:
+        with self._lock:
+            self._remove(person_id)
+
+    def rebuild(self, persons: Iterable[dict]) -> None:
+        with self._lock:
+            self._grams.clear()
+            self._word_grams.clear()
+            self._persons.clear()
+            self._entries.clear()
+            for person in persons:
+                self._add(person["id"], self._fields(person))
+
+    def similar(self, query: str, threshold: float = 0.35, limit: int = 200) -> Dict[str, float]:
+        """
+        person id -> similarity (0-1) for the `limit` best persons at or above the threshold.
+        A person's similarity is the mean, over the query's words, of the best match among
+        the words of its name and company.
+        """
+        query_words = list(dict.fromkeys(_words(query)))
+        if not query_words:
+            return {}
+        count = len(query_words)
+
+        with self._lock:
+            groups = []  # per query word: matching words, most similar first
+            for word in query_words:
+                ranked = sorted(self._similar_words(word, threshold).items(), key=lambda item: -item[1])
+                groups.append((sum(len(self._persons[match]) for match, _ in ranked), ranked))
+            # The query word matching the most persons (usually a common first name) is never
+            # scanned: persons found through the other words are looked up in it instead
+            order = sorted(range(count), key=lambda position: groups[position][0])
+            largest = order[-1]
+
+            best: Dict[str, List[float]] = {}
+            for position in order[:-1]:
+                for word, similarity in groups[position][1]:
+                    for person_id in self._persons[word]:
+                        scores = best.get(person_id)
+                        if scores is None:
+                            scores = best[person_id] = [0.0] * count
+                        if similarity > scores[position]:
+                            scores[position] = similarity
+            for person_id, scores in best.items():
+                for word, similarity in groups[largest][1]:
+                    if person_id in self._persons[word]:
+                        scores[largest] = similarity
+                        break
+            totals = {person_id: sum(scores) / count for person_id, scores in best.items()}
+
+            # Persons matching only that word score similarity / count; add the most similar
+            # until they could no longer make the top `limit`
+            leaders = heapq.nlargest(limit, totals.values())
+            cutoff = leaders[-1] if len(leaders) >= limit else 0.0
+            added = 0
+            for word, similarity in groups[largest][1]:
+                score = similarity / count
+                if score < threshold or score <= cutoff or added >= limit:
+                    break
+                for person_id in self._persons[word]:
+                    if person_id not in totals:
+                        totals[person_id] = score
+                        added += 1
+                        if added >= limit:
+                            break
+
+        top = heapq.nlargest(limit, ((score, person_id) for person_id, score in totals.items() if score >= threshold))
+        return {person_id: score for score, person_id in top}
+
+    @staticmethod
+    def _fields(person: dict) -> Tuple[Tuple[str, ...], ...]:
+        return tuple(tuple(_words(person.get(field) or "")) for field in FIELDS)
+
+    def _similar_words(self, word: str, threshold: float) -> Dict[str, float]:
+        query_grams = word_trigrams(word)
+        needed = max(1, ceil(threshold * len(query_grams)))
+        probes = sorted(query_grams, key=lambda gram: len(self._grams.get(gram, ())))
+        candidates = set()
+        for gram in probes[:len(query_grams) - needed + 1]:
+            candidates.update(self._grams.get(gram, ()))
+
+        similar = {}
+        for candidate in candidates:
+            grams = self._word_grams[candidate]
+            shared = len(query_grams & grams)
+            similarity = shared / (len(query_grams) + len(grams) - shared)
+            if similarity >= threshold:
+                similar[candidate] = similarity
+        return similar
+
+    def _add(self, person_id: str, fields: Tuple[Tuple[str, ...], ...]) -> None:
+        words = {word for field in fields for word in field}
+        if not words:
+            return
+        self._entries[person_id] = fields
+        for word in words:
+            persons = self._persons.get(word)
+            if persons is None:
+                persons = self._persons[word] = {}
+                grams = self._word_grams[word] = word_trigrams(word)
+                for gram in grams:
+                    self._grams.setdefault(gram, {})[word] = None
+            persons[person_id] = None
+
+    def _remove(self, person_id: str) -> None:
+        fields = self._entries.pop(person_id, None)
+        if fields is None:
+            return
+        for word in {word for field in fields for word in field}:
+            persons = self._persons[word]
+            del persons[person_id]
+            if persons:
+                continue
+            del self._persons[word]
+            for gram in self._word_grams.pop(word):
+                words = self._grams[gram]
+                del words[word]
+                if not words:
+                    del self._grams[gram]
+
+
+name_index = NameIndex()
@@ -7,6 +7,16 @@ import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from geo_index import find_area
+from identifier_index import canonical_email, canonical_phone, identifiers
+
+
+def _words(text: str) -> set:
+    """Lowercase words of a text with a plural "s" dropped ("Electricians" -> "electrician")"""
+    return {word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+            for word in re.findall(r"[a-z0-9]+", text.lower())}
+
+
 class NLPProcessor:
     """Advanced NLP processor for parsing natural language search and person creation"""
     
@@ -93,6 +103,9 @@ class NLPProcessor:
             "experience_years": None,
             "email": None,
             "phone": None,
+            "area": None,
+            "area_explicit": False,
+            "name_with_area": None,
             "original_query": query
         }
         
@@ -108,29 +121,21 @@ class NLPProcessor:
             result["phone"] = phone_match.group()
             query_lower = query_lower.replace(phone_match.group(), "")
         
-        # Extract name (usually first word or first few words before job/location indicators)
-        words = query_lower.split()
-        if words:
-            # Try to get name (first 1-3 words before keywords)
-            name_parts = []
-            for i, word in enumerate(words):
-                if i >= 3:  # Max 3 words for name
-                    break
-                if word in ["who", "is", "in", "at", "from", "with", "the", "a", "an"]:
-                    break
-                # Check if it's not a job title or industry keyword
-                is_keyword = False
-                for title in self.job_titles:
-                    if title in word:
-                        is_keyword = True
-                        break
-                if not is_keyword:
-                    name_parts.append(word)
-                else:
-                    break
-            
-            if name_parts:
-                result["name"] = " ".join(name_parts)
+        # Extract Bengaluru area ("electrician near Indiranagar") so it isn't read as a name or city.
+        # Only "near/in/... <area>" is surely a place; a bare alias may be part of a business name
+        # ("Majestic Tailors"), so the name is also kept with it for the search to decide.
+        area_match = find_area(query_lower)
+        if area_match:
+            area, start, end = area_match
+            result["area"] = area
+            before = query_lower[:start].rstrip()
+            without_preposition = re.sub(r'\b(near|in|around|at|close to|next to)\s*$', "", before)
+            result["area_explicit"] = without_preposition != before
+            if not result["area_explicit"]:
+                result["name_with_area"] = self._extract_name(query_lower)
+            query_lower = f"{without_preposition} {query_lower[end:]}".strip()
+        
+        result["name"] = self._extract_name(query_lower)
         
         # Extract industry
         for industry, keywords in self.industries.items():
@@ -283,6 +288,20 @@ class NLPProcessor:
         
         return parsed
     
+    def _extract_name(self, text: str) -> Optional[str]:
+        """Name: the first 1-3 words, up to a stop word or job title keyword"""
+        name_parts = []
+        for i, word in enumerate(text.split()):
+            if i >= 3:  # Max 3 words for name
+                break
+            if word in ["who", "is", "in", "at", "from", "with", "the", "a", "an"]:
+                break
+            # Check if it's not a job title or industry keyword
+            if any(title in word for title in self.job_titles):
+                break
+            name_parts.append(word)
+        return " ".join(name_parts) if name_parts else None
+    
     def _get_indian_state(self, city: str) -> str:
         """Get Indian state for a city"""
         city_state_map = {
@@ -332,10 +351,17 @@ class NLPProcessor:
         }
         return city_state_map.get(city.lower(), "")
     
-    def generate_search_score(self, person: Dict, parsed_query: Dict) -> float:
+    def generate_search_score(self, person: Dict, parsed_query: Dict, name_similarity: float = 0.0,
+                              phonetic_match: float = 0.0, proximity: float = 0.0) -> float:
         """
         Generate relevance score for a person based on parsed query
         Higher score = better match
+
+        name_similarity is the fuzzy (trigram) similarity of the query name to the person's
+        name or company, 0-1, from name_index; phonetic_match is the share of the query name's
+        words that sound like the person's, 0-1, from phonetic_index. Both only count when the
+        name is not a substring. proximity is 1 at the centre of the queried area, falling to 0 at
+        the search radius
         """
         score = 0.0
         
@@ -345,8 +371,20 @@ class NLPProcessor:
             name_person = person["name"].lower()
             if name_query in name_person or name_person in name_query:
                 score += 100
-            elif any(part in name_person for part in name_query.split()):
-                score += 50
+            else:
+                partial = 50 if any(part in name_person for part in name_query.split()) else 0
+                # Typos and spelling variants outrank a single matching word, never an exact match
+                score += max(partial, round(90 * name_similarity, 1), round(80 * phonetic_match, 1))
+        
+        # Category match: in "electrician near Indiranagar" the name words are a trade. Whole
+        # words only (plurals folded), so a fragment like "air" doesn't match "AC Repair".
+        if parsed_query.get("name") and person.get("category"):
+            if _words(parsed_query["name"]) & _words(person["category"]):
+                score += 40
+        
+        # Area proximity
+        if parsed_query.get("area"):
+            score += round(40 * proximity, 1)
         
         # Industry match
         if parsed_query.get("industry") and person.get("industry"):
@@ -383,13 +421,13 @@ class NLPProcessor:
             if exp_diff <= 2:
                 score += 15
         
-        # Email/Phone exact match (highest priority)
-        if parsed_query.get("email") and person.get("email"):
-            if parsed_query["email"].lower() == person["email"].lower():
+        # Email/Phone exact match (highest priority), compared in canonical form so
+        # "+91 98450 12345" finds "9845012345"; WhatsApp numbers count as phones
+        if parsed_query.get("email") or parsed_query.get("phone"):
+            person_identifiers = identifiers(person)
+            if parsed_query.get("email") and canonical_email(parsed_query["email"]) in person_identifiers:
                 score += 150
-        
-        if parsed_query.get("phone") and person.get("phone"):
-            if parsed_query["phone"] in person["phone"]:
+            if parsed_query.get("phone") and canonical_phone(parsed_query["phone"]) in person_identifiers:
                 score += 150
         
         # Boost by rating and review count
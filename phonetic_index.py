@@ -0,0 +1,112 @@
+"""
+Phonetic Name Matching for PeopleRate
+Phonetic keys tuned for romanized Indian names (Srinivas/Shrinivas/Sreenivas, Lakshmi/Laxmi,
+Venkatesh/Venkatesha, Geetha/Gita) and an index from key to persons
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List
+
+_NON_LETTER = re.compile(r"[^a-z]+")
+
+# Applied in order: sibilant and aspirate spellings collapse (ksh/x, sh/s, bh/b, th/t ...), then
+# doubled letters (ee/i, tt/t). Vowels after the first letter are dropped in phonetic_key.
+_RULES = [
+    (re.compile(r"ksh|x"), "ks"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"ch"), "c"),
+    (re.compile(r"([bdgjkpt])h"), r"\1"),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"c(?!h)"), "k"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"(?<=[^aeiou])h|h$"), ""),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+_VOWELS = re.compile(r"[aeiouy]")
+
+
+def phonetic_key(word: str) -> str:
+    """Key for one name word; spellings of the same spoken name share it"""
+    word = _NON_LETTER.sub("", word.lower())
+    if not word:
+        return ""
+    for pattern, replacement in _RULES:
+        word = pattern.sub(replacement, word)
+    # The first letter keeps its vowel (Anil vs Nil); later vowels vary too much in transliteration
+    return word[0] + _VOWELS.sub("", word[1:])
+
+
+def phonetic_keys(name: str) -> List[str]:
+    """Distinct phonetic keys of a name's words, in order"""
+    keys = []
+    for word in (name or "").split():
+        key = phonetic_key(word)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+class PhoneticIndex:
+    """phonetic key -> person ids; each person's keys live here, not on the record"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, None]] = {}
+        self._entries: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, person: dict) -> None:
+        with self._lock:
+            self._remove(person["id"])
+            self._add(person)
+
+    def update(self, person: dict) -> None:
+        """Re-index a person if its name (and so its keys) changed"""
+        with self._lock:
+            if self._entries.get(person["id"]) == phonetic_keys(person.get("name")):
+                return
+            self._remove(person["id"])
+            self._add(person)
+
+    def remove(self, person_id: str) -> None:
+        with self._lock:
+            self._remove(person_id)
+
+    def rebuild(self, persons: Iterable[dict]) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._entries.clear()
+            for person in persons:
+                self._add(person)
+
+    def matches(self, name: str) -> Dict[str, float]:
+        """person id -> fraction of the query name's words that sound like one of the person's"""
+        keys = phonetic_keys(name)
+        if not keys:
+            return {}
+        found: Dict[str, int] = {}
+        with self._lock:
+            for key in keys:
+                for person_id in self._postings.get(key, ()):
+                    found[person_id] = found.get(person_id, 0) + 1
+        return {person_id: count / len(keys) for person_id, count in found.items()}
+
+    def _add(self, person: dict) -> None:
+        keys = phonetic_keys(person.get("name"))
+        if not keys:
+            return
+        self._entries[person["id"]] = keys
+        for key in keys:
+            self._postings.setdefault(key, {})[person["id"]] = None
+
+    def _remove(self, person_id: str) -> None:
+        for key in self._entries.pop(person_id, ()):
+            posting = self._postings[key]
+            del posting[person_id]
+            if not posting:
+                del self._postings[key]
+
+
+phonetic_index = PhoneticIndex()
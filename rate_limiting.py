@@ -0,0 +1,330 @@
+"""
+Rate Limiting for PeopleRate
+Key function and storage backends for slowapi/limits with the sliding-window-counter strategy
+
+    sliding-memory://            per-process dict, no background timer threads
+    sqlite:///data/limits.db     one SQLite file shared by every worker on the host
+
+Importing this module registers both URI schemes with limits.
+"""
+
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+from typing import Dict, List, Optional, Tuple
+
+from limits import parse_many
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+SWEEP_EVERY = 1000  # operations between purges of expired counters
+
+
+def client_ip(request) -> str:
+    """Rate-limit key: the client address (same as slowapi's get_remote_address)"""
+    return request.client.host if request.client else "127.0.0.1"
+
+
+# slowapi runs inspect.signature(key_func) on every hit; a precomputed signature makes that cheap
+client_ip.__signature__ = inspect.signature(client_ip)
+
+
+def _sliding_window_info(
+    previous_count: int, current_count: int, expiry: int, now: float
+) -> Tuple[int, float, int, float]:
+    """(previous count, previous ttl, current count, current ttl) as limits expects them"""
+    previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+    current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+    return previous_count, previous_ttl, current_count, current_ttl
+
+
+class SlidingWindowMemoryStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    In-process counters: key -> [count, expires_at]
+    Expired counters are dropped lazily and swept every SWEEP_EVERY operations, instead of the
+    timer thread limits' MemoryStorage restarts on every hit.
+    """
+
+    STORAGE_SCHEME = ["sliding-memory"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        self._counters: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._operations = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return ValueError
+
+    def _live(self, key: str, now: float) -> Optional[List[float]]:
+        entry = self._counters.get(key)
+        if entry is not None and entry[1] <= now:
+            del self._counters[key]
+            return None
+        return entry
+
+    def _incr(self, key: str, expiry: float, amount: int, now: float) -> int:
+        entry = self._live(key, now)
+        if entry is None:
+            entry = self._counters[key] = [0, now + expiry]
+        entry[0] += amount
+
+        self._operations += 1
+        if self._operations % SWEEP_EVERY == 0:
+            expired = [k for k, (_, expires_at) in self._counters.items() if expires_at <= now]
+            for k in expired:
+                del self._counters[k]
+        return int(entry[0])
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        with self._lock:
+            return self._incr(key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            entry = self._live(key, time.time())
+            return int(entry[0]) if entry else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._lock:
+            entry = self._live(key, now)
+            return entry[1] if entry else now
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            count = len(self._counters)
+            self._counters.clear()
+            return count
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        # Check and increment under one lock, so no over-admission to roll back
+        with self._lock:
+            previous = self._live(previous_key, now)
+            current = self._live(current_key, now)
+            previous_count, previous_ttl, current_count, _ = _sliding_window_info(
+                int(previous[0]) if previous else 0, int(current[0]) if current else 0, expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            self._incr(current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._lock:
+            previous = self._live(previous_key, now)
+            current = self._live(current_key, now)
+            return _sliding_window_info(
+                int(previous[0]) if previous else 0, int(current[0]) if current else 0, expiry, now
+            )
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        with self._lock:
+            self._counters.pop(previous_key, None)
+            self._counters.pop(current_key, None)
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Counters in a SQLite file (WAL mode) so all workers on a host enforce one shared limit
+    URI follows the SQLAlchemy convention: sqlite:///relative/path.db or sqlite:////absolute/path.db
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        path = (uri or "sqlite:///data/rate_limits.db")[len("sqlite:///"):]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")  # counters are disposable
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+        self._operations = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _count(self, key: str, now: float) -> int:
+        row = self._conn.execute(
+            "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _incr(self, key: str, expiry: float, amount: int, now: float) -> int:
+        count = self._conn.execute(
+            "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "count = CASE WHEN expires_at > ? THEN count + excluded.count ELSE excluded.count END, "
+            "expires_at = CASE WHEN expires_at > ? THEN expires_at ELSE excluded.expires_at END "
+            "RETURNING count",
+            (key, amount, now + expiry, now, now)
+        ).fetchone()[0]
+        self._operations += 1
+        if self._operations % SWEEP_EVERY == 0:
+            self._conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return count
+
+    def _transaction(self, work):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(time.time())
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._transaction(lambda now: self._incr(key, expiry, amount, now))
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._count(key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            return self._conn.execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        def acquire(now: float) -> bool:
+            previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+            previous_count, previous_ttl, current_count, _ = _sliding_window_info(
+                self._count(previous_key, now), self._count(current_key, now), expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            self._incr(current_key, 2 * expiry, amount, now)
+            return True
+
+        return self._transaction(acquire)
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._lock:
+            return _sliding_window_info(
+                self._count(previous_key, now), self._count(current_key, now), expiry, now
+            )
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits WHERE key IN (?, ?)", (previous_key, current_key))
+
+
+class DefaultLimitMiddleware:
+    """
+    ASGI middleware applying the default limit to API requests without a route-specific limit,
+    and a route's own @limiter.limit to requests for it. The latter is checked here rather than
+    only in the decorator so responses served before the router (the response cache) still
+    count; the decorator then sees _rate_limiting_complete and doesn't count the request again.
+    Both are slowapi internals, hence the pinned version and tests/test_rate_limiting.py.
+    slowapi's own middleware matches the path against every route on each request (~75 µs with
+    this app's routes); this one only tests the few routes that carry a @limiter.limit.
+    """
+
+    def __init__(self, app, limiter, limit: str, prefix: str = "/api/"):
+        self.app = app
+        self.limiter = limiter
+        self.limit_items = parse_many(limit) if limit else []
+        self.prefix = prefix
+        self._decorated_routes = None
+
+    def _own_limit_route(self, scope):
+        """The matching route with a @limiter.limit, if any"""
+        if self._decorated_routes is None:
+            route_limits = self.limiter._route_limits
+            self._decorated_routes = [
+                route for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+                and f"{route.endpoint.__module__}.{route.endpoint.__name__}" in route_limits
+            ]
+        return next((route for route in self._decorated_routes if route.matches(scope)[0] == Match.FULL), None)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.limiter.enabled or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        route = self._own_limit_route(scope)
+        if route is not None:
+            request = Request(scope, receive)
+            try:
+                # Same counters as the decorator; view_rate_limit lands in scope["state"] for its headers
+                self.limiter._check_request_limit(request, route.endpoint, False)
+            except RateLimitExceeded as e:
+                response = _rate_limit_exceeded_handler(request, e)
+                await response(scope, receive, send)
+                return
+            request.state._rate_limiting_complete = True
+            await self.app(scope, receive, send)
+            return
+        if not self.limit_items:
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["client"][0] if scope.get("client") else "127.0.0.1"
+        for item in self.limit_items:
+            if not self.limiter.limiter.hit(item, key, "default"):
+                reset_at = self.limiter.limiter.get_window_stats(item, key, "default").reset_time
+                response = JSONResponse(
+                    {"error": f"Rate limit exceeded: {item}"},
+                    status_code=429,
+                    headers={"Retry-After": str(max(1, int(reset_at - time.time())))}
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,237 @@
+"""
+HTTP Response Cache for PeopleRate
+ETag/Cache-Control middleware for public read-heavy endpoints
+
+ETags are derived from per-entity change counters, so a conditional request
+can be answered with 304 before the route handler runs.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeCounters:
+    """Monotonic version counters per collection and per record"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Changes on restart so ETags from a previous process never validate
+        self.epoch = secrets.token_hex(4)
+
+    def bump(self, collection: str, key: Optional[str] = None) -> None:
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+            if key is not None:
+                record = f"{collection}:{key}"
+                self._versions[record] = self._versions.get(record, 0) + 1
+
+    def version(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+
+change_counters = ChangeCounters()
+
+
+class CachePolicy:
+    """Caching rules for one GET route"""
+
+    def __init__(
+        self,
+        path: str,
+        depends_on: Callable[[dict], List[str]],
+        ttl: int = 30,
+        stale_while_revalidate: int = 60
+    ):
+        self.path = path
+        # "/api/persons/{person_id}" -> named regex groups passed to depends_on
+        self.pattern = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path) + "$")
+        self.depends_on = depends_on
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def match(self, path: str) -> Optional[dict]:
+        found = self.pattern.match(path)
+        return found.groupdict() if found else None
+
+    @property
+    def cache_control(self) -> str:
+        if not self.stale_while_revalidate:
+            # Browsers would otherwise reuse their copy for ttl seconds without asking;
+            # no-cache makes them revalidate every time, which is a cheap 304 when unchanged
+            return "public, no-cache"
+        return f"public, max-age={self.ttl}, stale-while-revalidate={self.stale_while_revalidate}"
+
+
+class CachedResponse:
+    __slots__ = ("etag", "status", "headers", "body", "stored_at")
+
+    def __init__(self, etag: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.etag = etag
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = time.monotonic()
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware that serves matching anonymous GET requests from memory
+    - If-None-Match equal to the current ETag -> 304, handler not called
+    - fresh entry (same ETag, younger than ttl) -> served from memory
+    - expired entry within the stale-while-revalidate window -> served as-is
+      (outdated ETag included) and refreshed in the background
+    - anything else, e.g. an outdated ETag before the ttl runs out -> handler
+
+    Routes where a client must see its own writes immediately should use
+    stale_while_revalidate=0: an outdated entry is then never served, and
+    clients are sent Cache-Control: no-cache so they revalidate every time.
+    """
+
+    # Headers recomputed per response instead of replayed from the cache
+    SKIP_HEADERS = {b"content-length", b"etag", b"cache-control", b"x-cache"}
+
+    def __init__(self, app, policies: List[CachePolicy], counters: ChangeCounters = change_counters,
+                 max_entries: int = 512):
+        self.app = app
+        self.policies = policies
+        self.counters = counters
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        # Responses for signed-in users may be personalised - never share them
+        if b"authorization" in headers:
+            await self.app(scope, receive, send)
+            return
+
+        policy, params = self._find_policy(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+        # Cache hits never reach the router; this lets outer middleware label them by route
+        scope["cache_route"] = policy.path
+
+        cache_key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        etag = self._etag(cache_key, policy, params)
+
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+        client_tags = [tag.strip() for tag in if_none_match.split(",")] if if_none_match else []
+        if etag in client_tags:
+            await self._send(send, 304, [], b"", etag, policy, "HIT")
+            return
+
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if entry.etag == etag and age < policy.ttl:
+                self._entries.move_to_end(cache_key)
+                await self._send(send, entry.status, entry.headers, entry.body, entry.etag, policy, "HIT")
+                return
+            if policy.stale_while_revalidate > 0 and policy.ttl <= age < policy.ttl + policy.stale_while_revalidate:
+                # Serve what we have under its own ETag and refresh for the next caller
+                if cache_key not in self._refreshing:
+                    self._refreshing[cache_key] = asyncio.create_task(self._refresh(scope, cache_key, etag))
+                if entry.etag in client_tags:
+                    await self._send(send, 304, [], b"", entry.etag, policy, "STALE")
+                else:
+                    await self._send(send, entry.status, entry.headers, entry.body, entry.etag, policy, "STALE")
+                return
+
+        status, response_headers, body = await self._run_handler(scope, receive)
+        if status == 200:
+            self._store(cache_key, CachedResponse(etag, status, response_headers, body))
+            await self._send(send, status, response_headers, body, etag, policy, "MISS")
+        else:
+            await self._send_raw(send, status, response_headers, body)
+
+    def _find_policy(self, path: str):
+        for policy in self.policies:
+            params = policy.match(path)
+            if params is not None:
+                return policy, params
+        return None, None
+
+    def _etag(self, cache_key: str, policy: CachePolicy, params: dict) -> str:
+        versions = ",".join(
+            f"{name}={self.counters.version(name)}" for name in policy.depends_on(params)
+        )
+        digest = hashlib.blake2b(
+            f"{self.counters.epoch}|{cache_key}|{versions}".encode("utf-8"), digest_size=12
+        ).hexdigest()
+        return f'W/"{digest}"'
+
+    async def _run_handler(self, scope, receive):
+        """Call the wrapped app and buffer its response"""
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks = []
+
+        async def capture(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in self.SKIP_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        return status, response_headers, b"".join(chunks)
+
+    async def _refresh(self, scope, cache_key: str, etag: str):
+        try:
+            refresh_scope = dict(scope)
+            refresh_scope["headers"] = [
+                (name, value) for name, value in scope["headers"] if name != b"if-none-match"
+            ]
+
+            async def empty_receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            status, response_headers, body = await self._run_handler(refresh_scope, empty_receive)
+            if status == 200:
+                self._store(cache_key, CachedResponse(etag, status, response_headers, body))
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {cache_key}: {e}")
+        finally:
+            self._refreshing.pop(cache_key, None)
+
+    def _store(self, cache_key: str, entry: CachedResponse) -> None:
+        self._entries[cache_key] = entry
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _send(self, send, status, headers, body, etag, policy: CachePolicy, cache_state: str):
+        headers = list(headers) + [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", policy.cache_control.encode("latin-1")),
+            (b"x-cache", cache_state.encode("latin-1"))
+        ]
+        await self._send_raw(send, status, headers, body)
+
+    @staticmethod
+    async def _send_raw(send, status, headers, body):
+        headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+        if status != 304:
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body if status != 304 else b""})
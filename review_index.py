@@ -0,0 +1,164 @@
+"""
+Per-Person Review Index for PeopleRate
+Ordered review lists and precomputed rating summaries, maintained at write time
+"""
+
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from sorted_keys import discard, insert, timestamp
+
+DIMENSIONS = ("work_quality", "communication", "reliability", "professionalism")
+
+
+# Sort name -> key function. Lists are kept ascending, so "best first" keys are negated.
+SORT_KEYS = {
+    "newest": lambda r: (-timestamp(r.get("created_at")), r["id"]),
+    "highest": lambda r: (-r.get("rating", 0), -timestamp(r.get("created_at")), r["id"]),
+    "helpful": lambda r: (-r.get("helpful_count", 0), -timestamp(r.get("created_at")), r["id"]),
+    "verified": lambda r: (0 if r.get("is_verified") else 1, -timestamp(r.get("created_at")), r["id"]),
+}
+
+
+class PersonSummary:
+    """Rating histogram and per-dimension totals for one person"""
+
+    __slots__ = ("count", "histogram", "dimension_totals", "dimension_counts", "recommend_yes",
+                 "recommend_answers", "verified")
+
+    def __init__(self):
+        self.count = 0
+        self.histogram = {star: 0 for star in range(1, 6)}
+        self.dimension_totals = {dim: 0 for dim in DIMENSIONS}
+        self.dimension_counts = {dim: 0 for dim in DIMENSIONS}
+        self.recommend_yes = 0
+        self.recommend_answers = 0
+        self.verified = 0
+
+    def apply(self, review: dict, sign: int) -> None:
+        self.count += sign
+        rating = review.get("rating")
+        if rating in self.histogram:
+            self.histogram[rating] += sign
+        for dim in DIMENSIONS:
+            value = review.get(dim)
+            if value:
+                self.dimension_totals[dim] += sign * value
+                self.dimension_counts[dim] += sign
+        if review.get("would_recommend") is not None:
+            self.recommend_answers += sign
+            if review["would_recommend"]:
+                self.recommend_yes += sign
+        if review.get("is_verified"):
+            self.verified += sign
+
+    def as_dict(self) -> dict:
+        total_rating = sum(star * count for star, count in self.histogram.items())
+        return {
+            "review_count": self.count,
+            "average_rating": round(total_rating / self.count, 1) if self.count else 0.0,
+            "rating_histogram": {str(star): count for star, count in self.histogram.items()},
+            "dimension_averages": {
+                dim: round(self.dimension_totals[dim] / self.dimension_counts[dim], 1)
+                if self.dimension_counts[dim] else None
+                for dim in DIMENSIONS
+            },
+            "recommend_percentage": round(self.recommend_yes / self.recommend_answers * 100)
+            if self.recommend_answers else None,
+            "verified_count": self.verified
+        }
+
+
+class PersonReviewIndex:
+    """person_id -> sorted review lists per sort order, plus a PersonSummary"""
+
+    def __init__(self):
+        self._orders: Dict[str, Dict[str, List[Tuple]]] = {}
+        self._summaries: Dict[str, PersonSummary] = {}
+        # person_id -> {reviewer_id: number of their reviews}, for responses that embed reviewer fields
+        self._reviewers: Dict[str, Dict[str, int]] = {}
+        # review_id -> (person_id, {sort: key}, review fields the summary counted, reviewer_id)
+        self._entries: Dict[str, Tuple[str, Dict[str, Tuple], dict, str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, review: dict) -> None:
+        with self._lock:
+            self._add(review)
+
+    def remove(self, review_id: str) -> None:
+        with self._lock:
+            self._remove(review_id)
+
+    def update(self, review: dict) -> None:
+        """Re-key a review after rating, verification or helpful_count changed"""
+        with self._lock:
+            self._remove(review["id"])
+            self._add(review)
+
+    def rebuild(self, reviews: Iterable[dict]) -> None:
+        with self._lock:
+            self._orders.clear()
+            self._summaries.clear()
+            self._reviewers.clear()
+            self._entries.clear()
+            for review in reviews:
+                self._add(review)
+
+    def page(self, person_id: str, sort: str, offset: int, limit: int) -> Tuple[int, List[str]]:
+        """Return (total, review ids) for one page in the requested order"""
+        with self._lock:
+            ordered = self._orders.get(person_id, {}).get(sort, [])
+            return len(ordered), [key[-1] for key in ordered[offset:offset + limit]]
+
+    def review_ids(self, person_id: str, sort: str = "newest") -> List[str]:
+        """All of a person's review ids in the requested order"""
+        with self._lock:
+            return [key[-1] for key in self._orders.get(person_id, {}).get(sort, [])]
+
+    def reviewers(self, person_id: str) -> List[str]:
+        """Distinct reviewer ids of a person's reviews, sorted"""
+        with self._lock:
+            return sorted(self._reviewers.get(person_id, ()))
+
+    def reviewed_by(self, person_id: str, reviewer_id: str) -> bool:
+        with self._lock:
+            return reviewer_id in self._reviewers.get(person_id, ())
+
+    def summary(self, person_id: str) -> dict:
+        with self._lock:
+            return self._summaries.get(person_id, PersonSummary()).as_dict()
+
+    def _add(self, review: dict) -> None:
+        if review["id"] in self._entries:
+            self._remove(review["id"])
+
+        person_id = review["person_id"]
+        orders = self._orders.setdefault(person_id, {sort: [] for sort in SORT_KEYS})
+        keys = {}
+        for sort, key_func in SORT_KEYS.items():
+            keys[sort] = key_func(review)
+            insert(orders[sort], keys[sort])
+
+        counted = {field: review.get(field) for field in ("rating", "would_recommend", "is_verified") + DIMENSIONS}
+        self._summaries.setdefault(person_id, PersonSummary()).apply(counted, 1)
+        reviewers = self._reviewers.setdefault(person_id, {})
+        reviewers[review.get("reviewer_id")] = reviewers.get(review.get("reviewer_id"), 0) + 1
+        self._entries[review["id"]] = (person_id, keys, counted, review.get("reviewer_id"))
+
+    def _remove(self, review_id: str) -> None:
+        entry = self._entries.pop(review_id, None)
+        if entry is None:
+            return
+
+        person_id, keys, counted, reviewer_id = entry
+        orders = self._orders[person_id]
+        for sort, key in keys.items():
+            discard(orders[sort], key)
+        self._summaries[person_id].apply(counted, -1)
+        reviewers = self._reviewers[person_id]
+        reviewers[reviewer_id] -= 1
+        if not reviewers[reviewer_id]:
+            del reviewers[reviewer_id]
+
+
+person_review_index = PersonReviewIndex()
@@ -0,0 +1,94 @@
+"""
+Scam Feed Ranking for PeopleRate
+Sorted scam orderings ("top" by net votes, time-decayed "hot"), updated per vote instead of per request
+"""
+
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sorted_keys import discard, insert, timestamp
+
+HOT_EPOCH = datetime(2024, 1, 1).timestamp()
+
+
+def hot_score(net_votes: int, reported_at: float, decay_seconds: float) -> float:
+    """
+    Recency-weighted score: every decay_seconds of age costs as much as a 10x drop in net votes
+    Newer scams get a larger constant instead of older ones losing score over time, so the key
+    never changes while nobody votes and the order can be kept incrementally.
+    """
+    magnitude = math.log10(max(abs(net_votes), 1))
+    sign = 1 if net_votes > 0 else -1 if net_votes < 0 else 0
+    return sign * magnitude + (reported_at - HOT_EPOCH) / decay_seconds
+
+
+class ScamRanking:
+    """Scam ids kept sorted for each feed order, plus the vote total shown on the scam-alert page"""
+
+    def __init__(self, hot_decay_seconds: float = 72 * 3600):
+        self.hot_decay_seconds = hot_decay_seconds
+        # Lists are kept ascending, so "best first" keys are negated
+        self._key_funcs: Dict[str, Callable[[dict], Tuple]] = {
+            "top": lambda s: (-(s["upvotes"] - s["downvotes"]), -timestamp(s.get("reported_date")), s["id"]),
+            "hot": lambda s: (
+                -hot_score(s["upvotes"] - s["downvotes"], timestamp(s.get("reported_date")), self.hot_decay_seconds),
+                s["id"]
+            ),
+        }
+        self._orders: Dict[str, List[Tuple]] = {sort: [] for sort in self._key_funcs}
+        self._entries: Dict[str, Tuple[Dict[str, Tuple], int]] = {}  # scam_id -> (keys, votes counted)
+        self.total_votes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def sorts(self) -> Tuple[str, ...]:
+        return tuple(self._key_funcs)
+
+    def update(self, scam: dict) -> None:
+        """Add a scam or re-key it after its vote counts changed"""
+        with self._lock:
+            self._remove(scam["id"])
+            self._add(scam)
+
+    def remove(self, scam_id: str) -> None:
+        with self._lock:
+            self._remove(scam_id)
+
+    def rebuild(self, scams: Iterable[dict]) -> None:
+        with self._lock:
+            for ordered in self._orders.values():
+                ordered.clear()
+            self._entries.clear()
+            self.total_votes = 0
+            for scam in scams:
+                self._add(scam)
+
+    def page(self, sort: str, offset: int, limit: int) -> Tuple[int, List[str]]:
+        """Return (total, scam ids) for one page in the requested order"""
+        with self._lock:
+            ordered = self._orders[sort]
+            return len(ordered), [key[-1] for key in ordered[offset:offset + limit]]
+
+    def _add(self, scam: dict) -> None:
+        keys = {}
+        for sort, key_func in self._key_funcs.items():
+            keys[sort] = key_func(scam)
+            insert(self._orders[sort], keys[sort])
+        votes = scam["upvotes"] + scam["downvotes"]
+        self.total_votes += votes
+        self._entries[scam["id"]] = (keys, votes)
+
+    def _remove(self, scam_id: str) -> None:
+        entry = self._entries.pop(scam_id, None)
+        if entry is None:
+            return
+        keys, votes = entry
+        for sort, key in keys.items():
+            discard(self._orders[sort], key)
+        self.total_votes -= votes
+
+
+scam_ranking = ScamRanking(hot_decay_seconds=float(os.getenv("SCAM_HOT_DECAY_HOURS", "72")) * 3600)
@@ -0,0 +1,98 @@
+"""
+Scam Vote Index for PeopleRate
+(scam_id, user_id) -> vote lookups and per-user vote maps, maintained at write time
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+COUNTER_FIELDS = {"upvote": "upvotes", "downvote": "downvotes"}
+
+
+class ScamVoteIndex:
+    """Finds a user's vote without scanning DATABASE["scam_votes"]; vote changes hold one lock"""
+
+    def __init__(self):
+        self._votes: Dict[Tuple[str, str], str] = {}  # (scam_id, user_id) -> vote_id
+        self._by_user: Dict[str, Dict[str, str]] = {}  # user_id -> {scam_id: vote_type}
+        self._entries: Dict[str, Tuple[str, str]] = {}  # vote_id -> (scam_id, user_id)
+        self.lock = threading.RLock()
+
+    def add(self, vote: dict) -> None:
+        with self.lock:
+            self._add(vote)
+
+    def remove(self, vote_id: str) -> None:
+        with self.lock:
+            self._remove(vote_id)
+
+    def rebuild(self, votes: Iterable[dict]) -> None:
+        with self.lock:
+            self._votes.clear()
+            self._by_user.clear()
+            self._entries.clear()
+            for vote in votes:
+                self._add(vote)
+
+    def find(self, scam_id: str, user_id: str) -> Optional[str]:
+        """Vote id of the user's vote on a scam, or None"""
+        return self._votes.get((scam_id, user_id))
+
+    def user_votes(self, user_id: str) -> Dict[str, str]:
+        """scam_id -> vote_type for every scam the user voted on"""
+        with self.lock:
+            return dict(self._by_user.get(user_id, {}))
+
+    def cast(self, votes: Dict[str, dict], scam: dict, user_id: str, vote_type: str,
+             new_vote: dict) -> Tuple[str, str]:
+        """
+        Register, change or toggle off a vote and adjust the scam's counters atomically
+        Returns (outcome, vote_id) - outcome is "registered", "changed" or "removed"
+        """
+        with self.lock:
+            vote_id = self._votes.get((scam["id"], user_id))
+            existing = votes.get(vote_id) if vote_id else None
+
+            if existing is None:
+                vote_id = new_vote["id"]
+                votes[vote_id] = new_vote
+                self._add(new_vote)
+                scam[COUNTER_FIELDS[vote_type]] += 1
+                scam["last_updated"] = new_vote["voted_at"]
+                return "registered", vote_id
+
+            old_field = COUNTER_FIELDS[existing["vote_type"]]
+            scam[old_field] = max(0, scam[old_field] - 1)
+            if existing["vote_type"] == vote_type:
+                del votes[vote_id]
+                self._remove(vote_id)
+                return "removed", vote_id
+
+            existing["vote_type"] = vote_type
+            existing["voted_at"] = new_vote["voted_at"]
+            scam[COUNTER_FIELDS[vote_type]] += 1
+            self._by_user[user_id][scam["id"]] = vote_type
+            return "changed", vote_id
+
+    def _add(self, vote: dict) -> None:
+        if vote["id"] in self._entries:
+            self._remove(vote["id"])
+        scam_id, user_id = vote["scam_id"], vote["user_id"]
+        self._votes[(scam_id, user_id)] = vote["id"]
+        self._by_user.setdefault(user_id, {})[scam_id] = vote["vote_type"]
+        self._entries[vote["id"]] = (scam_id, user_id)
+
+    def _remove(self, vote_id: str) -> None:
+        entry = self._entries.pop(vote_id, None)
+        if entry is None:
+            return
+        scam_id, user_id = entry
+        if self._votes.get(entry) == vote_id:
+            del self._votes[entry]
+            user_map = self._by_user.get(user_id, {})
+            user_map.pop(scam_id, None)
+            if not user_map:
+                self._by_user.pop(user_id, None)
+
+
+scam_vote_index = ScamVoteIndex()
@@ -0,0 +1,24 @@
+"""
+Build Seed Snapshot
+Generates the sample dataset once (including bcrypt password hashes) and writes
+data/seed_snapshot.json, which main.py loads at startup when SEED_MODE=snapshot.
+
+Re-run after editing scripts/bangalore_seed_data.py or the sample data in main.py:
+    python scripts/build_seed_snapshot.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ["SEED_MODE"] = "eager"
+
+import main  # noqa: E402 - seeds DATABASE on import
+from seed_snapshot import DEFAULT_SNAPSHOT_PATH, SEED_COLLECTIONS, save_seed_snapshot  # noqa: E402
+
+
+if __name__ == "__main__":
+    size = save_seed_snapshot(main.DATABASE, DEFAULT_SNAPSHOT_PATH)
+    counts = ", ".join(f"{len(main.DATABASE[name])} {name}" for name in SEED_COLLECTIONS)
+    print(f"✅ Wrote {DEFAULT_SNAPSHOT_PATH} ({size / 1024:.1f} KB): {counts}")
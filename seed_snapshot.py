@@ -0,0 +1,70 @@
+"""
+Seed Snapshot for PeopleRate
+Prebuilt sample data with precomputed password hashes, loaded at startup instead of regenerated
+
+Build it with: python scripts/build_seed_snapshot.py
+Timestamps are shifted on load so seed reviews keep their relative age ("3 days ago").
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent / "data" / "seed_snapshot.json"
+SEED_COLLECTIONS = ("users", "persons", "reviews", "scams")
+
+
+def _encode(obj):
+    if isinstance(obj, datetime):
+        return {"$datetime": obj.isoformat()}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def save_seed_snapshot(database: Dict[str, dict], path: Path = DEFAULT_SNAPSHOT_PATH) -> int:
+    """Write the seed collections of DATABASE to path; returns the number of bytes written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Line 1 is a small header so the time shift is known before the collections are decoded
+    header = {"version": SNAPSHOT_VERSION, "built_at": datetime.utcnow().isoformat()}
+    collections = {name: database.get(name, {}) for name in SEED_COLLECTIONS}
+    data = (
+        json.dumps(header) + "\n" + json.dumps(collections, default=_encode, ensure_ascii=False)
+    ).encode("utf-8")
+
+    # Write to a temp file and rename so a half-written snapshot is never loaded
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".seed_snapshot.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(data)
+
+
+def load_seed_snapshot(path: Path = DEFAULT_SNAPSHOT_PATH) -> Optional[Dict[str, dict]]:
+    """Return {collection: {id: record}} from a snapshot, or None if missing or outdated"""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != SNAPSHOT_VERSION:
+            return None
+        raw = f.read()
+
+    shift = datetime.utcnow() - datetime.fromisoformat(header["built_at"])
+
+    def decode(obj):
+        if len(obj) == 1 and "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"]) + shift
+        return obj
+
+    return json.loads(raw, object_hook=decode)
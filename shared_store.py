@@ -0,0 +1,224 @@
+"""
+Shared State Store for PeopleRate
+SQLite (WAL mode) store that lets several uvicorn workers share one DATABASE
+
+Each worker keeps its DATABASE dicts as a read cache. Writes go through to SQLite
+together with a row in a change feed. Before handling a request a worker pulls the
+changes other workers committed since its last pull; when nothing changed that costs
+a single PRAGMA data_version call.
+
+Records are written whole, so a worker's copy wins - except for COUNTER_FIELDS, which
+are read from the stored record and adjusted by the write's increments inside the
+write transaction. Two workers counting the same vote or report at once both count.
+A write can instead reset a counter to its own value (e.g. reports cleared on approval).
+"""
+
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (collection, key, record) - record is None when it was deleted
+Change = Tuple[str, str, Optional[dict]]
+
+# Fields changed by increments (the stored value plus the write's increment wins) or explicit resets
+COUNTER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "scams": ("upvotes", "downvotes"),
+    "users": ("review_count", "reputation_score"),
+    "reviews": ("reported_count",),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (collection, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    origin TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SharedStore:
+    """Write-through SQLite store with a change feed for per-process caches"""
+
+    def __init__(self, path: str, change_retention: int = 100_000, busy_timeout: float = 10.0):
+        self.path = path
+        self.change_retention = change_retention
+        # Identifies this process in the change feed so it skips its own writes
+        self.origin = f"{os.getpid()}-{secrets.token_hex(3)}"
+        self.last_seq = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._writes = 0
+
+    # ----- startup -----
+
+    def seed_if_empty(self, collections: Dict[str, dict]) -> bool:
+        """Copy collections into the store unless another worker already did; returns True if seeded"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM meta WHERE name = 'seeded'").fetchone():
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records (collection, key, data) VALUES (?, ?, ?)",
+                    (
+                        (name, key, pickle.dumps(record, protocol=5))
+                        for name, records in collections.items()
+                        for key, record in records.items()
+                    )
+                )
+                self._conn.execute("INSERT INTO meta (name, value) VALUES ('seeded', ?)", (self.origin,))
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_all(self) -> Dict[str, dict]:
+        """Read every record and move the feed position to the newest change"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self.last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+                collections: Dict[str, dict] = {}
+                for collection, key, data in self._conn.execute("SELECT collection, key, data FROM records"):
+                    collections.setdefault(collection, {})[key] = pickle.loads(data)
+            finally:
+                self._conn.execute("COMMIT")
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return collections
+
+    # ----- writes -----
+
+    def put(self, collection: str, key: str, record: dict, increments: Optional[Dict[str, int]] = None,
+            resets: Iterable[str] = ()) -> Dict[str, int]:
+        """
+        Write a record; its COUNTER_FIELDS are taken from the stored record plus `increments`
+        (the record's own values only for a new record), except the fields in `resets`, which
+        are written as the record's own values. Returns the counter values written.
+        """
+        return self._write(collection, key, record, increments or {}, set(resets))
+
+    def delete(self, collection: str, key: str) -> None:
+        self._write(collection, key, None, {}, set())
+
+    def _write(self, collection: str, key: str, record: Optional[dict], increments: Dict[str, int],
+               resets: set) -> Dict[str, int]:
+        counters = {}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if record is None:
+                    self._conn.execute("DELETE FROM records WHERE collection = ? AND key = ?", (collection, key))
+                else:
+                    fields = COUNTER_FIELDS.get(collection, ())
+                    stored = self._conn.execute(
+                        "SELECT data FROM records WHERE collection = ? AND key = ?", (collection, key)
+                    ).fetchone() if fields else None
+                    if stored is not None:
+                        stored = pickle.loads(stored[0])
+                        counters = {
+                            field: record.get(field, 0) if field in resets
+                            else max(0, stored.get(field, 0) + increments.get(field, 0))
+                            for field in fields if field in record or field in stored
+                        }
+                        record = {**record, **counters}
+                    data = pickle.dumps(record, protocol=5)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO records (collection, key, data) VALUES (?, ?, ?)",
+                        (collection, key, data)
+                    )
+                seq = self._conn.execute(
+                    "INSERT INTO changes (collection, key, origin) VALUES (?, ?, ?)",
+                    (collection, key, self.origin)
+                ).lastrowid
+                self._writes += 1
+                if self._writes % 1000 == 0:
+                    self._conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - self.change_retention,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return counters
+
+    # ----- change feed -----
+
+    def pull(self) -> Optional[List[Change]]:
+        """
+        Changes committed by other processes since the last pull, latest state per record
+        Returns None when this process fell behind the retained feed and must call load_all()
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return []
+            self._data_version = data_version
+
+            self._conn.execute("BEGIN")
+            try:
+                oldest = self._conn.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+                if oldest is not None and oldest > self.last_seq + 1 and self.last_seq > 0:
+                    return None
+
+                rows = self._conn.execute(
+                    """
+                    SELECT c.seq, c.collection, c.key, c.origin, r.data
+                    FROM changes c
+                    LEFT JOIN records r ON r.collection = c.collection AND r.key = c.key
+                    WHERE c.seq > ?
+                    ORDER BY c.seq
+                    """,
+                    (self.last_seq,)
+                ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+
+            latest: Dict[Tuple[str, str], Optional[bytes]] = {}
+            for seq, collection, key, origin, data in rows:
+                self.last_seq = seq
+                if origin != self.origin:
+                    # The joined row is the record's current state, so the last mention wins
+                    latest.pop((collection, key), None)
+                    latest[(collection, key)] = data
+
+            return [
+                (collection, key, pickle.loads(data) if data is not None else None)
+                for (collection, key), data in latest.items()
+            ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ChangeFeedMiddleware:
+    """ASGI middleware that applies other workers' changes before each HTTP request"""
+
+    def __init__(self, app, sync: Callable[[], None]):
+        self.app = app
+        self.sync = sync
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.sync()
+        await self.app(scope, receive, send)
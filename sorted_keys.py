@@ -0,0 +1,31 @@
+"""
+Sorted Key Lists for PeopleRate
+Shared helpers for the indexes that keep records as sorted key tuples (reviews, scams, flags, claims)
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import List, Tuple
+
+
+def timestamp(value) -> float:
+    """Seconds since the epoch for a datetime or ISO string, 0.0 for anything else"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def insert(ordered: List[Tuple], key: Tuple) -> None:
+    insort(ordered, key)
+
+
+def discard(ordered: List[Tuple], key: Tuple) -> None:
+    """Delete key from the sorted list if present; keys end in a record id, so they are unique"""
+    position = bisect_left(ordered, key)
+    if position < len(ordered) and ordered[position] == key:
+        del ordered[position]
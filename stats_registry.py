@@ -0,0 +1,173 @@
+"""
+Platform Statistics Registry for PeopleRate
+Counters maintained incrementally by every write path so stats endpoints are O(1)
+"""
+
+import threading
+from typing import Dict, Tuple
+
+VERIFICATION_STATUSES = ("pending", "verified", "rejected", "no_proof")
+
+
+class PlatformStats:
+    """Running totals for users, persons and reviews"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.total_users = 0
+        self.total_persons = 0
+        self.total_reviews = 0
+        self.verified_reviews = 0  # is_verified flag (shown on the home page)
+        self.status_counts: Dict[str, int] = {status: 0 for status in VERIFICATION_STATUSES}
+        self.with_proof = 0
+        self.rating_sum = 0
+        # Platform average is the mean of per-person averages over rated persons
+        self.rated_persons = 0
+        self.person_rating_sum = 0.0
+
+    # ----- snapshots of the fields the counters depend on -----
+
+    @staticmethod
+    def review_snapshot(review: dict) -> Tuple:
+        return (
+            bool(review.get("is_verified", False)),
+            review.get("verification_status"),
+            bool(review.get("proof_document")),
+            review.get("rating", 0)
+        )
+
+    @staticmethod
+    def person_snapshot(person: dict) -> Tuple[int, float]:
+        return (person.get("review_count", 0), person.get("average_rating", 0))
+
+    # ----- incremental updates -----
+
+    def add_user(self) -> None:
+        with self._lock:
+            self.total_users += 1
+
+    def add_person(self, person: dict) -> None:
+        with self._lock:
+            self.total_persons += 1
+            self._apply_person(self.person_snapshot(person), 1)
+
+    def add_review(self, review: dict) -> None:
+        with self._lock:
+            self.total_reviews += 1
+            self._apply_review(self.review_snapshot(review), 1)
+
+    def remove_review(self, review: dict) -> None:
+        with self._lock:
+            self.total_reviews -= 1
+            self._apply_review(self.review_snapshot(review), -1)
+
+    def update_review(self, before: Tuple, review: dict) -> None:
+        """Move a review's contribution from its old field values to the current ones"""
+        after = self.review_snapshot(review)
+        if before == after:
+            return
+        with self._lock:
+            self._apply_review(before, -1)
+            self._apply_review(after, 1)
+
+    def update_person(self, before: Tuple[int, float], person: dict) -> None:
+        """Move a person's rating contribution after review_count/average_rating changed"""
+        after = self.person_snapshot(person)
+        if before == after:
+            return
+        with self._lock:
+            self._apply_person(before, -1)
+            self._apply_person(after, 1)
+
+    def _apply_review(self, snapshot: Tuple, sign: int) -> None:
+        is_verified, status, has_proof, rating = snapshot
+        if is_verified:
+            self.verified_reviews += sign
+        if status in self.status_counts:
+            self.status_counts[status] += sign
+        if has_proof:
+            self.with_proof += sign
+        self.rating_sum += sign * rating
+
+    def _apply_person(self, snapshot: Tuple[int, float], sign: int) -> None:
+        review_count, average_rating = snapshot
+        if review_count > 0:
+            self.rated_persons += sign
+            self.person_rating_sum += sign * average_rating
+
+    # ----- full recount (startup and periodic drift check) -----
+
+    def recount(self, database: dict) -> Dict[str, Tuple]:
+        """
+        Rebuild every counter from DATABASE
+        Returns {counter: (incremental value, recounted value)} for counters that drifted
+        """
+        fresh = PlatformStats()
+        fresh.total_users = len(database["users"])
+        for person in database["persons"].values():
+            fresh.add_person(person)
+        for review in database["reviews"].values():
+            fresh.add_review(review)
+
+        with self._lock:
+            before = self.as_dict()
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+            after = self.as_dict()
+
+        return {
+            key: (before[key], after[key])
+            for key in after
+            if abs(before[key] - after[key]) > 1e-6
+        }
+
+    def as_dict(self) -> Dict[str, float]:
+        counters = {
+            "total_users": self.total_users,
+            "total_persons": self.total_persons,
+            "total_reviews": self.total_reviews,
+            "verified_reviews": self.verified_reviews,
+            "with_proof": self.with_proof,
+            "rating_sum": self.rating_sum,
+            "rated_persons": self.rated_persons,
+            "person_rating_sum": self.person_rating_sum
+        }
+        for status, count in self.status_counts.items():
+            counters[f"status_{status}"] = count
+        return counters
+
+    # ----- read models -----
+
+    def platform_stats(self) -> dict:
+        """Payload for /api/stats"""
+        average = self.person_rating_sum / self.rated_persons if self.rated_persons else 0
+        return {
+            "total_users": self.total_users,
+            "total_persons": self.total_persons,
+            "total_reviews": self.total_reviews,
+            "average_rating": round(average, 1),
+            "verified_reviews": self.verified_reviews
+        }
+
+    def verification_stats(self) -> dict:
+        """Payload for /api/admin/reviews/stats"""
+        stats = {
+            "total_reviews": self.total_reviews,
+            "pending_verification": self.status_counts["pending"],
+            "verified": self.status_counts["verified"],
+            "rejected": self.status_counts["rejected"],
+            "no_proof": self.status_counts["no_proof"],
+            "with_proof": self.with_proof,
+            "verification_rate": 0
+        }
+
+        total_with_proof = stats["verified"] + stats["rejected"]
+        if total_with_proof > 0:
+            stats["verification_rate"] = round((stats["verified"] / total_with_proof) * 100, 1)
+
+        return stats
+
+
+platform_stats = PlatformStats()
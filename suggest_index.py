@@ -0,0 +1,159 @@
+"""
+Search Suggestions for PeopleRate
+Prefix autocomplete over person names, companies, areas and categories, best-rated first
+"""
+
+import heapq
+import re
+import sys
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+FIELDS = ("name", "company", "area", "category")
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+# Prefixes covering more distinct keys than this may walk the ranking instead of merging postings
+MAX_MERGED_KEYS = 64
+
+
+def normalize(text: str) -> str:
+    return " ".join(word for word in _NON_WORD.split(text.lower()) if word)
+
+
+def _keys(person: dict) -> List[str]:
+    """Every word-start suffix of each field: "hsr layout sector 2" -> "layout sector 2", "sector 2", ..."""
+    keys = set()
+    for field in FIELDS:
+        words = normalize(person.get(field) or "").split()
+        for start in range(len(words)):
+            keys.add(sys.intern(" ".join(words[start:])))
+    return sorted(keys)
+
+
+def _rank(person: dict) -> Tuple[int, float, str]:
+    """Sort key, best first: most reviews, then highest average rating"""
+    return (-(person.get("review_count") or 0), -(person.get("average_rating") or 0.0), person["id"])
+
+
+class SuggestIndex:
+    """
+    A sorted array of distinct keys searched with bisect, each key mapping to its person ids in
+    rank order. Keys are interned and postings hold only id references, so an area or category
+    shared by 100k persons is stored once. A prefix's keys are a contiguous slice of the array;
+    their postings are merged best-first. When a short prefix covers very many keys, walking all
+    persons best-first is cheaper: so many persons match that `limit` hits come up quickly.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._postings: Dict[str, List[str]] = {}  # key -> person ids, best first
+        self._ranked: List[str] = []  # every person id, best first
+        self._ranks: Dict[str, Tuple[int, float, str]] = {}
+        self._person_keys: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def add(self, person: dict) -> None:
+        with self._lock:
+            self._remove(person["id"])
+            self._add(person)
+
+    def update(self, person: dict) -> None:
+        """Re-index a person after its fields or review stats changed"""
+        with self._lock:
+            person_id = person["id"]
+            if person_id in self._ranks and self._ranks[person_id] == _rank(person) \
+                    and self._person_keys[person_id] == _keys(person):
+                return
+            self._remove(person_id)
+            self._add(person)
+
+    def remove(self, person_id: str) -> None:
+        with self._lock:
+            self._remove(person_id)
+
+    def rebuild(self, persons: Iterable[dict]) -> None:
+        with self._lock:
+            ordered = sorted(persons, key=_rank)
+            self._ranks = {person["id"]: _rank(person) for person in ordered}
+            self._ranked = [person["id"] for person in ordered]
+            self._person_keys = {}
+            self._postings = {}
+            for person in ordered:  # best first, so every posting comes out sorted
+                keys = self._person_keys[person["id"]] = _keys(person)
+                for key in keys:
+                    self._postings.setdefault(key, []).append(person["id"])
+            self._keys = sorted(self._postings)
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[str]:
+        """Up to `limit` person ids with a name/company/area/category word starting with prefix"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            low = bisect_left(self._keys, prefix)
+            high = bisect_left(self._keys, prefix + "\uffff", low)
+            keys = high - low
+            if keys > MAX_MERGED_KEYS:
+                # Estimate how many persons match from a sample of the keys; walking the ranking
+                # finds `limit` of them in about limit * total / matching steps
+                step = keys // MAX_MERGED_KEYS
+                matching = step * sum(len(self._postings[self._keys[i]]) for i in range(low, high, step))
+                if limit * len(self._ranked) <= keys * matching:
+                    return self._walk(prefix, limit)
+            return self._merge(self._keys[low:high], limit)
+
+    def _walk(self, prefix: str, limit: int) -> List[str]:
+        found = []
+        for person_id in self._ranked:
+            if any(key.startswith(prefix) for key in self._person_keys[person_id]):
+                found.append(person_id)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def _merge(self, keys: List[str], limit: int) -> List[str]:
+        # Postings are best first: a lazy k-way merge stops after `limit` distinct persons
+        found: Dict[str, None] = {}
+        for person_id in heapq.merge(*(self._postings[key] for key in keys), key=self._ranks.__getitem__):
+            found[person_id] = None
+            if len(found) >= limit:
+                break
+        return list(found)
+
+    def _add(self, person: dict) -> None:
+        person_id = person["id"]
+        self._ranks[person_id] = _rank(person)
+        insort(self._ranked, person_id, key=self._ranks.__getitem__)
+        keys = self._person_keys[person_id] = _keys(person)
+        for key in keys:
+            posting = self._postings.get(key)
+            if posting is None:
+                posting = self._postings[key] = []
+                insort(self._keys, key)
+            insort(posting, person_id, key=self._ranks.__getitem__)
+
+    def _remove(self, person_id: str) -> None:
+        rank = self._ranks.get(person_id)
+        if rank is None:
+            return
+        _delete(self._ranked, person_id, rank, self._ranks)
+        for key in self._person_keys.pop(person_id):
+            posting = self._postings[key]
+            _delete(posting, person_id, rank, self._ranks)
+            if not posting:
+                del self._postings[key]
+                del self._keys[bisect_left(self._keys, key)]
+        del self._ranks[person_id]
+
+
+def _delete(ordered: List[str], person_id: str, rank, ranks: Dict[str, tuple]) -> None:
+    position = bisect_left(ordered, rank, key=ranks.__getitem__)
+    if position < len(ordered) and ordered[position] == person_id:
+        del ordered[position]
+
+
+suggest_index = SuggestIndex()
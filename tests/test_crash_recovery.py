@@ -0,0 +1,131 @@
+"""
+PeopleRate - Crash Recovery Tests
+Kills processes mid-write and checks that the snapshot + write-ahead log bring the data back
+
+Usage:
+    python -m pytest tests/test_crash_recovery.py -q
+    python tests/test_crash_recovery.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from write_ahead_log import WriteAheadLog, apply_entries, read_wal
+
+
+def run_python(code: str, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT), **env},
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+
+
+def test_wal_survives_kill_and_torn_write(tmp_path):
+    """Every acknowledged append (fsync=always) is replayed; a half-written frame is ignored"""
+    wal_path = tmp_path / "crash.wal"
+    result = run_python(f"""
+        import os, signal
+        from write_ahead_log import WriteAheadLog
+        wal = WriteAheadLog({str(wal_path)!r}, fsync_policy="always")
+        for i in range(200):
+            wal.append("put", "reviews", f"r{{i}}", {{"id": f"r{{i}}", "rating": i % 5 + 1}})
+        wal.append("delete", "reviews", "r7")
+        # Simulate dying in the middle of the next write
+        wal._file.write(b"\\x40\\x00\\x00\\x00\\xde\\xad")
+        wal._file.flush()
+        os.kill(os.getpid(), signal.SIGKILL)
+    """, {})
+    assert result.returncode == -9, result.stderr
+
+    entries, valid_length = read_wal(wal_path)
+    assert len(entries) == 201
+    assert valid_length < wal_path.stat().st_size
+
+    database = {}
+    applied, last_seq = apply_entries(database, entries)
+    assert applied == 201 and last_seq == 201
+    assert len(database["reviews"]) == 199 and "r7" not in database["reviews"]
+
+    # Appending after recovery continues the sequence from the valid prefix
+    wal = WriteAheadLog(wal_path, fsync_policy="always", start_seq=last_seq)
+    wal.truncate_through(0)
+    wal.append("put", "reviews", "r200", {"id": "r200"})
+    wal.close()
+    entries, valid_length = read_wal(wal_path)
+    assert entries[-1][0] == 202 and valid_length == wal_path.stat().st_size
+
+
+def test_wal_group_commit_flushes_pending_frames(tmp_path):
+    wal = WriteAheadLog(tmp_path / "batch.wal", fsync_policy="batch", group_commit_ms=5)
+    for i in range(1000):
+        wal.append("put", "scam_votes", f"v{i}", {"id": f"v{i}"})
+    wal.flush()
+    assert len(read_wal(tmp_path / "batch.wal")[0]) == 1000
+    assert wal.truncate_through(900) == 100
+    wal.close()
+    assert [entry[0] for entry in read_wal(tmp_path / "batch.wal")[0]][:1] == [901]
+
+
+def test_app_recovers_writes_after_crash(tmp_path):
+    """Register a user and flag a review, crash without a shutdown snapshot, restart"""
+    env = {
+        "DB_SNAPSHOT_PATH": str(tmp_path / "peoplerate.snapshot"),
+        "WAL_FSYNC": "always",
+        "RESPONSE_CACHE_ENABLED": "false",
+    }
+    crashed = run_python("""
+        import os
+        import main
+        from fastapi.testclient import TestClient
+        with TestClient(main.app) as client:
+            response = client.post("/api/auth/register", json={
+                "email": "crash@example.com", "username": "crash_tester",
+                "full_name": "Crash Tester", "password": "CrashTest123!"
+            })
+            assert response.status_code == 200, response.text
+            token = response.json()["access_token"]
+            response = client.post(
+                "/api/flag-review",
+                params={"review_id": "blr_review_001", "reason": "spam"},
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200, response.text
+            os._exit(3)  # no shutdown handler, no final snapshot
+    """, env)
+    assert crashed.returncode == 3, crashed.stderr[-2000:]
+    assert Path(env["DB_SNAPSHOT_PATH"] + ".wal").stat().st_size > 0
+
+    recovered = run_python("""
+        import main
+        from fastapi.testclient import TestClient
+        with TestClient(main.app) as client:
+            users = [u for u in main.DATABASE["users"].values() if u["email"] == "crash@example.com"]
+            assert len(users) == 1
+            assert main.DATABASE["reviews"]["blr_review_001"]["reported_count"] == 1
+            assert len(main.DATABASE["flagged_reviews"]) == 1
+            assert client.get("/api/stats").json()["total_users"] == len(main.DATABASE["users"])
+        print("recovered")
+    """, env)
+    assert recovered.returncode == 0, recovered.stderr
+    assert "recovered" in recovered.stdout
+    # Recovery compacted the log into a fresh snapshot
+    assert Path(env["DB_SNAPSHOT_PATH"]).exists()
+
+
+if __name__ == "__main__":
+    for test in (test_wal_survives_kill_and_torn_write, test_wal_group_commit_flushes_pending_frames,
+                 test_app_recovers_writes_after_crash):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+        print(f"✅ {test.__name__}")
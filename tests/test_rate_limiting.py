@@ -0,0 +1,73 @@
+"""
+PeopleRate - Rate Limiting Tests
+Each request to a route with its own @limiter.limit is counted exactly once, cached or not
+
+DefaultLimitMiddleware counts these requests itself and tells the decorator it already did
+through slowapi internals (Limiter._check_request_limit, request.state._rate_limiting_complete);
+these tests fail if a slowapi upgrade makes either side double-count or skip.
+
+Usage:
+    python -m pytest tests/test_rate_limiting.py -q
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def per_window(limit: str) -> int:
+    return int(limit.split("/")[0])
+
+
+@pytest.fixture
+def client():
+    main.limiter.enabled = True
+    main.limiter.reset()
+    try:
+        with TestClient(main.app, raise_server_exceptions=False) as client:
+            yield client
+    finally:
+        main.limiter.reset()
+        main.limiter.enabled = main.RATE_LIMIT_ENABLED
+
+
+def test_uncached_requests_count_once(client):
+    limit = per_window(main.RATE_LIMIT_SEARCH)
+    # A different query each time: every request misses the cache and reaches the decorator
+    statuses = [client.get("/api/persons/search", params={"q": f"plumber {n}"}).status_code for n in range(limit + 1)]
+    assert statuses == [200] * limit + [429]
+
+
+def test_cached_and_uncached_requests_share_one_count(client):
+    limit = per_window(main.RATE_LIMIT_SEARCH)
+    responses = [
+        client.get("/api/persons/search", params={"q": "plumber" if n % 2 else f"electrician {n}"})
+        for n in range(limit + 1)
+    ]
+    assert [response.status_code for response in responses] == [200] * limit + [429]
+    assert {response.headers["x-cache"] for response in responses[:limit]} == {"HIT", "MISS"}
+
+
+def test_route_outside_the_cache_counts_once(client):
+    limit = per_window(main.RATE_LIMIT_LOGIN)
+    statuses = [
+        client.post("/api/auth/login", data={"email": "nobody@example.com", "password": "wrong"}).status_code
+        for _ in range(limit + 1)
+    ]
+    assert statuses == [401] * limit + [429]
+
+
+def test_route_limit_does_not_use_the_default_budget(client):
+    for n in range(per_window(main.RATE_LIMIT_SEARCH)):
+        assert client.get("/api/persons/search", params={"q": f"tailor {n}"}).status_code == 200
+    # Every default-limited request is still available
+    statuses = {client.get("/api/stats").status_code for _ in range(per_window(main.RATE_LIMIT_DEFAULT))}
+    assert statuses == {200}
+    assert client.get("/api/stats").status_code == 429
@@ -0,0 +1,83 @@
+"""
+PeopleRate - Response Cache Tests
+Conditional reads after a write must reach the handler on routes without stale serving
+
+Usage:
+    python -m pytest tests/test_response_cache.py -q
+"""
+
+import sys
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def register(client: TestClient) -> dict:
+    name = f"cache{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/auth/register", json={
+        "email": f"{name}@example.com", "full_name": "Cache Test", "username": name, "password": "secret123"
+    })
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_conditional_read_after_review_is_not_stale():
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        first = client.get("/api/persons/blr_vendor_003")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert client.get("/api/persons/blr_vendor_003", headers={"If-None-Match": etag}).status_code == 304
+
+        response = client.post("/api/reviews", headers=register(client), json={
+            "person_id": "blr_vendor_003", "rating": 2, "comment": "Came late and left the job half done"
+        })
+        assert response.status_code == 200, response.text
+
+        after = client.get("/api/persons/blr_vendor_003", headers={"If-None-Match": etag})
+        assert after.status_code == 200
+        assert after.headers["x-cache"] == "MISS" and after.headers["etag"] != etag
+        assert after.json()["reviews"][0]["id"] == response.json()["review_id"]  # newest first
+
+
+def test_read_your_writes_routes_tell_browsers_to_revalidate():
+    """The page refetches the person right after posting a review; a max-age would let the browser skip that"""
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        for path in ["/api/persons/blr_vendor_003", "/api/persons/blr_vendor_003/reviews", "/api/persons/search?q=plumber"]:
+            assert client.get(path).headers["cache-control"] == "public, no-cache", path
+        assert "max-age=60" in client.get("/api/scams").headers["cache-control"]
+
+
+def test_reviewer_change_revalidates_person_page():
+    """Reviews on the page embed reviewer badges, so a reviewer's write must change the ETag"""
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        reviewer_id = main.person_review_index.reviewers("blr_vendor_001")[0]
+        etag = client.get("/api/persons/blr_vendor_001").headers["etag"]
+
+        main.DATABASE["users"][reviewer_id]["email_verified"] = not main.DATABASE["users"][reviewer_id].get("email_verified")
+        main.mark_changed("users", reviewer_id)
+
+        after = client.get("/api/persons/blr_vendor_001", headers={"If-None-Match": etag})
+        assert after.status_code == 200 and after.headers["etag"] != etag
+        badges = [review["reviewer_email_verified"] for review in after.json()["reviews"] if review["reviewer_id"] == reviewer_id]
+        assert badges and all(badge == main.DATABASE["users"][reviewer_id]["email_verified"] for badge in badges)
+
+
+def test_cached_responses_count_against_route_limit():
+    """Cache hits never reach the @limiter.limit decorator; the route's limit must still apply"""
+    limit = int(main.RATE_LIMIT_SEARCH.split("/")[0])
+    main.limiter.enabled = True
+    main.limiter.reset()
+    try:
+        with TestClient(main.app, raise_server_exceptions=False) as client:
+            responses = [client.get("/api/persons/search", params={"q": "plumber"}) for _ in range(limit + 1)]
+    finally:
+        main.limiter.reset()
+        main.limiter.enabled = main.RATE_LIMIT_ENABLED
+    assert [response.status_code for response in responses] == [200] * limit + [429]
+    assert {response.headers["x-cache"] for response in responses[1:limit]} == {"HIT"}
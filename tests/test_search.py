@@ -0,0 +1,58 @@
+"""
+PeopleRate - Search Tests
+Area aliases in queries: a place after "near"/"in" or when the rest still matches, else part of the name.
+Facet counts only when asked for.
+
+Usage:
+    python -m pytest tests/test_search.py -q
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def search(client: TestClient, query: str, **params) -> dict:
+    response = client.get("/api/persons/search", params={"q": query, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_area_alias_in_business_name():
+    person = main.person_from_parsed({"name": "Majestic Tailors", "phone": "+91 98450 77777"}, "Majestic Tailors")
+    person.update({"area": "Koramangala 5th Block", "city": "Bengaluru", "category": "Tailor"})
+    main.insert_person(person)
+    try:
+        with TestClient(main.app, raise_server_exceptions=False) as client:
+            # "Majestic" is another area, but here it is part of the name: no radius filter
+            exact = search(client, "Majestic Tailors")
+            assert exact["parsed"]["area"] is None
+            assert person["id"] in [found["id"] for found in exact["persons"]]
+            # Search keys stay inside the indexes
+            assert not {"phonetic_keys", "identifiers", "location"} & set(exact["persons"][0])
+
+            # A trade plus an area is still a place search
+            nearby = search(client, "tailor koramangala")
+            assert nearby["parsed"]["area"] == "Koramangala"
+            assert person["id"] in [found["id"] for found in nearby["persons"]]
+
+            assert search(client, "tailor near Majestic")["parsed"]["area"] == "Majestic"
+    finally:
+        del main.DATABASE["persons"][person["id"]]
+        main.rebuild_indexes()
+
+
+def test_facet_counts_only_on_request():
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        assert "facets" not in search(client, "plumber")
+        assert "facets" not in search(client, "", category="Plumber")
+
+        counted = search(client, "", category="Plumber", facets="true")
+        assert counted["total"] and counted["facets"]["category"] == [{"value": "Plumber", "count": counted["total"]}]
+        assert search(client, "zzqx nobody", facets="true")["facets"]["category"] == []
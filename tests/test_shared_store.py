@@ -0,0 +1,60 @@
+"""
+PeopleRate - Shared State Tests
+Two workers' stores on one SQLite file: counter increments from stale copies must add up,
+and a reset must clear increments it never saw
+
+Usage:
+    python -m pytest tests/test_shared_store.py -q
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared_store import SharedStore
+
+
+def test_concurrent_counter_increments_add_up(tmp_path):
+    path = str(tmp_path / "shared.db")
+    first, second = SharedStore(path), SharedStore(path)
+    scam = {"id": "s1", "title": "Fake courier", "upvotes": 10, "downvotes": 2}
+    assert first.seed_if_empty({"scams": {"s1": scam}})
+    copies = [first.load_all()["scams"]["s1"], second.load_all()["scams"]["s1"]]
+
+    # Both workers count an upvote on the same (now stale) copy
+    for store, record in zip((first, second), copies):
+        record["upvotes"] += 1
+        record.update(store.put("scams", "s1", record, {"upvotes": 1}))
+    assert copies[1]["upvotes"] == 12
+
+    # A write without increments keeps the stored counters, whatever the local copy says
+    stale = copy.deepcopy(copies[0])
+    stale["title"] = "Fake courier (OTP)"
+    assert first.put("scams", "s1", stale) == {"upvotes": 12, "downvotes": 2}
+
+    changes = second.pull()
+    assert changes == [("scams", "s1", {**stale, "upvotes": 12, "downvotes": 2})]
+    first.close()
+    second.close()
+
+
+def test_reset_overrides_concurrent_increments(tmp_path):
+    path = str(tmp_path / "shared.db")
+    first, second = SharedStore(path), SharedStore(path)
+    review = {"id": "r1", "person_id": "p1", "rating": 1, "reported_count": 2}
+    assert first.seed_if_empty({"reviews": {"r1": review}})
+    mine, theirs = first.load_all()["reviews"]["r1"], second.load_all()["reviews"]["r1"]
+
+    # Another worker counts a report after this one loaded the review
+    theirs["reported_count"] += 1
+    assert second.put("reviews", "r1", theirs, {"reported_count": 1}) == {"reported_count": 3}
+
+    # Approving clears every report, including the one this worker never saw
+    mine["reported_count"] = 0
+    assert first.put("reviews", "r1", mine, resets={"reported_count"}) == {"reported_count": 0}
+    assert second.pull() == [("reviews", "r1", {**review, "reported_count": 0})]
+    first.close()
+    second.close()
@@ -0,0 +1,102 @@
+"""
+JWT Token Cache for PeopleRate
+Keeps verified token claims in memory so repeat requests skip HMAC verification
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+
+class TokenCache:
+    """Bounded LRU cache of verified JWT claims keyed by token digest"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        # digest -> (claims, exp timestamp)
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        # user_id -> digests, so a user's tokens can be dropped together
+        self._by_user: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """Hash the raw token so it is never kept in memory"""
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return cached claims for a token, or None if missing or expired"""
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, exp = entry
+            if exp <= time.time():
+                self._remove(key, claims)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        """Cache verified claims until the token's exp claim"""
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+
+        key = self._digest(token)
+        user_id = claims.get("sub")
+        with self._lock:
+            self._entries[key] = (claims, float(exp))
+            self._entries.move_to_end(key)
+            if user_id:
+                self._by_user.setdefault(user_id, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                old_key, (old_claims, _) = self._entries.popitem(last=False)
+                self._unlink(old_key, old_claims)
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached token belonging to a user (deactivated, removed, changed)"""
+        with self._lock:
+            keys = self._by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def _remove(self, key: bytes, claims: dict) -> None:
+        self._entries.pop(key, None)
+        self._unlink(key, claims)
+
+    def _unlink(self, key: bytes, claims: dict) -> None:
+        user_id = claims.get("sub")
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
@@ -0,0 +1,183 @@
+"""
+Write-Ahead Log for PeopleRate
+Append-only log of DATABASE record writes, replayed on top of the latest snapshot after a crash
+
+Each frame is: length (u32) | crc32 (u32) | pickle of (seq, op, collection, key, record)
+where op is "put" (record is the full record after the write) or "delete".
+Replaying a "put" twice is harmless, so frames already covered by a snapshot can be re-applied.
+
+fsync policies:
+    always - every append is written and fsynced before it returns
+    batch  - group commit: a background thread writes and fsyncs all pending frames
+             every group_commit_ms; a crash loses at most that window
+    never  - like batch, but leaves flushing to the OS page cache
+"""
+
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "batch", "never")
+_FRAME = struct.Struct("<II")
+
+# (seq, op, collection, key, record)
+WalEntry = Tuple[int, str, str, str, Optional[dict]]
+
+
+def encode_frame(entry: WalEntry) -> bytes:
+    payload = pickle.dumps(entry, protocol=5)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_wal(path: Path) -> Tuple[List[WalEntry], int]:
+    """
+    Return (entries, valid_length) for a log file
+    Reading stops at the first truncated or corrupt frame - the torn tail of a crashed write
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], 0
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    entries = []
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        length, checksum = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        payload = data[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            break
+        try:
+            entries.append(pickle.loads(payload))
+        except Exception:
+            break
+        offset = start + length
+
+    if offset < len(data):
+        logger.warning(f"⚠️ Ignoring {len(data) - offset} bytes of torn/corrupt tail in {path}")
+    return entries, offset
+
+
+def apply_entries(database: dict, entries: Iterator[WalEntry], after_seq: int = 0) -> Tuple[int, int]:
+    """Apply log entries newer than after_seq to database; returns (applied count, last seq)"""
+    applied = 0
+    last_seq = after_seq
+    for seq, op, collection, key, record in entries:
+        if seq <= after_seq:
+            continue
+        records = database.setdefault(collection, {})
+        if op == "put":
+            records[key] = record
+        else:
+            records.pop(key, None)
+        applied += 1
+        last_seq = max(last_seq, seq)
+    return applied, last_seq
+
+
+class WriteAheadLog:
+    """Appends DATABASE mutations to a log file with a configurable fsync policy"""
+
+    def __init__(self, path: Path, fsync_policy: str = "batch", group_commit_ms: int = 10,
+                 start_seq: int = 0):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}")
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_policy = fsync_policy
+        self.group_commit_interval = group_commit_ms / 1000
+        self.last_seq = start_seq
+
+        self._file = open(self.path, "ab")
+        self._pending: List[bytes] = []
+        # Lock order: _io_lock before _lock
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+
+        self._flusher = None
+        if fsync_policy != "always":
+            self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+            self._flusher.start()
+
+    def append(self, op: str, collection: str, key: str, record: Optional[dict] = None) -> int:
+        """Log a "put" (with the full record) or "delete"; returns the entry's sequence number"""
+        if self.fsync_policy == "always":
+            with self._io_lock, self._lock:
+                self.last_seq += 1
+                self._file.write(encode_frame((self.last_seq, op, collection, key, record)))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                return self.last_seq
+
+        with self._lock:
+            self.last_seq += 1
+            self._pending.append(encode_frame((self.last_seq, op, collection, key, record)))
+            return self.last_seq
+
+    def flush(self) -> None:
+        """Write (and, unless the policy is "never", fsync) every pending frame"""
+        with self._io_lock:
+            self._write_pending()
+
+    def truncate_through(self, seq: int) -> int:
+        """Drop entries with seq <= seq (already in a snapshot); returns entries kept"""
+        with self._io_lock:
+            self._write_pending()
+            entries, _ = read_wal(self.path)
+            kept = [entry for entry in entries if entry[0] > seq]
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"".join(encode_frame(entry) for entry in kept))
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "ab")
+            return len(kept)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._io_lock:
+            self._write_pending()
+            self._file.close()
+
+    def _write_pending(self) -> None:
+        # Caller holds _io_lock, so frames reach the file in sequence order
+        with self._lock:
+            frames, self._pending = self._pending, []
+        if not frames or self._file.closed:
+            return
+        self._file.write(b"".join(frames))
+        self._file.flush()
+        if self.fsync_policy != "never":
+            os.fsync(self._file.fileno())
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self._closed, timeout=self.group_commit_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ WAL flush failed: {e}")